@@ -0,0 +1,45 @@
+"""add_call_queue_leases
+
+Revision ID: a3f1c92e4b7d
+Revises: 39ea80b2b194
+Create Date: 2026-10-18 09:00:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f1c92e4b7d'
+down_revision = '39ea80b2b194'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # call_queue is created by Base.metadata.create_all on a fresh database —
+    # only existing deployments need the new columns added here.
+    columns = _columns("call_queue")
+    if not columns:
+        return
+    if "lease_owner" not in columns:
+        op.add_column("call_queue", sa.Column("lease_owner", sa.String(length=128), nullable=True))
+    if "lease_expires_at" not in columns:
+        op.add_column(
+            "call_queue",
+            sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    columns = _columns("call_queue")
+    if "lease_expires_at" in columns:
+        op.drop_column("call_queue", "lease_expires_at")
+    if "lease_owner" in columns:
+        op.drop_column("call_queue", "lease_owner")
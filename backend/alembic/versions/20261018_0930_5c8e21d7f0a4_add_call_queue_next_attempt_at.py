@@ -0,0 +1,53 @@
+"""add_call_queue_next_attempt_at
+
+Revision ID: 5c8e21d7f0a4
+Revises: a3f1c92e4b7d
+Create Date: 2026-10-18 09:30:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c8e21d7f0a4'
+down_revision = 'a3f1c92e4b7d'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # call_queue is created by Base.metadata.create_all on a fresh database
+    columns = _columns("call_queue")
+    if not columns:
+        return
+    if "next_attempt_at" not in columns:
+        op.add_column(
+            "call_queue",
+            sa.Column(
+                "next_attempt_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+    op.create_index(
+        "ix_call_queue_pending_due",
+        "call_queue",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    if "next_attempt_at" not in _columns("call_queue"):
+        return
+    op.drop_index("ix_call_queue_pending_due", table_name="call_queue", if_exists=True)
+    op.drop_column("call_queue", "next_attempt_at")
@@ -0,0 +1,70 @@
+"""add_call_queue_campaign_id
+
+Revision ID: e71b4d09c3a6
+Revises: 5c8e21d7f0a4
+Create Date: 2026-10-18 10:00:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'e71b4d09c3a6'
+down_revision = '5c8e21d7f0a4'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # call_queue and campaigns are created by Base.metadata.create_all on a
+    # fresh database — existing deployments only need the membership column.
+    if "campaign_id" in _columns("call_queue") or not _columns("call_queue"):
+        return
+    if not _columns("campaigns"):
+        # The app creates this table on startup; the FK needs it right now
+        op.create_table(
+            "campaigns",
+            sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("name", sa.String(length=255), nullable=True),
+            sa.Column("status", sa.String(length=32), nullable=False),
+            sa.Column("max_concurrent_calls", sa.Integer(), nullable=False),
+            sa.Column("total_items", sa.Integer(), nullable=False),
+            sa.Column("completed_count", sa.Integer(), nullable=False),
+            sa.Column("no_answer_count", sa.Integer(), nullable=False),
+            sa.Column("failed_count", sa.Integer(), nullable=False),
+            sa.Column("canceled_count", sa.Integer(), nullable=False),
+            sa.Column("runner_id", sa.String(length=128), nullable=True),
+            sa.Column("runner_heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_campaigns_id", "campaigns", ["id"])
+        op.create_index("ix_campaigns_status", "campaigns", ["status"])
+
+    op.add_column(
+        "call_queue",
+        sa.Column(
+            "campaign_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("campaigns.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_call_queue_campaign_id", "call_queue", ["campaign_id"])
+
+
+def downgrade() -> None:
+    if "campaign_id" not in _columns("call_queue"):
+        return
+    op.drop_index("ix_call_queue_campaign_id", table_name="call_queue")
+    op.drop_column("call_queue", "campaign_id")
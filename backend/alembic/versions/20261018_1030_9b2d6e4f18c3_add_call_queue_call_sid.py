@@ -0,0 +1,51 @@
+"""add_call_queue_call_sid
+
+Revision ID: 9b2d6e4f18c3
+Revises: e71b4d09c3a6
+Create Date: 2026-10-18 10:30:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2d6e4f18c3'
+down_revision = 'e71b4d09c3a6'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # call_queue is created by Base.metadata.create_all on a fresh database
+    columns = _columns("call_queue")
+    if not columns:
+        return
+    if "call_sid" not in columns:
+        op.add_column("call_queue", sa.Column("call_sid", sa.String(length=64), nullable=True))
+        op.create_index("ix_call_queue_call_sid", "call_queue", ["call_sid"])
+    if "dialed_at" not in columns:
+        op.add_column("call_queue", sa.Column("dialed_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_call_queue_calling_dialed",
+        "call_queue",
+        ["dialed_at"],
+        postgresql_where=sa.text("status = 'calling'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    columns = _columns("call_queue")
+    op.drop_index("ix_call_queue_calling_dialed", table_name="call_queue", if_exists=True)
+    if "dialed_at" in columns:
+        op.drop_column("call_queue", "dialed_at")
+    if "call_sid" in columns:
+        op.drop_index("ix_call_queue_call_sid", table_name="call_queue")
+        op.drop_column("call_queue", "call_sid")
@@ -0,0 +1,51 @@
+"""unique_call_queue_call_sid
+
+Revision ID: 4f7a3c1e9d25
+Revises: 9b2d6e4f18c3
+Create Date: 2026-10-18 11:00:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f7a3c1e9d25'
+down_revision = '9b2d6e4f18c3'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    if "call_sid" not in _columns("call_queue"):
+        return
+    # Keep the SID only on the most recently dialed row that carries it
+    op.execute(
+        """
+        UPDATE call_queue q SET call_sid = NULL
+        FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY call_sid ORDER BY dialed_at DESC NULLS LAST, id
+            ) AS rank
+            FROM call_queue WHERE call_sid IS NOT NULL
+        ) dup
+        WHERE q.id = dup.id AND dup.rank > 1
+        """
+    )
+    op.drop_index("ix_call_queue_call_sid", table_name="call_queue", if_exists=True)
+    op.create_index(
+        "uq_call_queue_call_sid", "call_queue", ["call_sid"], unique=True, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    if "call_sid" not in _columns("call_queue"):
+        return
+    op.drop_index("uq_call_queue_call_sid", table_name="call_queue", if_exists=True)
+    op.create_index("ix_call_queue_call_sid", "call_queue", ["call_sid"], if_not_exists=True)
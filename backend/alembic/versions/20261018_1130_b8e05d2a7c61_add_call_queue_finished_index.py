@@ -0,0 +1,40 @@
+"""add_call_queue_finished_index
+
+Revision ID: b8e05d2a7c61
+Revises: 4f7a3c1e9d25
+Create Date: 2026-10-18 11:30:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e05d2a7c61'
+down_revision = '4f7a3c1e9d25'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # call_queue_archive itself is created by Base.metadata.create_all;
+    # the compaction job finds finished rows in call_queue through this index.
+    if not _columns("call_queue"):
+        return
+    op.create_index(
+        "ix_call_queue_finished_updated",
+        "call_queue",
+        ["updated_at"],
+        postgresql_where=sa.text("status IN ('completed', 'no_answer', 'failed', 'canceled')"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_call_queue_finished_updated", table_name="call_queue", if_exists=True)
@@ -0,0 +1,48 @@
+"""add_call_queue_priority
+
+Revision ID: d3a9f6b1c527
+Revises: b8e05d2a7c61
+Create Date: 2026-10-18 12:00:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3a9f6b1c527'
+down_revision = 'b8e05d2a7c61'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # call_queue is created by Base.metadata.create_all on a fresh database
+    columns = _columns("call_queue")
+    if not columns:
+        return
+    if "priority" not in columns:
+        op.add_column(
+            "call_queue",
+            sa.Column("priority", sa.Float(), server_default=sa.text("0"), nullable=False),
+        )
+    op.create_index(
+        "ix_call_queue_pending_priority",
+        "call_queue",
+        [sa.text("priority DESC"), "created_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    if "priority" not in _columns("call_queue"):
+        return
+    op.drop_index("ix_call_queue_pending_priority", table_name="call_queue", if_exists=True)
+    op.drop_column("call_queue", "priority")
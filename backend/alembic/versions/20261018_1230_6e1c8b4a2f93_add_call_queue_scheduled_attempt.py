@@ -0,0 +1,34 @@
+"""add_call_queue_scheduled_attempt
+
+Revision ID: 6e1c8b4a2f93
+Revises: d3a9f6b1c527
+Create Date: 2026-10-18 12:30:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e1c8b4a2f93'
+down_revision = 'd3a9f6b1c527'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # answer_rate_buckets / job_watermarks are created by Base.metadata.create_all
+    columns = _columns("call_queue")
+    if columns and "scheduled_attempt" not in columns:
+        op.add_column("call_queue", sa.Column("scheduled_attempt", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    if "scheduled_attempt" in _columns("call_queue"):
+        op.drop_column("call_queue", "scheduled_attempt")
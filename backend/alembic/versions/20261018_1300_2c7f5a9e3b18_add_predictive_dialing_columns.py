@@ -0,0 +1,51 @@
+"""add_predictive_dialing_columns
+
+Revision ID: 2c7f5a9e3b18
+Revises: 6e1c8b4a2f93
+Create Date: 2026-10-18 13:00:00.000000+00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c7f5a9e3b18'
+down_revision = '6e1c8b4a2f93'
+branch_labels = None
+depends_on = None
+
+
+def _columns(table: str) -> set[str]:
+    inspector = sa.inspect(op.get_bind())
+    if table not in inspector.get_table_names():
+        return set()
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # Tables are created by Base.metadata.create_all on a fresh database
+    campaign_columns = _columns("campaigns")
+    if campaign_columns and "dial_mode" not in campaign_columns:
+        op.add_column(
+            "campaigns",
+            sa.Column("dial_mode", sa.String(16), server_default="progressive", nullable=False),
+        )
+
+    queue_columns = _columns("call_queue")
+    if queue_columns and "answered_at" not in queue_columns:
+        op.add_column("call_queue", sa.Column("answered_at", sa.DateTime(timezone=True), nullable=True))
+    if queue_columns and "abandoned" not in queue_columns:
+        op.add_column(
+            "call_queue",
+            sa.Column("abandoned", sa.Boolean(), server_default=sa.false(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    queue_columns = _columns("call_queue")
+    if "abandoned" in queue_columns:
+        op.drop_column("call_queue", "abandoned")
+    if "answered_at" in queue_columns:
+        op.drop_column("call_queue", "answered_at")
+    if "dial_mode" in _columns("campaigns"):
+        op.drop_column("campaigns", "dial_mode")
@@ -0,0 +1,275 @@
+"""normalize_phone_numbers
+
+Revision ID: 8d4b2e7a6f10
+Revises: 2c7f5a9e3b18
+Create Date: 2026-10-18 13:30:00.000000+00:00
+"""
+import os
+import re
+from collections import Counter, defaultdict
+
+from alembic import op
+import phonenumbers
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '8d4b2e7a6f10'
+down_revision = '2c7f5a9e3b18'
+branch_labels = None
+depends_on = None
+
+
+# Frozen copy of app.services.phone_numbers.merge_duplicate_numbers as of this
+# revision — later model changes must not change what this migration does.
+CHUNK_SIZE = 5000
+E164_PATTERN = r"^\+[1-9][0-9]{6,14}$"
+PROFILE_FIELDS = ("name", "age", "occupation", "location", "insurance_interest", "last_summary")
+
+leads = sa.table(
+    "leads",
+    sa.column("id", postgresql.UUID(as_uuid=True)),
+    sa.column("phone_number", sa.String),
+    sa.column("name", sa.String),
+    sa.column("age", sa.Integer),
+    sa.column("occupation", sa.String),
+    sa.column("location", sa.String),
+    sa.column("insurance_interest", sa.String),
+    sa.column("last_summary", sa.Text),
+    sa.column("lead_status", sa.String),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+    sa.column("updated_at", sa.DateTime(timezone=True)),
+)
+call_sessions = sa.table(
+    "call_sessions",
+    sa.column("lead_id", postgresql.UUID(as_uuid=True)),
+)
+do_not_call = sa.table(
+    "do_not_call",
+    sa.column("phone_number", sa.String),
+    sa.column("reason", sa.String),
+    sa.column("call_sid", sa.String),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+campaigns = sa.table(
+    "campaigns",
+    sa.column("id", postgresql.UUID(as_uuid=True)),
+    sa.column("canceled_count", sa.Integer),
+)
+call_queue = sa.table(
+    "call_queue",
+    sa.column("id", postgresql.UUID(as_uuid=True)),
+    sa.column("phone_number", sa.String),
+    sa.column("status", sa.String),
+    sa.column("campaign_id", postgresql.UUID(as_uuid=True)),
+    sa.column("lease_owner", sa.String),
+    sa.column("lease_expires_at", sa.DateTime(timezone=True)),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+)
+call_queue_archive = sa.table(
+    "call_queue_archive",
+    sa.column("id", postgresql.UUID(as_uuid=True)),
+    sa.column("phone_number", sa.String),
+)
+
+
+def _tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _normalize(raw, region: str):
+    raw = (raw or "").strip()
+    if re.match(E164_PATTERN, raw):
+        return raw
+    try:
+        number = phonenumbers.parse(raw, region)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_possible_number(number):
+        return None
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def _chunks(items):
+    for start in range(0, len(items), CHUNK_SIZE):
+        yield items[start:start + CHUNK_SIZE]
+
+
+def _renames(conn, phone_column, region: str) -> dict:
+    stored = conn.execute(
+        sa.select(phone_column).where(~phone_column.regexp_match(E164_PATTERN)).distinct()
+    ).scalars().all()
+    renames = {}
+    for raw in stored:
+        normalized = _normalize(raw, region)
+        if normalized is not None and normalized != raw:
+            renames[raw] = normalized
+    return renames
+
+
+def _merge_leads(conn, region: str, counts: Counter) -> None:
+    renames = _renames(conn, leads.c.phone_number, region)
+    if not renames:
+        return
+    rows = []
+    for chunk in _chunks(list(renames) + list(set(renames.values()))):
+        rows += conn.execute(sa.select(leads).where(leads.c.phone_number.in_(chunk))).all()
+
+    groups = defaultdict(list)
+    for row in rows:
+        groups[renames.get(row.phone_number, row.phone_number)].append(row)
+
+    merged_into = []   # (duplicate id, kept id)
+    kept = []
+    for number, group in groups.items():
+        group.sort(key=lambda r: (r.phone_number != number, r.created_at))
+        keeper, duplicates = group[0], group[1:]
+        newest_first = sorted(duplicates, key=lambda r: r.updated_at, reverse=True)
+        change = {"b_id": keeper.id, "b_phone_number": number}
+        for field in PROFILE_FIELDS:
+            change[f"b_{field}"] = getattr(keeper, field)
+            if change[f"b_{field}"] is None:
+                change[f"b_{field}"] = next(
+                    (getattr(d, field) for d in newest_first if getattr(d, field) is not None), None
+                )
+        change["b_lead_status"] = keeper.lead_status
+        if keeper.lead_status == "new":
+            change["b_lead_status"] = next(
+                (d.lead_status for d in newest_first if d.lead_status != "new"), "new"
+            )
+        kept.append(change)
+        merged_into.extend((d.id, keeper.id) for d in duplicates)
+
+    for chunk in _chunks(merged_into):
+        mapping = sa.values(
+            sa.column("old_id", postgresql.UUID(as_uuid=True)),
+            sa.column("new_id", postgresql.UUID(as_uuid=True)),
+            name="merged",
+        ).data(chunk)
+        conn.execute(
+            sa.update(call_sessions)
+            .where(call_sessions.c.lead_id == mapping.c.old_id)
+            .values(lead_id=mapping.c.new_id)
+        )
+        conn.execute(sa.delete(leads).where(leads.c.id.in_([old for old, _ in chunk])))
+    # Duplicates are gone, so every kept lead can take its normalized number
+    conn.execute(
+        sa.update(leads)
+        .where(leads.c.id == sa.bindparam("b_id"))
+        .values(
+            phone_number=sa.bindparam("b_phone_number"),
+            lead_status=sa.bindparam("b_lead_status"),
+            **{field: sa.bindparam(f"b_{field}") for field in PROFILE_FIELDS},
+        ),
+        kept,
+    )
+    counts["leads_normalized"] += len(kept)
+    counts["leads_merged"] += len(merged_into)
+
+
+def _merge_do_not_call(conn, region: str, counts: Counter) -> None:
+    renames = _renames(conn, do_not_call.c.phone_number, region)
+    if not renames:
+        return
+    for chunk in _chunks(list(renames)):
+        rows = conn.execute(sa.select(do_not_call).where(do_not_call.c.phone_number.in_(chunk))).all()
+        conn.execute(
+            postgresql.insert(do_not_call)
+            .values([{**row._mapping, "phone_number": renames[row.phone_number]} for row in rows])
+            .on_conflict_do_nothing(index_elements=["phone_number"])
+        )
+        conn.execute(sa.delete(do_not_call).where(do_not_call.c.phone_number.in_(chunk)))
+    # Running workers reload their in-memory list once this commits
+    conn.execute(sa.select(sa.func.pg_notify("dnc_changed", '{"op": "reload"}')))
+    counts["do_not_call_normalized"] += len(renames)
+
+
+def _merge_queue(conn, region: str, counts: Counter, has_archive: bool) -> None:
+    renames = _renames(conn, call_queue.c.phone_number, region)
+    archive_renames = _renames(conn, call_queue_archive.c.phone_number, region) if has_archive else {}
+
+    held = set()   # in-flight duplicates — renamed by the app's merge job once they finish
+    if renames:
+        active = []
+        for chunk in _chunks(list(renames) + list(set(renames.values()))):
+            active += conn.execute(
+                sa.select(
+                    call_queue.c.id, call_queue.c.phone_number, call_queue.c.status,
+                    call_queue.c.campaign_id, call_queue.c.created_at,
+                )
+                .where(call_queue.c.phone_number.in_(chunk))
+                .where(call_queue.c.status.in_(["pending", "calling"]))
+                .with_for_update()
+            ).all()
+        groups = defaultdict(list)
+        for row in active:
+            groups[renames.get(row.phone_number, row.phone_number)].append(row)
+
+        canceled = []
+        campaign_counts: Counter = Counter()
+        for group in groups.values():
+            group.sort(key=lambda r: (r.status != "calling", r.created_at))
+            for row in group[1:]:
+                if row.status == "pending":
+                    canceled.append(row.id)
+                    if row.campaign_id is not None:
+                        campaign_counts[row.campaign_id] += 1
+                else:
+                    held.add(row.id)
+        for chunk in _chunks(canceled):
+            conn.execute(
+                sa.update(call_queue)
+                .where(call_queue.c.id.in_(chunk))
+                .values(status="canceled", lease_owner=None, lease_expires_at=None)
+            )
+        for campaign_id, n in campaign_counts.items():
+            conn.execute(
+                sa.update(campaigns)
+                .where(campaigns.c.id == campaign_id)
+                .values(canceled_count=campaigns.c.canceled_count + n)
+            )
+        counts["queue_duplicates_canceled"] += len(canceled)
+
+    for table, table_renames in ((call_queue, renames), (call_queue_archive, archive_renames)):
+        for chunk in _chunks(list(table_renames.items())):
+            mapping = sa.values(sa.column("raw", sa.String), sa.column("e164", sa.String), name="renamed").data(chunk)
+            statement = (
+                sa.update(table)
+                .where(table.c.phone_number == mapping.c.raw)
+                .values(phone_number=mapping.c.e164)
+            )
+            if held and table is call_queue:
+                statement = statement.where(table.c.id.not_in(held))
+            counts[f"{table.name}_normalized"] += conn.execute(statement).rowcount
+
+
+def upgrade() -> None:
+    # E.164 everywhere, duplicate leads folded into one and one outstanding
+    # queue item per number — the app's lifespan job does the same pass
+    conn = op.get_bind()
+    tables = _tables()
+    region = os.environ.get("PHONE_DEFAULT_REGION", "IN").upper()
+    counts: Counter = Counter()
+    if "leads" in tables:
+        _merge_leads(conn, region, counts)
+    if "do_not_call" in tables:
+        _merge_do_not_call(conn, region, counts)
+    if "call_queue" in tables:
+        _merge_queue(conn, region, counts, has_archive="call_queue_archive" in tables)
+
+    if "call_queue" in tables:
+        op.create_index(
+            "uq_call_queue_active_phone",
+            "call_queue",
+            ["phone_number"],
+            unique=True,
+            postgresql_where=sa.text("status IN ('pending', 'calling')"),
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # Merged leads and rewritten numbers are not restored
+    if "call_queue" in _tables():
+        op.drop_index("uq_call_queue_active_phone", table_name="call_queue", if_exists=True)
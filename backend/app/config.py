@@ -46,6 +46,56 @@ class Settings(BaseSettings):
     twilio_auth_token: str = ""
     twilio_phone_number: str = ""
     twilio_base_url: str = "http://localhost:8000"
+    # How answered calls talk to the agent: gather (TwiML <Gather>/<Say> per
+    # turn) | relay (ConversationRelay WebSocket, replies streamed clause by clause)
+    twilio_voice_mode: str = "gather"
+    # gather mode: a reply Groq has not produced within this many seconds is
+    # preceded by a short filler phrase (<Say> + <Redirect>); 0 waits for it
+    voice_reply_budget_seconds: float = 1.2
+    # gather mode: start the reply from the lead's interim transcript once it
+    # stops changing (partialResultCallback), used if the final result matches
+    voice_speculative_replies: bool = True
+
+    # ── Telephony ─────────────────────────────────────────────────────────────
+    telephony_provider: str = "twilio"   # twilio | simulated
+    # Simulated provider (load testing): outcome mix — the remainder fails —
+    # mean ring / talk seconds, and time compression (0.01 = 100x real time)
+    sim_answer_rate: float = 0.6
+    sim_busy_rate: float = 0.1
+    sim_no_answer_rate: float = 0.25
+    sim_ring_seconds: float = 8.0
+    sim_talk_seconds: float = 60.0
+    sim_time_scale: float = 1.0
+
+    # ── Phone numbers ─────────────────────────────────────────────────────────
+    # Region (ISO 3166 alpha-2) assumed for numbers written without a +country
+    # code, e.g. "098765 43210" → +919876543210 with IN
+    phone_default_region: str = "IN"
+
+    # ── Dialer ────────────────────────────────────────────────────────────────
+    # Parallel call slots: per-campaign default and a hard cap for this process
+    campaign_max_concurrent_calls: int = 3
+    dialer_max_concurrent_calls: int = 10
+    # Account-wide dial pacing shared by all workers (Twilio's default is 1 CPS)
+    dialer_calls_per_second: float = 1.0
+    dialer_cps_burst: int = 1
+    # Defer each pending item to its best answer-rate hour (call_scheduler)
+    dialer_best_time_scheduling: bool = True
+    # Default dial mode of new campaigns: progressive | predictive. Predictive
+    # rings more numbers than free call slots while answered calls that find
+    # no free slot (abandoned) stay under the cap below. Ringing lines count
+    # towards DIALER_MAX_CONCURRENT_CALLS, so leave it headroom above the slots
+    dialer_mode: str = "progressive"
+    dialer_max_abandon_rate: float = 0.03
+    dialer_max_lines_per_slot: float = 3.0
+
+    # ── Conversations ─────────────────────────────────────────────────────────
+    # Where live call conversations are kept: memory (per process — a call's
+    # webhooks must reach the same worker) | postgres (shared by all workers)
+    conversation_store: str = "memory"
+    conversation_ttl_seconds: int = 3600   # forgotten this long after their last turn
+    conversation_max_turns: int = 10       # exchanges kept per call (sent to the LLM)
+    conversation_max_calls: int = 10000    # memory store: calls kept, least recent evicted
 
     # ── Groq ──────────────────────────────────────────────────────────────────
     groq_api_key: str = ""
@@ -9,6 +9,14 @@ Usage in alembic/env.py:
     from app.db.base import *     # if you want models explicitly
 """
 from app.db.database import Base  # noqa: F401
-from app.db.models import Lead, CallSession, CallQueue  # noqa: F401 — register metadata
+from app.db.models import (  # noqa: F401 — register metadata
+    Lead, CallSession, Campaign, CallQueue, CallQueueArchive, DialRateLimit,
+    AnswerRateBucket, JobWatermark, DoNotCall, QueueOperation, QueueStatusCount,
+    ConversationTurn, ConversationContext,
+)
 
-__all__ = ["Base", "Lead", "CallSession", "CallQueue"]
+__all__ = [
+    "Base", "Lead", "CallSession", "Campaign", "CallQueue", "CallQueueArchive",
+    "DialRateLimit", "AnswerRateBucket", "JobWatermark", "DoNotCall", "QueueOperation",
+    "QueueStatusCount", "ConversationTurn", "ConversationContext",
+]
@@ -33,14 +33,11 @@ class Base(DeclarativeBase):
 #  Engine Factory
 # ──────────────────────────────────────────────
 
-def _create_engine():
+def _connection_settings():
+    """Return ``(asyncpg URL without sslmode, ssl context or None)`` from settings."""
     settings = get_settings()
     db_url = settings.async_database_url
 
-    # Mask credentials in logs
-    safe_url = db_url.split("@")[-1] if "@" in db_url else db_url
-    logger.info(f"Connecting to database: @{safe_url}")
-
     # Determine SSL setting from original URL
     needs_ssl = "sslmode=require" in settings.database_url
 
@@ -53,17 +50,31 @@ def _create_engine():
         clean_query = urlencode(params, doseq=True)
         db_url = urlunparse(parsed._replace(query=clean_query))
 
+    ssl_ctx = None
+    if needs_ssl:
+        import ssl as _ssl
+        ssl_ctx = _ssl.create_default_context()
+        ssl_ctx.check_hostname = False
+        ssl_ctx.verify_mode = _ssl.CERT_NONE
+
+    return db_url, ssl_ctx
+
+
+def _create_engine():
+    settings = get_settings()
+    db_url, ssl_ctx = _connection_settings()
+
+    # Mask credentials in logs
+    safe_url = db_url.split("@")[-1] if "@" in db_url else db_url
+    logger.info(f"Connecting to database: @{safe_url}")
+
     engine_kwargs = dict(
         echo=not settings.is_production,   # SQL query logging in dev
         pool_pre_ping=True,                # Detect stale connections
         pool_recycle=300,                  # Recycle connections every 5 min
     )
 
-    if needs_ssl:
-        import ssl as _ssl
-        ssl_ctx = _ssl.create_default_context()
-        ssl_ctx.check_hostname = False
-        ssl_ctx.verify_mode = _ssl.CERT_NONE
+    if ssl_ctx is not None:
         engine_kwargs["connect_args"] = {"ssl": ssl_ctx}
 
     if settings.is_production:
@@ -89,6 +100,17 @@ SessionLocal = async_sessionmaker(
 )
 
 
+async def connect_asyncpg():
+    """
+    Open a dedicated raw asyncpg connection outside the SQLAlchemy pool —
+    for long-lived uses such as LISTEN. The caller must close it.
+    """
+    import asyncpg
+    db_url, ssl_ctx = _connection_settings()
+    dsn = db_url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    return await asyncpg.connect(dsn, ssl=ssl_ctx)
+
+
 # ──────────────────────────────────────────────
 #  FastAPI Dependency
 # ──────────────────────────────────────────────
@@ -4,7 +4,17 @@ SQLAlchemy ORM models for the Outbound AI Sales Calling Platform.
 Tables:
   - Lead          — enriched prospect profile (was: User)
   - CallSession   — completed call transcript + extracted data (was: Session)
-  - CallQueue     — outbound call queue with status tracking
+  - Campaign      — persistent, resumable dialing campaign with progress counters
+  - CallQueue     — outbound call queue with status tracking (work outstanding)
+  - CallQueueArchive — finished CallQueue rows, moved out by queue_compactor
+  - DialRateLimit — shared token bucket pacing outbound dials across workers
+  - AnswerRateBucket — answered / placed calls per hour-of-week (global, region, lead)
+  - JobWatermark  — how far an incremental background job has processed
+  - DoNotCall     — suppression list: numbers that must never be queued or dialed
+  - QueueOperation — progress of an operator's bulk requeue / cancel / purge / reset
+  - QueueStatusCount — per-status CallQueue row counts, kept by a trigger
+  - ConversationTurn — live call conversation turns (UNLOGGED; postgres conversation store)
+  - ConversationContext — live call's rendered prompt and greeting (UNLOGGED; same store)
 
 Design decisions:
   - UUID primary keys for global uniqueness
@@ -15,12 +25,16 @@ Design decisions:
 import uuid
 
 from sqlalchemy import (
+    BigInteger,
+    Boolean,
     Column,
+    Float,
     ForeignKey,
     Index,
     Integer,
     String,
     Text,
+    false,
     func,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
@@ -37,7 +51,7 @@ class Lead(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
 
-    # Contact
+    # Contact — E.164 (services.phone_numbers), so unique means one lead per person
     phone_number = Column(String(32), unique=True, index=True, nullable=False)
 
     # Profile — filled progressively as calls are processed
@@ -111,6 +125,56 @@ class CallSession(Base):
         return f"<CallSession id={self.id} lead_id={self.lead_id}>"
 
 
+class Campaign(Base):
+    """
+    A dialing run over a set of queue items.
+
+    Progress counters are bumped in the same transaction that moves one of the
+    campaign's items to a terminal status, so reading progress is O(1).
+    A campaign is driven by one runner process at a time (runner_id), which
+    heartbeats so another worker can adopt the campaign if it dies.
+    """
+
+    __tablename__ = "campaigns"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+
+    name = Column(String(255), nullable=True)
+
+    status = Column(
+        String(32), nullable=False, default="running", index=True
+    )  # running | paused | cancelled | completed
+
+    # Conversation capacity: calls the agent may be talking on at once
+    max_concurrent_calls = Column(Integer, nullable=False, default=1)
+
+    # progressive (one line per free slot) | predictive (over-dial on answer rate)
+    dial_mode = Column(String(16), nullable=False, default="progressive", server_default="progressive")
+
+    # Progress — total_items is fixed at start; the rest grow as items finish
+    total_items     = Column(Integer, nullable=False, default=0)
+    completed_count = Column(Integer, nullable=False, default=0)
+    no_answer_count = Column(Integer, nullable=False, default=0)
+    failed_count    = Column(Integer, nullable=False, default=0)
+    canceled_count  = Column(Integer, nullable=False, default=0)
+
+    # Runner ownership
+    runner_id           = Column(String(128), nullable=True)
+    runner_heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at  = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at  = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Campaign id={self.id} status={self.status}>"
+
+
 class CallQueue(Base):
     """Outbound call queue — tracks state from pending → calling → completed/failed."""
 
@@ -122,10 +186,43 @@ class CallQueue(Base):
 
     status = Column(
         String(32), nullable=False, default="pending", index=True
-    )  # pending | calling | completed | failed
+    )  # pending | calling | completed | no_answer | failed | canceled
+
+    # Campaign membership — set when a campaign adopts the pending item
+    campaign_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("campaigns.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
 
     attempts = Column(Integer, nullable=False, default=0)
 
+    # Retry scheduling — the dialer only picks up pending rows that are due
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Dial order — conversion propensity written by services.lead_scoring;
+    # due items are dialed highest priority first, then oldest first
+    priority = Column(Float, nullable=False, default=0.0, server_default="0")
+
+    # ``attempts`` value for which call_scheduler last chose the best calling
+    # window (moving next_attempt_at); NULL / different means not yet scheduled
+    scheduled_attempt = Column(Integer, nullable=True)
+
+    # Dialer lease — a worker reserves pending rows before dialing them so several
+    # processes can drain one queue. Cleared once the row is claimed for a call.
+    lease_owner      = Column(String(128), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Current / last dial — lets the reaper reconcile in-flight calls with Twilio
+    call_sid  = Column(String(64), nullable=True)   # unique — see uq_call_queue_call_sid
+    dialed_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Set when the current call is answered: a conversation slot was granted
+    # (answered_at), or none was free and the call was dropped (abandoned)
+    answered_at = Column(DateTime(timezone=True), nullable=True)
+    abandoned   = Column(Boolean, nullable=False, default=False, server_default=false())
+
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
         DateTime(timezone=True),
@@ -138,6 +235,231 @@ class CallQueue(Base):
         return f"<CallQueue id={self.id} phone={self.phone_number} status={self.status}>"
 
 
+class CallQueueArchive(Base):
+    """
+    Finished queue items (completed | no_answer | failed | canceled) moved out
+    of call_queue by the compaction job, so the hot table only holds work that
+    is still outstanding. Same columns, minus the dialer lease.
+    """
+
+    __tablename__ = "call_queue_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+
+    phone_number = Column(String(32), nullable=False, index=True)
+    status       = Column(String(32), nullable=False)
+    campaign_id  = Column(UUID(as_uuid=True), nullable=True, index=True)
+    attempts     = Column(Integer, nullable=False, default=0)
+
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False)
+    call_sid        = Column(String(64), nullable=True, index=True)
+    dialed_at       = Column(DateTime(timezone=True), nullable=True)
+
+    created_at  = Column(DateTime(timezone=True), nullable=False, index=True)
+    updated_at  = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CallQueueArchive id={self.id} phone={self.phone_number} status={self.status}>"
+
+
+class DialRateLimit(Base):
+    """
+    Token bucket shared by every dialer process (one row per bucket).
+
+    Tokens are refilled lazily from ``refilled_at`` on each take, so the row
+    only changes when a dial is attempted or Twilio pushes back with a 429.
+    """
+
+    __tablename__ = "dial_rate_limits"
+
+    name = Column(String(64), primary_key=True)
+
+    tokens      = Column(Float, nullable=False, default=0.0)
+    refilled_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # HTTP 429 back-off: no tokens are handed out before backoff_until
+    backoff_until = Column(DateTime(timezone=True), nullable=True)
+    backoff_level = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<DialRateLimit name={self.name} tokens={self.tokens:.2f}>"
+
+
+class AnswerRateBucket(Base):
+    """
+    Calls placed and answered in one UTC hour-of-week, for one scope:
+    ``global`` (key ''), ``region`` (key = phone prefix) or ``lead`` (key =
+    lead id). Built incrementally from CallSession by call_scheduler.
+    """
+
+    __tablename__ = "answer_rate_buckets"
+
+    scope       = Column(String(16), primary_key=True)   # global | region | lead
+    key         = Column(String(64), primary_key=True)
+    day_of_week = Column(Integer, primary_key=True)      # 0 = Monday (UTC)
+    hour        = Column(Integer, primary_key=True)      # 0-23 (UTC)
+
+    calls    = Column(Integer, nullable=False, default=0)
+    answered = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<AnswerRateBucket {self.scope}:{self.key} "
+            f"{self.day_of_week}/{self.hour} {self.answered}/{self.calls}>"
+        )
+
+
+class JobWatermark(Base):
+    """High-water mark of an incremental job (e.g. CallSessions already counted)."""
+
+    __tablename__ = "job_watermarks"
+
+    name            = Column(String(64), primary_key=True)
+    processed_until = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<JobWatermark {self.name}={self.processed_until}>"
+
+
+class DoNotCall(Base):
+    """
+    A number that asked not to be called (or was blocked by an operator).
+    Mirrored in memory by services.dnc_list, which every enqueue path and the
+    dialer's claim step consult.
+    """
+
+    __tablename__ = "do_not_call"
+
+    phone_number = Column(String(32), primary_key=True)
+
+    reason   = Column(String(32), nullable=False, default="manual")   # lead_request | manual
+    call_sid = Column(String(64), nullable=True)                      # call the request was made on
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<DoNotCall phone={self.phone_number} reason={self.reason}>"
+
+
+class QueueOperation(Base):
+    """
+    One bulk queue operation (services.queue_operations) and its progress.
+    Stored so any worker can report on an operation running in another.
+    """
+
+    __tablename__ = "queue_operations"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    operation = Column(String(32), nullable=False)     # requeue | cancel | purge | reset_attempts
+    filters   = Column(JSONB, nullable=False, default=dict)
+    status    = Column(String(16), nullable=False, default="running")   # running | completed | failed
+
+    matched  = Column(Integer, nullable=False, default=0)   # rows matching when started
+    affected = Column(Integer, nullable=False, default=0)   # rows changed so far
+    error    = Column(Text, nullable=True)
+
+    created_at  = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<QueueOperation {self.operation} id={self.id} status={self.status}>"
+
+
+class QueueStatusCount(Base):
+    """
+    Number of call_queue rows per status.
+
+    Maintained by statement-level triggers on call_queue (see app.db.triggers),
+    so every writer — including bulk statements — keeps it exact, and queue
+    stats are read in O(1) instead of a GROUP BY over the whole queue.
+    """
+
+    __tablename__ = "queue_status_counts"
+
+    status = Column(String(32), primary_key=True)
+    count  = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<QueueStatusCount {self.status}={self.count}>"
+
+
+class ConversationTurn(Base):
+    """
+    One message of a call in progress, for the shared conversation store
+    (services.conversation_store, CONVERSATION_STORE=postgres). Deleted when
+    the call ends or expires. UNLOGGED: writes skip the WAL, and the table is
+    emptied after a Postgres crash — which only loses calls in progress.
+    """
+
+    __tablename__ = "conversation_turns"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)   # order of the turns
+
+    call_sid = Column(String(64), nullable=False)
+    role     = Column(String(1), nullable=False)    # u (lead) | a (agent)
+    content  = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ConversationTurn call_sid={self.call_sid} role={self.role}>"
+
+
+class ConversationContext(Base):
+    """
+    Per-call data of the shared conversation store, set when the call is
+    dialed: the lead's rendered system prompt and opening greeting.
+    UNLOGGED, like ConversationTurn.
+    """
+
+    __tablename__ = "conversation_contexts"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    call_sid = Column(String(64), primary_key=True)
+    context  = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ConversationContext call_sid={self.call_sid}>"
+
+
 # ── Composite indexes for common query patterns ──────────────────────────────
 Index("ix_call_sessions_lead_timestamp", CallSession.lead_id, CallSession.timestamp)
 Index("ix_call_queue_status_created", CallQueue.status, CallQueue.created_at)
+Index(
+    "ix_call_queue_pending_due",
+    CallQueue.next_attempt_at,
+    postgresql_where=CallQueue.status == "pending",
+)
+Index(
+    "ix_call_queue_pending_priority",
+    CallQueue.priority.desc(),
+    CallQueue.created_at,
+    postgresql_where=CallQueue.status == "pending",
+)
+Index(
+    "ix_call_queue_finished_updated",
+    CallQueue.updated_at,
+    postgresql_where=CallQueue.status.in_(["completed", "no_answer", "failed", "canceled"]),
+)
+Index("ix_call_queue_archive_status_created", CallQueueArchive.status, CallQueueArchive.created_at)
+# Webhooks resolve their queue row by CallSid in one index lookup
+Index("uq_call_queue_call_sid", CallQueue.call_sid, unique=True)
+# One outstanding item per (E.164-normalized) number — see services.phone_numbers
+Index(
+    "uq_call_queue_active_phone",
+    CallQueue.phone_number,
+    unique=True,
+    postgresql_where=CallQueue.status.in_(["pending", "calling"]),
+)
+Index(
+    "ix_call_queue_calling_dialed",
+    CallQueue.dialed_at,
+    postgresql_where=CallQueue.status == "calling",
+)
+# A call's turns, newest first, in one index scan
+Index("ix_conversation_turns_call_sid_id", ConversationTurn.call_sid, ConversationTurn.id)
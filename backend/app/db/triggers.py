@@ -0,0 +1,116 @@
+"""
+Database triggers installed at startup.
+
+queue_status_counts:
+  Three statement-level AFTER triggers (INSERT / UPDATE / DELETE) on each of
+  call_queue and call_queue_archive read the statement's transition tables
+  and apply one net delta per status to queue_status_counts — which thus
+  counts the whole history; archiving a row nets to zero. A bulk UPDATE of
+  10k rows therefore costs a single upsert per status touched, and updates
+  that leave ``status`` unchanged (leases, retry scheduling) do not touch
+  the counters at all.
+
+  Installation is idempotent: the first worker to start creates the triggers
+  and seeds the counters from one GROUP BY, all in one transaction under an
+  advisory lock. CREATE TRIGGER blocks writes to both tables until commit,
+  so the seed and the triggers never disagree.
+"""
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the install lock (pg_advisory_xact_lock key)
+_INSTALL_LOCK_KEY = 0x616C6C41  # "allA"
+
+_COUNT_FUNCTION = """
+CREATE OR REPLACE FUNCTION call_queue_count_statuses() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO queue_status_counts AS c (status, count)
+        SELECT status, count(*) FROM new_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO queue_status_counts AS c (status, count)
+        SELECT status, -count(*) FROM old_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO queue_status_counts AS c (status, count)
+        SELECT status, sum(delta) FROM (
+            SELECT o.status, -1 AS delta
+              FROM old_rows o JOIN new_rows n ON n.id = o.id
+             WHERE o.status IS DISTINCT FROM n.status
+            UNION ALL
+            SELECT n.status, 1
+              FROM old_rows o JOIN new_rows n ON n.id = o.id
+             WHERE o.status IS DISTINCT FROM n.status
+        ) moved
+        GROUP BY status
+        HAVING sum(delta) <> 0
+        ORDER BY status
+        ON CONFLICT (status) DO UPDATE SET count = c.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$
+"""
+
+# Transition tables only allow one event per trigger
+_COUNTED_TABLES = ("call_queue", "call_queue_archive")
+_COUNT_TRIGGERS = {
+    "count_insert": "AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows",
+    "count_update": (
+        "AFTER UPDATE ON {table} "
+        "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows"
+    ),
+    "count_delete": "AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows",
+}
+
+
+async def install_queue_status_counters(conn: AsyncConnection) -> bool:
+    """
+    Create the call_queue / call_queue_archive counting triggers and seed
+    queue_status_counts, unless already installed. Run inside a transaction.
+    Returns True if installed now.
+    """
+    await conn.execute(text(f"SELECT pg_advisory_xact_lock({_INSTALL_LOCK_KEY})"))
+    triggers = {
+        (table, f"{table}_{suffix}"): definition.format(table=table)
+        for table in _COUNTED_TABLES
+        for suffix, definition in _COUNT_TRIGGERS.items()
+    }
+    existing = await conn.execute(
+        text(
+            "SELECT count(*) FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid "
+            "WHERE c.relname = ANY(:tables) AND t.tgname = ANY(:names)"
+        ),
+        {"tables": list(_COUNTED_TABLES), "names": [name for _, name in triggers]},
+    )
+    if existing.scalar() == len(triggers):
+        return False
+
+    await conn.execute(text(_COUNT_FUNCTION))
+    for (table, name), definition in triggers.items():
+        await conn.execute(text(f"DROP TRIGGER IF EXISTS {name} ON {table}"))
+        await conn.execute(
+            text(
+                f"CREATE TRIGGER {name} {definition} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION call_queue_count_statuses()"
+            )
+        )
+
+    # Seed from the current tables — writers are blocked until we commit
+    await conn.execute(text("DELETE FROM queue_status_counts"))
+    await conn.execute(
+        text(
+            "INSERT INTO queue_status_counts (status, count) "
+            "SELECT status, count(*) FROM ("
+            "  SELECT status FROM call_queue UNION ALL SELECT status FROM call_queue_archive"
+            ") history GROUP BY status"
+        )
+    )
+    logger.info("[DB] Installed call_queue status counters")
+    return True
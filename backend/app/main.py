@@ -6,7 +6,9 @@ Architecture:
   - Groq (llama-3.3-70b) for all LLM reasoning
   - Twilio for outbound voice calling (TwiML AI conversation loop)
   - Railway PostgreSQL via asyncpg + SQLAlchemy 2.x
+  - Postgres LISTEN/NOTIFY completion bus — safe to run with --workers N
 """
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -23,7 +25,18 @@ from app.config import get_settings
 from app.db.database import engine, Base
 # Import models so Base.metadata is populated before create_all
 from app.db import models  # noqa: F401
-from app.routes import leads, queue, calls, twilio
+from app.db.triggers import install_queue_status_counters
+from app.routes import leads, queue, campaigns, calls, dnc, twilio
+from app.services.call_reaper import run_call_reaper
+from app.services.call_scheduler import run_call_scheduler
+from app.services.completion_bus import get_completion_bus
+from app.services.conversation_store import get_conversation_store
+from app.services.dnc_list import get_suppression_list
+from app.services.lead_scoring import run_lead_scoring
+from app.services.phone_numbers import run_number_normalizer
+from app.services.queue_compactor import run_queue_compactor
+from app.services.queue_manager import QueueManager, supervise_campaigns
+from app.services.telephony import close_telephony_provider, open_telephony_provider
 
 # ──────────────────────────────────────────────
 #  Logging
@@ -38,7 +51,7 @@ logger = logging.getLogger(__name__)
 
 
 # ──────────────────────────────────────────────
-#  Lifespan — DB init on startup
+#  Lifespan — DB init + shared clients on startup
 # ──────────────────────────────────────────────
 
 @asynccontextmanager
@@ -47,6 +60,8 @@ async def lifespan(app: FastAPI):
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+        async with engine.begin() as conn:
+            await install_queue_status_counters(conn)
         logger.info("[OK] Database connected and schema is up-to-date.")
     except Exception as e:
         logger.critical(f"[ERROR] Database connection failed on startup: {e}")
@@ -54,8 +69,39 @@ async def lifespan(app: FastAPI):
         if settings.is_production:
             sys.exit(1)
 
+    await open_telephony_provider()
+    # Cross-worker call-completion signalling (Postgres LISTEN/NOTIFY)
+    await get_completion_bus().start()
+    # Do-not-call numbers in memory, kept current across workers (LISTEN/NOTIFY)
+    await get_suppression_list().start()
+    # Live call conversations (per process, or shared through Postgres)
+    await get_conversation_store().start()
+    # Resume unfinished campaigns; adopt those whose runner dies later
+    campaign_supervisor = asyncio.create_task(supervise_campaigns())
+    # Settle in-flight calls whose status webhook never arrived
+    call_reaper = asyncio.create_task(run_call_reaper())
+    # Keep call_queue small: move long-finished rows to call_queue_archive
+    queue_compactor = asyncio.create_task(run_queue_compactor())
+    # Re-prioritise pending items as lead profiles and call outcomes change
+    lead_scoring = asyncio.create_task(run_lead_scoring())
+    # Learn answer rates per hour and hold items until their best hour
+    call_scheduler = asyncio.create_task(run_call_scheduler())
+    # Rewrite numbers stored before E.164 normalization, merging duplicates
+    number_normalizer = asyncio.create_task(run_number_normalizer())
+
     yield
 
+    number_normalizer.cancel()
+    call_scheduler.cancel()
+    lead_scoring.cancel()
+    queue_compactor.cancel()
+    call_reaper.cancel()
+    campaign_supervisor.cancel()
+    await QueueManager.stop_campaign_runners()
+    await get_conversation_store().stop()
+    await get_suppression_list().stop()
+    await get_completion_bus().stop()
+    await close_telephony_provider()
     await engine.dispose()
     logger.info("Database connection pool disposed.")
 
@@ -93,7 +139,9 @@ app.add_middleware(
 # ──────────────────────────────────────────────
 app.include_router(leads.router,   prefix="/api")
 app.include_router(queue.router,   prefix="/api")
+app.include_router(campaigns.router, prefix="/api")
 app.include_router(calls.router,   prefix="/api")
+app.include_router(dnc.router,     prefix="/api")
 app.include_router(twilio.router,  prefix="/api")
 
 
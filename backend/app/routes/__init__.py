@@ -1,2 +1,2 @@
 # Routes package — outbound AI sales calling platform
-# Routers: leads, queue, calls, twilio
+# Routers: leads, queue, campaigns, calls, dnc, twilio
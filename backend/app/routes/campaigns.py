@@ -0,0 +1,102 @@
+"""
+Campaign Routes
+===============
+Track and control persisted calling campaigns (started via POST /queue/start).
+
+GET  /campaigns               — List campaigns (newest first)
+GET  /campaigns/{id}          — Campaign status + progress counters
+POST /campaigns/{id}/pause    — Stop dialing new items (in-flight calls finish)
+POST /campaigns/{id}/resume   — Resume a paused campaign
+POST /campaigns/{id}/cancel   — Cancel; remaining pending items become canceled
+"""
+
+import logging
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.db.models import Campaign
+from app.routes.queue import _get_queue_manager
+from app.schemas.schemas import CampaignListResponse, CampaignResponse
+from app.services.queue_manager import QueueManager
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/campaigns", tags=["campaigns"])
+
+
+async def _get_campaign_or_404(db: AsyncSession, campaign_id: UUID) -> Campaign:
+    campaign = await QueueManager.get_campaign(db, campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
+
+
+# ──────────────────────────────────────────────
+#  GET /campaigns
+# ──────────────────────────────────────────────
+
+@router.get("", response_model=CampaignListResponse)
+async def list_campaigns(
+    status: Optional[str] = Query(None, description="Filter: running|paused|cancelled|completed"),
+    limit:  int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db:     AsyncSession = Depends(get_db),
+):
+    """List campaigns with their progress counters."""
+    campaigns = await QueueManager.list_campaigns(db, status=status, limit=limit, offset=offset)
+    return CampaignListResponse(
+        campaigns=[CampaignResponse.model_validate(c) for c in campaigns],
+        limit=limit,
+        offset=offset,
+    )
+
+
+# ──────────────────────────────────────────────
+#  GET /campaigns/{id}
+# ──────────────────────────────────────────────
+
+@router.get("/{campaign_id}", response_model=CampaignResponse)
+async def get_campaign(campaign_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Return one campaign — counters are maintained incrementally, no scan."""
+    return await _get_campaign_or_404(db, campaign_id)
+
+
+# ──────────────────────────────────────────────
+#  POST /campaigns/{id}/pause | resume | cancel
+# ──────────────────────────────────────────────
+
+@router.post("/{campaign_id}/pause", response_model=CampaignResponse)
+async def pause_campaign(campaign_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Stop claiming new items; calls already in flight finish normally."""
+    campaign = await QueueManager.pause_campaign(campaign_id)
+    if campaign is None:
+        current = await _get_campaign_or_404(db, campaign_id)
+        raise HTTPException(status_code=409, detail=f"Campaign is {current.status}, not running")
+    return campaign
+
+
+@router.post("/{campaign_id}/resume", response_model=CampaignResponse)
+async def resume_campaign(
+    campaign_id: UUID,
+    db:          AsyncSession = Depends(get_db),
+    manager:     QueueManager = Depends(_get_queue_manager),
+):
+    """Resume a paused campaign in this worker."""
+    campaign = await manager.resume_campaign(campaign_id)
+    if campaign is None:
+        current = await _get_campaign_or_404(db, campaign_id)
+        raise HTTPException(status_code=409, detail=f"Campaign is {current.status}, not paused")
+    return campaign
+
+
+@router.post("/{campaign_id}/cancel", response_model=CampaignResponse)
+async def cancel_campaign(campaign_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Cancel the campaign and drop its pending items."""
+    campaign = await QueueManager.cancel_campaign(campaign_id)
+    if campaign is None:
+        current = await _get_campaign_or_404(db, campaign_id)
+        raise HTTPException(status_code=409, detail=f"Campaign already {current.status}")
+    return campaign
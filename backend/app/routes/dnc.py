@@ -0,0 +1,86 @@
+"""
+Do-Not-Call Routes
+==================
+Manage the suppression list — numbers that are never queued or dialed.
+
+GET    /dnc                 — Paginated list of blocked numbers
+POST   /dnc                 — Block numbers (pending queue items are canceled at dial time)
+DELETE /dnc/{phone_number}  — Unblock a number
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import get_db
+from app.db.models import DoNotCall
+from app.schemas.schemas import DoNotCallListResponse, DoNotCallRequest, DoNotCallResponse
+from app.services.dnc_list import get_suppression_list
+from app.services.phone_numbers import normalize_phone
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/dnc", tags=["do-not-call"])
+
+
+# ──────────────────────────────────────────────
+#  GET /dnc
+# ──────────────────────────────────────────────
+
+@router.get("", response_model=DoNotCallListResponse)
+async def list_blocked_numbers(
+    page:   int = Query(1, ge=1),
+    limit:  int = Query(50, ge=1, le=500),
+    reason: Optional[str] = Query(None, description="Filter: lead_request|manual"),
+    db:     AsyncSession = Depends(get_db),
+):
+    """Return blocked numbers, most recently added first."""
+    query = select(DoNotCall).order_by(DoNotCall.created_at.desc(), DoNotCall.phone_number)
+    count_query = select(func.count()).select_from(DoNotCall)
+    if reason:
+        query = query.where(DoNotCall.reason == reason)
+        count_query = count_query.where(DoNotCall.reason == reason)
+
+    total = (await db.execute(count_query)).scalar() or 0
+    result = await db.execute(query.limit(limit).offset((page - 1) * limit))
+    return DoNotCallListResponse(
+        numbers=[DoNotCallResponse.model_validate(n) for n in result.scalars().all()],
+        total=total,
+        page=page,
+        limit=limit,
+    )
+
+
+# ──────────────────────────────────────────────
+#  POST /dnc
+# ──────────────────────────────────────────────
+
+@router.post("")
+async def block_numbers(payload: DoNotCallRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Put numbers on the do-not-call list. Every worker stops queueing them at
+    once; items already queued are canceled when the dialer reaches them.
+    """
+    # Formatting variants of one number count once; unparseable inputs are reported apart
+    normalized = [normalize_phone(p) for p in payload.phone_numbers]
+    phones = set(filter(None, normalized))
+    added = await get_suppression_list().add(db, phones, reason="manual")
+    return {
+        "message": f"Blocked {added} numbers",
+        "added":   added,
+        "already_blocked": len(phones) - added,
+        "invalid": normalized.count(None),
+    }
+
+
+# ──────────────────────────────────────────────
+#  DELETE /dnc/{phone_number}
+# ──────────────────────────────────────────────
+
+@router.delete("/{phone_number}", status_code=204)
+async def unblock_number(phone_number: str, db: AsyncSession = Depends(get_db)):
+    """Remove a number from the do-not-call list (URL-encode the leading '+')."""
+    if not await get_suppression_list().remove(db, [phone_number]):
+        raise HTTPException(status_code=404, detail="Number is not on the do-not-call list")
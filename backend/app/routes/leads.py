@@ -31,11 +31,21 @@ from app.schemas.schemas import (
     LeadUpdate,
     CallSessionResponse,
 )
+from app.services.dnc_list import get_suppression_list
+from app.services.phone_numbers import normalize_phone
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/leads", tags=["leads"])
 
 
+def _normalize_or_400(phone: str) -> str:
+    """E.164 form of ``phone`` — leads are stored and matched by it."""
+    normalized = normalize_phone(phone)
+    if normalized is None:
+        raise HTTPException(status_code=400, detail=f"Not a valid phone number: {phone!r}")
+    return normalized
+
+
 # ──────────────────────────────────────────────
 #  GET /leads
 # ──────────────────────────────────────────────
@@ -58,6 +68,7 @@ async def list_leads(
         count_query = count_query.where(Lead.lead_status == status)
 
     if phone:
+        phone = normalize_phone(phone) or phone.strip()
         query = query.where(Lead.phone_number == phone)
         count_query = count_query.where(Lead.phone_number == phone)
 
@@ -120,16 +131,17 @@ async def create_lead(
     payload: LeadCreate,
     db: AsyncSession = Depends(get_db),
 ):
-    """Create a new lead. Phone number must be unique."""
+    """Create a new lead. Phone number (normalized to E.164) must be unique."""
+    phone = _normalize_or_400(payload.phone_number)
     existing = await db.execute(
-        select(Lead).where(Lead.phone_number == payload.phone_number)
+        select(Lead).where(Lead.phone_number == phone)
     )
     if existing.scalars().first():
         raise HTTPException(status_code=409, detail="A lead with this phone number already exists")
 
     lead = Lead(
         id=uuid.uuid4(),
-        phone_number=payload.phone_number,
+        phone_number=phone,
         name=payload.name,
         location=payload.location,
         insurance_interest=payload.insurance_interest,
@@ -162,15 +174,17 @@ async def update_lead(
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
 
-    # If phone is being changed, check uniqueness
-    if payload.phone_number and payload.phone_number != lead.phone_number:
-        dup = await db.execute(
-            select(Lead).where(Lead.phone_number == payload.phone_number)
-        )
-        if dup.scalars().first():
-            raise HTTPException(status_code=409, detail="Another lead already has this phone number")
-
     update_data = payload.model_dump(exclude_unset=True)
+
+    # If phone is being changed, check uniqueness
+    if payload.phone_number:
+        phone = update_data["phone_number"] = _normalize_or_400(payload.phone_number)
+        if phone != lead.phone_number:
+            dup = await db.execute(
+                select(Lead).where(Lead.phone_number == phone)
+            )
+            if dup.scalars().first():
+                raise HTTPException(status_code=409, detail="Another lead already has this phone number")
     for field, value in update_data.items():
         setattr(lead, field, value)
 
@@ -220,7 +234,9 @@ async def import_leads_csv(
       name,phone_number    — two-column with header
       phone_number         — single-column (legacy)
 
-    If a phone number already exists, the lead record is updated (name etc.).
+    Numbers are normalized to E.164 (unparseable ones count as errors). If a
+    phone number already exists, the lead record is updated (name etc.).
+    Numbers on the do-not-call list are skipped.
     """
     if not file.filename or not file.filename.endswith(".csv"):
         raise HTTPException(
@@ -269,18 +285,23 @@ async def import_leads_csv(
 
     imported = 0
     updated = 0
+    skipped = 0
     errors = 0
+    suppressed = get_suppression_list()
 
     for row in data_rows:
         if not row:
             continue
         try:
-            phone = row[phone_col].strip() if phone_col < len(row) else ""
+            phone = normalize_phone(row[phone_col]) if phone_col < len(row) else None
             name = row[name_col].strip() if name_col >= 0 and name_col < len(row) else None
 
             if not phone:
                 errors += 1
                 continue
+            if await suppressed.is_blocked(phone):
+                skipped += 1
+                continue
 
             existing_result = await db.execute(
                 select(Lead).where(Lead.phone_number == phone)
@@ -307,13 +328,17 @@ async def import_leads_csv(
 
     await db.commit()
     logger.info(
-        f"[import] CSV import complete: imported={imported} updated={updated} errors={errors}"
+        f"[import] CSV import complete: imported={imported} updated={updated} "
+        f"skipped={skipped} errors={errors}"
     )
 
     return ImportResponse(
         imported=imported,
         updated=updated,
-        skipped=0,
+        skipped=skipped,
         errors=errors,
-        message=f"Import complete: {imported} new leads, {updated} updated, {errors} errors",
+        message=(
+            f"Import complete: {imported} new leads, {updated} updated, "
+            f"{skipped} on the do-not-call list, {errors} errors"
+        ),
     )
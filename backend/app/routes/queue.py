@@ -7,21 +7,34 @@ POST /queue/add       — Add phone numbers to queue
 POST /queue/start     — Start calling campaign (background)
 GET  /queue           — View queue items + stats
 GET  /queue/stats     — Queue stats only
+
+Bulk operations (chunked, set-based; ``dry_run`` previews, large ones run in the background):
+POST /queue/requeue         — Finished items back to pending
+POST /queue/cancel          — Cancel pending items
+POST /queue/purge           — Delete finished items
+POST /queue/reset-attempts  — Fresh retry budget for pending items
+GET  /queue/operations      — Recent bulk operations
+GET  /queue/operations/{id} — Progress of one bulk operation
 """
 
 import logging
-from typing import Optional
+from typing import List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.schemas.schemas import (
     AddToQueueRequest,
+    CampaignStartRequest,
     CampaignStartResponse,
     QueueListResponse,
+    QueueOperationRequest,
+    QueueOperationResponse,
     QueueStatsResponse,
 )
+from app.services import queue_operations
 from app.services.queue_manager import QueueManager
 
 logger = logging.getLogger(__name__)
@@ -50,11 +63,11 @@ async def add_to_queue(
     if not entries:
         raise HTTPException(status_code=400, detail="At least one phone number is required")
 
-    created = await QueueManager.add_to_queue(db, entries)
+    added = await QueueManager.add_to_queue(db, entries)
     return {
-        "message": f"Added {len(created)} numbers to the queue",
-        "added":   len(created),
-        "skipped": len(entries) - len(created),
+        "message": f"Added {added} numbers to the queue",
+        "added":   added,
+        "skipped": len(entries) - added,
     }
 
 
@@ -64,18 +77,33 @@ async def add_to_queue(
 
 @router.post("/start", response_model=CampaignStartResponse)
 async def start_campaign(
+    payload: Optional[CampaignStartRequest] = None,
     manager: QueueManager = Depends(_get_queue_manager),
 ):
     """
-    Start processing the pending call queue.
-    Runs all pending calls sequentially in the background.
-    Returns immediately with a campaign ID.
+    Start a campaign over every pending item not already in one.
+    Dials pending calls in the background through parallel call slots
+    (``max_concurrent_calls``, capped by DIALER_MAX_CONCURRENT_CALLS).
+    ``dial_mode="predictive"`` rings more numbers than free slots based on the
+    observed answer rate (default: DIALER_MODE).
+    Returns immediately with a campaign ID — manage it under /campaigns.
     """
-    result = await manager.start_campaign()
+    payload = payload or CampaignStartRequest()
+    result = await manager.start_campaign(
+        max_concurrent_calls=payload.max_concurrent_calls,
+        name=payload.name,
+        dial_mode=payload.dial_mode,
+    )
     return CampaignStartResponse(
         campaign_id=result["campaign_id"],
         status=result["status"],
-        message="Campaign started — calls will be made sequentially in the background",
+        max_concurrent_calls=result["max_concurrent_calls"],
+        dial_mode=result["dial_mode"],
+        total_items=result["total_items"],
+        message=(
+            f"Campaign started over {result['total_items']} items — up to "
+            f"{result['max_concurrent_calls']} calls will run in parallel in the background"
+        ),
     )
 
 
@@ -87,27 +115,20 @@ async def start_campaign(
 async def get_queue(
     page:   int = Query(1, ge=1),
     limit:  int = Query(50, ge=1, le=200),
-    status: Optional[str] = Query(None, description="Filter: pending|calling|completed|failed"),
+    status: Optional[str] = Query(None, description="Filter: pending|calling|completed|no_answer|failed|canceled"),
     db:     AsyncSession = Depends(get_db),
 ):
-    """Return all queue items with current stats."""
-    from sqlalchemy import func, select
-    from app.db.models import CallQueue
+    """Return queue items (archived ones included) with current stats."""
+    from sqlalchemy import select
 
     offset = (page - 1) * limit
 
     # Items
     items = await QueueManager.get_queue_items(db, status=status, limit=limit, offset=offset)
 
-    # Total count
-    count_query = select(func.count(CallQueue.id))
-    if status:
-        count_query = count_query.where(CallQueue.status == status)
-    total_result = await db.execute(count_query)
-    total = total_result.scalar() or 0
-
-    # Stats
+    # Stats — also give the total, so no count(*) over the queue is needed
     stats = await QueueManager.get_queue_stats(db)
+    total = stats.get(status, 0) if status else stats["total"]
 
     from app.schemas.schemas import QueueItemResponse
 
@@ -144,3 +165,84 @@ async def get_queue_stats(db: AsyncSession = Depends(get_db)):
     """Return queue status counts only (lightweight dashboard polling)."""
     stats = await QueueManager.get_queue_stats(db)
     return QueueStatsResponse(**stats)
+
+
+# ──────────────────────────────────────────────
+#  POST /queue/requeue | cancel | purge | reset-attempts
+# ──────────────────────────────────────────────
+
+async def _bulk_operation(operation: str, payload: QueueOperationRequest, response: Response):
+    """
+    Dry run: count + sample. Otherwise record the operation and apply it in
+    chunks — inline when it fits in one chunk, else in the background (202,
+    poll GET /queue/operations/{id}).
+    """
+    try:
+        filters = queue_operations.resolve_filters(
+            operation, payload.model_dump(mode="json", exclude={"dry_run"})
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    preview = await queue_operations.preview(operation, filters)
+    if payload.dry_run:
+        return QueueOperationResponse(operation=operation, status="dry_run", filters=filters, **preview)
+
+    record = await queue_operations.create_operation(operation, filters, preview["matched"])
+    if preview["matched"] <= queue_operations.OPERATION_CHUNK_SIZE:
+        await queue_operations.run_operation(record.id)
+    else:
+        queue_operations.run_in_background(record.id)
+        response.status_code = 202
+    async with SessionLocal() as db:
+        return QueueOperationResponse.model_validate(await queue_operations.get_operation(db, record.id))
+
+
+@router.post("/requeue", response_model=QueueOperationResponse)
+async def requeue_items(payload: QueueOperationRequest, response: Response):
+    """
+    Put finished items (default: no_answer, failed) back in the queue with a
+    fresh retry budget, outside any campaign — archived ones included.
+    Numbers already queued or on the do-not-call list are skipped.
+    """
+    return await _bulk_operation("requeue", payload, response)
+
+
+@router.post("/cancel", response_model=QueueOperationResponse)
+async def cancel_items(payload: QueueOperationRequest, response: Response):
+    """Cancel pending items matching the filters (campaign counters included)."""
+    return await _bulk_operation("cancel", payload, response)
+
+
+@router.post("/purge", response_model=QueueOperationResponse)
+async def purge_items(payload: QueueOperationRequest, response: Response):
+    """Delete finished items (default: all finished statuses), archived ones included."""
+    return await _bulk_operation("purge", payload, response)
+
+
+@router.post("/reset-attempts", response_model=QueueOperationResponse)
+async def reset_attempts(payload: QueueOperationRequest, response: Response):
+    """Give pending items matching the filters a fresh retry budget."""
+    return await _bulk_operation("reset_attempts", payload, response)
+
+
+# ──────────────────────────────────────────────
+#  GET /queue/operations
+# ──────────────────────────────────────────────
+
+@router.get("/operations", response_model=List[QueueOperationResponse])
+async def list_queue_operations(
+    limit: int = Query(20, ge=1, le=100),
+    db:    AsyncSession = Depends(get_db),
+):
+    """Recent bulk operations, newest first."""
+    return [QueueOperationResponse.model_validate(o) for o in await queue_operations.list_operations(db, limit)]
+
+
+@router.get("/operations/{operation_id}", response_model=QueueOperationResponse)
+async def get_queue_operation(operation_id: UUID, db: AsyncSession = Depends(get_db)):
+    """Progress of one bulk operation (``affected`` grows chunk by chunk)."""
+    operation = await queue_operations.get_operation(db, operation_id)
+    if operation is None:
+        raise HTTPException(status_code=404, detail="Queue operation not found")
+    return QueueOperationResponse.model_validate(operation)
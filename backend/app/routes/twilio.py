@@ -11,25 +11,65 @@ Flow:
   5. Loop continues until the call ends
   6. POST /twilio/status receives final call status events
 
+With TWILIO_VOICE_MODE=relay, /voice instead connects the call to a
+ConversationRelay WebSocket: Twilio streams the lead's transcribed speech
+to WS /twilio/relay and speaks the reply as it arrives. Groq's output is
+streamed (stream=True) and sent clause by clause, so the lead hears the
+first clause while the rest is still being generated — no end-of-turn
+TwiML round-trip, no wait for the full completion.
+
+Per-call prompt: the dialer renders the lead's personalized system prompt
+and opening greeting from their profile while the phone rings, and caches
+them with the conversation under the CallSid (/voice renders them if the
+call is not cached, e.g. after a restart). Every turn reuses them — no
+lead query per turn — and they are dropped when the conversation ends.
+
+Latency budget (VOICE_REPLY_BUDGET_SECONDS): if Groq has not answered
+within the budget, /process-speech returns at once with a short filler
+<Say> and a <Redirect> to /twilio/pending-reply, which serves the reply the
+completion still running in the background produces. The lead hears
+something within the budget however slow the LLM's tail latency is, and the
+webhook never approaches Twilio's 15 s timeout.
+
+Speculative replies (VOICE_SPECULATIVE_REPLIES): each <Gather> also asks
+for interim transcripts (partialResultCallback → /twilio/partial-speech).
+Once the lead's partial text has held still for SPECULATION_SETTLE_SECONDS,
+a completion for it is started; a changed partial cancels it. When the final
+SpeechResult matches the speculated text, /process-speech uses that
+completion — already finished, or well under way — instead of starting one.
+
 Endpoints:
   POST /twilio/voice          — Entry point; starts conversation
+  POST /twilio/partial-speech — Interim transcripts → speculative completion
   POST /twilio/process-speech — Speech → Groq → TwiML response
+  POST /twilio/pending-reply  — Reply that missed the latency budget (after the filler)
+  WS   /twilio/relay          — ConversationRelay: prompts in, streamed reply out
   POST /twilio/status         — Call status updates (completed, failed, etc.)
 """
 
 import asyncio
 import logging
+import random
+import re
+import time
 import uuid
-from typing import Optional
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, Form, Query, Request, Response
-from sqlalchemy import select, update
+from fastapi import APIRouter, Depends, Form, Query, Request, Response, WebSocket
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.db.models import CallQueue, CallSession, Lead
-from app.services.groq_service import SALES_AGENT_SYSTEM_PROMPT, get_groq_service
+from app.services.groq_service import build_call_prompt, get_groq_service
+from app.services.completion_bus import answered_key, get_completion_bus
+from app.services.conversation_store import get_conversation_store
+from app.services.dnc_list import get_suppression_list
+from app.services.phone_numbers import normalize_phone
+from app.services.queue_manager import QueueManager
+from app.services.retry_policy import TERMINAL_QUEUE_STATUS, TWILIO_CALL_OUTCOMES
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/twilio", tags=["twilio-voice"])
@@ -42,27 +82,72 @@ TWIML_CONTENT_TYPE = "text/xml"
 SPEECH_TIMEOUT = "auto"         # "auto" = Twilio detects end-of-speech
 MAX_GATHER_TIMEOUT = 10         # fallback hard timeout in seconds
 
-# The AI agent's opening greeting (used on the very first turn)
-OPENING_GREETING = (
-    "Hello! This is Priya calling from allAgent, your insurance advisor. "
-    "I'm reaching out to discuss insurance solutions that may benefit you. "
-    "Do you have a few minutes to chat?"
+# The lead asked never to be called again — the number goes on the do-not-call list
+DO_NOT_CALL_PHRASES = ("don't call", "do not call", "remove me", "stop calling")
+
+# The lead wants to end the call
+FAREWELL_PHRASES = (
+    "bye", "goodbye", "hang up", "end call", "stop", "not interested",
+    "no thanks",
+) + DO_NOT_CALL_PHRASES
+
+FAREWELL_MESSAGE = "Thank you for your time. Have a wonderful day! Goodbye."
+
+# Said instead of a reply when Groq fails
+LLM_ERROR_MESSAGE = (
+    "I'm having a brief technical issue. Could you give me just a moment? "
+    "Please try again."
+)
+
+# Said while a reply that missed the latency budget is still being generated
+FILLER_PHRASES = (
+    "One moment, please.",
+    "Let me check that for you.",
+    "Sure, just a second.",
+    "Good question — give me a moment.",
+)
+PENDING_REPLY_TIMEOUT_SECONDS = 10.0   # /pending-reply gives up after this (Twilio's limit is 15 s)
+PENDING_REPLY_POLL_SECONDS    = 0.1    # reply generated by another worker: store poll period
+PENDING_REPLIES_KEPT          = 10_000 # background replies remembered for /pending-reply
+
+# Speculative replies from interim transcripts
+SPECULATION_SETTLE_SECONDS = 0.3      # partial text unchanged this long → start the completion
+SPECULATIONS_KEPT          = 10_000   # calls with a speculation remembered (this process)
+
+# Voice replies: fast model, short answers
+VOICE_TEMPERATURE = 0.65
+VOICE_MAX_TOKENS  = 256
+
+# Streamed replies are spoken a clause at a time: up to sentence punctuation,
+# or a comma once the clause is long enough to be said on its own
+CLAUSE_END = re.compile(r"[.!?;:]\s|,\s")
+MIN_COMMA_CLAUSE_CHARS = 24
+
+# Played when a predictively dialed call is answered but every slot is busy
+ABANDONED_MESSAGE = (
+    "Hello! This is allAgent, your insurance advisor. "
+    "Sorry, all our advisors are busy right now — we will call you back shortly. Goodbye."
 )
 
 
-def _build_twiml_gather(say_text: str, action_url: str) -> str:
+def _build_twiml_gather(say_text: str, action_url: str, partial_url: Optional[str] = None) -> str:
     """
     Return a TwiML document that:
       1. Says `say_text` to the caller.
       2. Opens a <Gather> to capture the caller's speech reply.
       3. Uses the given `action_url` as the callback for the captured speech.
+      4. Posts interim transcripts to `partial_url`, if given.
     """
     escaped = say_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    partial = (
+        f'\n          partialResultCallback="{partial_url}" partialResultCallbackMethod="POST"'
+        if partial_url else ""
+    )
     return f"""<?xml version="1.0" encoding="UTF-8"?>
 <Response>
   <Gather input="speech" action="{action_url}" method="POST"
           speechTimeout="{SPEECH_TIMEOUT}" timeout="{MAX_GATHER_TIMEOUT}"
-          language="en-IN">
+          language="en-IN"{partial}>
     <Say voice="Polly.Aditi" language="en-IN">{escaped}</Say>
   </Gather>
   <Say voice="Polly.Aditi" language="en-IN">
@@ -72,6 +157,35 @@ def _build_twiml_gather(say_text: str, action_url: str) -> str:
 </Response>"""
 
 
+def _build_twiml_relay(relay_url: str, greeting: str) -> str:
+    """
+    Return TwiML that hands the call to a ConversationRelay WebSocket at
+    `relay_url`. Twilio speaks the opening `greeting` itself, then transcribes
+    the lead's speech and speaks the text tokens we send back.
+    """
+    greeting = (
+        greeting.replace("&", "&amp;").replace("<", "&lt;")
+        .replace(">", "&gt;").replace('"', "&quot;")
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Connect>
+    <ConversationRelay url="{relay_url}" welcomeGreeting="{greeting}"
+                       language="en-IN" interruptible="true"/>
+  </Connect>
+</Response>"""
+
+
+def _build_twiml_filler(say_text: str, redirect_url: str) -> str:
+    """Return TwiML that says a short filler, then fetches the reply from `redirect_url`."""
+    escaped = say_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<Response>
+  <Say voice="Polly.Aditi" language="en-IN">{escaped}</Say>
+  <Redirect method="POST">{redirect_url}</Redirect>
+</Response>"""
+
+
 def _build_twiml_say_hangup(say_text: str) -> str:
     """Return TwiML that says something and then hangs up — used for fatal errors."""
     escaped = say_text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
@@ -82,9 +196,9 @@ def _build_twiml_say_hangup(say_text: str) -> str:
 </Response>"""
 
 
-def _process_speech_url(request: Request) -> str:
+def _webhook_url(request: Request, route_name: str) -> str:
     """
-    Build an absolute URL to /twilio/process-speech that Twilio can reach.
+    Build an absolute URL to one of these routes that Twilio can reach.
     Prefers BASE_URL from settings; falls back to the Host header.
     """
     settings = get_settings()
@@ -94,32 +208,280 @@ def _process_speech_url(request: Request) -> str:
         scheme = request.headers.get("x-forwarded-proto", request.url.scheme)
         host = request.headers.get("x-forwarded-host", request.headers.get("host", "localhost"))
         base = f"{scheme}://{host}"
-    return f"{base}/twilio/process-speech"
+    # The route's full path, including the prefix the router is mounted under (/api)
+    return f"{base}{request.app.url_path_for(route_name)}"
+
+
+def _process_speech_url(request: Request) -> str:
+    return _webhook_url(request, "twilio_process_speech")
+
+
+def _partial_speech_url(request: Request) -> Optional[str]:
+    """Where <Gather> posts interim transcripts; None when speculation is off."""
+    if not get_settings().voice_speculative_replies:
+        return None
+    return _webhook_url(request, "twilio_partial_speech")
+
+
+def _relay_url(request: Request) -> str:
+    """Absolute wss:// URL of the ConversationRelay WebSocket."""
+    return re.sub(r"^http", "ws", _webhook_url(request, "twilio_relay"))   # http → ws, https → wss
+
+
+async def _call_phone_number(db: AsyncSession, call_sid: Optional[str]) -> Optional[str]:
+    """The number a call was placed to, from its queue row (unique CallSid index)."""
+    if not call_sid:
+        return None
+    result = await db.execute(select(CallQueue.phone_number).where(CallQueue.call_sid == call_sid))
+    return result.scalar()
+
+
+def _is_farewell(speech: str) -> bool:
+    speech = speech.lower()
+    return any(phrase in speech for phrase in FAREWELL_PHRASES)
+
+
+async def _call_prompt(db: AsyncSession, call_sid: Optional[str], to: Optional[str]) -> Dict[str, str]:
+    """
+    The call's system prompt and greeting: cached when it was dialed, else
+    rendered now from the lead's profile and cached for the rest of the call.
+    """
+    if not call_sid:
+        return build_call_prompt(None)
+    prompt = await get_conversation_store().context(call_sid)
+    if prompt is None:
+        # On outbound calls To is the lead's number
+        phone = normalize_phone(to) or await _call_phone_number(db, call_sid)
+        lead = None
+        if phone:
+            lead = (await db.execute(select(Lead).where(Lead.phone_number == phone))).scalars().first()
+        prompt = await QueueManager.cache_call_prompt(call_sid, lead)
+    return prompt
+
+
+async def _end_conversation(db: AsyncSession, call_sid: Optional[str], to: Optional[str], speech: str) -> None:
+    """
+    The lead said goodbye: forget the conversation, and put the number on the
+    do-not-call list if they asked not to be called again.
+    """
+    if call_sid:
+        _drop_pending_reply(call_sid)
+        _drop_speculation(call_sid)
+        await get_conversation_store().pop(call_sid)
+    if any(phrase in speech.lower() for phrase in DO_NOT_CALL_PHRASES):
+        # On outbound calls To is the lead's number
+        phone = normalize_phone(to) or await _call_phone_number(db, call_sid)
+        if phone:
+            await get_suppression_list().add(db, [phone], reason="lead_request", call_sid=call_sid)
+
+
+def _clause_end(text: str) -> Optional[int]:
+    """Index just past the first complete clause in `text`, or None."""
+    for match in CLAUSE_END.finditer(text):
+        if match.group()[0] != "," or match.start() >= MIN_COMMA_CLAUSE_CHARS:
+            return match.end()
+    return None
+
+
+async def _stream_reply(messages: List[Dict[str, str]]) -> AsyncIterator[str]:
+    """Stream a Groq voice reply, yielding it a speakable clause at a time."""
+    groq = get_groq_service()
+    stream = await groq.client.chat.completions.create(
+        model=groq.fast_model,
+        messages=messages,
+        temperature=VOICE_TEMPERATURE,
+        max_tokens=VOICE_MAX_TOKENS,
+        stream=True,
+    )
+    pending = ""
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        pending += chunk.choices[0].delta.content or ""
+        cut = _clause_end(pending)
+        while cut is not None:
+            yield pending[:cut]
+            pending = pending[cut:]
+            cut = _clause_end(pending)
+    if pending.strip():
+        yield pending
+
+
+# ── Background work of this process, kept referenced until it finishes ────────
+_background: set = set()
+
+
+def _in_background(coro: Awaitable, what: str) -> None:
+    """Run `coro` without waiting for it; a failure is logged as `what` failing."""
+    task = asyncio.create_task(coro)
+    _background.add(task)
+
+    def done(task: asyncio.Task) -> None:
+        _background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"[twilio] {what} failed: {task.exception()}")
+
+    task.add_done_callback(done)
+
+
+# ── Replies that missed the latency budget ────────────────────────────────────
+# CallSid → the background completion /pending-reply serves (this process only;
+# with CONVERSATION_STORE=postgres another worker finds the reply in the store)
+_pending_replies: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+
+
+async def _complete(messages: List[Dict[str, str]]) -> str:
+    """Groq voice reply to `messages` (LLM_ERROR_MESSAGE if Groq fails)."""
+    try:
+        groq = get_groq_service()
+        response = await groq.client.chat.completions.create(
+            model=groq.fast_model,   # Use fast model for real-time voice
+            messages=messages,
+            temperature=VOICE_TEMPERATURE,
+            max_tokens=VOICE_MAX_TOKENS,   # Keep responses short for voice
+        )
+        return (response.choices[0].message.content or "").strip()
+    except Exception as exc:
+        logger.error(f"[twilio/process-speech] Groq error: {exc}", exc_info=True)
+        return LLM_ERROR_MESSAGE
+
+
+async def _generate_reply(call_sid: Optional[str], completion: Awaitable[str]) -> str:
+    """Await the reply, then add it to the call's conversation."""
+    ai_reply = await completion
+    if call_sid:
+        await get_conversation_store().append(call_sid, "assistant", ai_reply)
+    return ai_reply
+
+
+def _hold_reply(call_sid: str, reply: asyncio.Task) -> None:
+    _drop_pending_reply(call_sid)
+    _pending_replies[call_sid] = reply
+    while len(_pending_replies) > PENDING_REPLIES_KEPT:
+        _pending_replies.popitem(last=False)[1].cancel()
+
+
+def _drop_pending_reply(call_sid: str) -> None:
+    reply = _pending_replies.pop(call_sid, None)
+    if reply is not None:
+        reply.cancel()
+
+
+async def _await_pending_reply(call_sid: str) -> Optional[str]:
+    """The reply held for `call_sid`, or None if it does not arrive in time."""
+    reply = _pending_replies.pop(call_sid, None)
+    if reply is not None:
+        try:
+            return await asyncio.wait_for(asyncio.shield(reply), PENDING_REPLY_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            # Still running: it finishes into the conversation, and a later
+            # redirect can still pick it up
+            if call_sid not in _pending_replies:
+                _hold_reply(call_sid, reply)
+            return None
+
+    # Started by another worker — its reply is appended to the shared store
+    store = get_conversation_store()
+    deadline = time.monotonic() + PENDING_REPLY_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        history = await store.history(call_sid)
+        if not history:
+            return None   # not a conversation this process can see
+        if history[-1]["role"] == "assistant":
+            return history[-1]["content"]
+        await asyncio.sleep(PENDING_REPLY_POLL_SECONDS)
+    return None
 
 
-# ── Conversation history store ────────────────────────────────────────────────
-# In production you would use Redis or the DB.  For now, an in-process dict
-# keyed by Twilio CallSid works fine for single-instance deployments.
-_conversation_history: dict[str, list[dict]] = {}
+# ── Speculative replies from interim transcripts ─────────────────────────────
+# CallSid → the latest speculation (this process only — a final result that
+# reaches another worker simply starts its own completion)
 
+class _Speculation:
+    __slots__ = ("key", "sequence", "after", "go", "task")
 
-def _get_history(call_sid: str) -> list[dict]:
-    return _conversation_history.setdefault(call_sid, [])
+    def __init__(self, key: str, sequence: int, after: Optional[Dict[str, str]]):
+        self.key = key             # _speech_key of the speculated text
+        self.sequence = sequence   # SequenceNumber of the partial it came from
+        self.after = after         # the conversation's last message it was built on
+        self.go = asyncio.Event()  # skip the rest of the settle delay
+        self.task: Optional[asyncio.Task] = None
 
 
-def _append_history(call_sid: str, role: str, content: str) -> None:
-    _get_history(call_sid).append({"role": role, "content": content})
+_speculations: "OrderedDict[str, _Speculation]" = OrderedDict()
 
 
-def _trim_history(call_sid: str, max_turns: int = 10) -> None:
-    """Keep the last N turns to avoid exceeding Groq token limits."""
-    history = _conversation_history.get(call_sid, [])
-    if len(history) > max_turns * 2:
-        _conversation_history[call_sid] = history[-(max_turns * 2):]
+def _speech_key(text: str) -> str:
+    """Transcript text compared case- and punctuation-insensitively."""
+    return " ".join(re.sub(r"[^\w\s']", " ", text.lower()).split())
 
 
-def _clear_history(call_sid: str) -> None:
-    _conversation_history.pop(call_sid, None)
+def _partial_text(stable: Optional[str], unstable: Optional[str]) -> str:
+    stable, unstable = (stable or "").strip(), (unstable or "").strip()
+    if not stable or _speech_key(unstable).startswith(_speech_key(stable)):
+        return unstable
+    return f"{stable} {unstable}".strip()
+
+
+async def _settled_completion(speculation: _Speculation, messages: List[Dict[str, str]]) -> str:
+    # Cancelled while the text is still changing, before any Groq request is made
+    try:
+        await asyncio.wait_for(speculation.go.wait(), SPECULATION_SETTLE_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+    return await _complete(messages)
+
+
+async def _speculate(call_sid: str, text: str, sequence: int) -> None:
+    """(Re)start the speculative completion for a call's latest interim transcript."""
+    key = _speech_key(text)
+    current = _speculations.get(call_sid)
+    if current is not None and (sequence <= current.sequence or key == current.key):
+        current.sequence = max(current.sequence, sequence)
+        return
+
+    store = get_conversation_store()
+    prompt = await store.context(call_sid)
+    if prompt is None:
+        return   # /process-speech renders the prompt first
+    history = await store.history(call_sid)
+    current = _speculations.get(call_sid)
+    if current is not None and sequence <= current.sequence:
+        return   # a later partial got here first
+    _drop_speculation(call_sid)
+
+    # The messages /process-speech would send: the history window once this
+    # utterance has been added to it
+    history = history[-(store.max_messages - 1):] if store.max_messages > 1 else []
+    messages = [{"role": "system", "content": prompt["system_prompt"]}] + history
+    messages.append({"role": "user", "content": text})
+
+    speculation = _Speculation(key, sequence, history[-1] if history else None)
+    speculation.task = asyncio.create_task(_settled_completion(speculation, messages))
+    _speculations[call_sid] = speculation
+    while len(_speculations) > SPECULATIONS_KEPT:
+        _speculations.popitem(last=False)[1].task.cancel()
+
+
+def _drop_speculation(call_sid: str) -> None:
+    speculation = _speculations.pop(call_sid, None)
+    if speculation is not None:
+        speculation.task.cancel()
+
+
+def _take_speculation(call_sid: str, speech: str, after: Optional[Dict[str, str]]) -> Optional[asyncio.Task]:
+    """The speculative completion for `speech`, if it was built on the same conversation."""
+    speculation = _speculations.pop(call_sid, None)
+    if speculation is None:
+        return None
+    if speculation.key != _speech_key(speech) or speculation.after != after:
+        speculation.task.cancel()
+        logger.info(f"[twilio/process-speech] CallSid={call_sid} speculation missed")
+        return None
+    speculation.go.set()
+    state = "finished" if speculation.task.done() else "in flight"
+    logger.info(f"[twilio/process-speech] CallSid={call_sid} speculation hit ({state})")
+    return speculation.task
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────────────
@@ -140,36 +502,69 @@ async def twilio_voice(
 
     Twilio calls this webhook when the lead picks up the phone.
     Returns TwiML that greets the lead and opens a speech <Gather>.
-    Also marks the queue item as 'calling'.
+    The dialer already marked the queue item 'calling'; this links the CallSid
+    to it if the answer beat the dialer storing it, and takes one of the
+    campaign's conversation slots. With predictive dialing every slot may be
+    busy — the call is then abandoned with a short apology and retried soon.
     """
     logger.info(f"[twilio/voice] CallSid={CallSid} To={To} From={From} Status={CallStatus}")
 
-    # Mark the queue item as "calling" (best-effort — don't fail the TwiML if DB is slow)
-    if To:
+    # Best-effort — don't fail the TwiML if DB is slow
+    seated = True
+    if CallSid:
         try:
-            await db.execute(
-                update(CallQueue)
-                .where(CallQueue.phone_number == To)
-                .where(CallQueue.status == "pending")
-                .values(status="calling", attempts=CallQueue.attempts + 1)
-            )
+            item_id = await QueueManager.resolve_call_item(db, CallSid, normalize_phone(To))
+            if item_id is not None:
+                seated = await QueueManager.claim_conversation_seat(db, item_id)
             await db.commit()
         except Exception as exc:
-            logger.warning(f"[twilio/voice] Could not update queue status: {exc}")
+            logger.warning(f"[twilio/voice] Could not resolve queue item: {exc}")
+        # Tell the dialing runner (any worker) without delaying the TwiML
+        _in_background(
+            get_completion_bus().publish(answered_key(CallSid), {"seated": seated}),
+            f"Announcing the answer of {CallSid}",
+        )
 
-    # Seed the conversation with the system prompt
-    if CallSid:
-        history = _get_history(CallSid)
-        if not history:
-            # No system message in the history list — we pass it separately to Groq
-            pass  # history starts empty; system prompt injected in process-speech
+    if not seated:
+        logger.info(f"[twilio/voice] No free conversation slot — abandoning CallSid={CallSid}")
+        return Response(content=_build_twiml_say_hangup(ABANDONED_MESSAGE), media_type=TWIML_CONTENT_TYPE)
 
-    action_url = _process_speech_url(request)
-    twiml = _build_twiml_gather(OPENING_GREETING, action_url)
+    # Normally rendered when the call was dialed; the lead is loaded only if not
+    try:
+        greeting = (await _call_prompt(db, CallSid, To))["greeting"]
+    except Exception as exc:
+        logger.warning(f"[twilio/voice] Could not load the call's prompt: {exc}")
+        greeting = build_call_prompt(None)["greeting"]
+
+    if get_settings().twilio_voice_mode.lower() == "relay":
+        twiml = _build_twiml_relay(_relay_url(request), greeting)
+    else:
+        twiml = _build_twiml_gather(greeting, _process_speech_url(request), _partial_speech_url(request))
 
     return Response(content=twiml, media_type=TWIML_CONTENT_TYPE)
 
 
+@router.post("/partial-speech")
+async def twilio_partial_speech(
+    CallSid: Optional[str] = Form(None),
+    StableSpeechResult: Optional[str] = Form(None),
+    UnstableSpeechResult: Optional[str] = Form(None),
+    SequenceNumber: Optional[int] = Form(None),
+):
+    """
+    Interim transcripts of the lead's speech (<Gather partialResultCallback>).
+
+    Posted several times a second while the lead talks. Each changed text
+    replaces the call's speculative completion, which only reaches Groq once
+    the text has stopped changing; /process-speech uses it if the final
+    SpeechResult says the same thing. Twilio ignores the response.
+    """
+    text = _partial_text(StableSpeechResult, UnstableSpeechResult)
+    if CallSid and text and get_settings().voice_speculative_replies:
+        await _speculate(CallSid, text, SequenceNumber or 0)
+    return Response(content="", status_code=204)
+
+
 @router.post("/process-speech")
 async def twilio_process_speech(
     request: Request,
@@ -187,7 +582,7 @@ async def twilio_process_speech(
     Receives the lead's speech, sends it to Groq, and returns the AI's reply as TwiML.
 
     Twilio POSTs here after every <Gather> collects speech.
-    The conversation history for the CallSid is maintained in-process.
+    The conversation history for the CallSid is kept in the conversation store.
     """
     logger.info(
         f"[twilio/process-speech] CallSid={CallSid} "
@@ -195,65 +590,212 @@ async def twilio_process_speech(
     )
 
     action_url = _process_speech_url(request)
+    partial_url = _partial_speech_url(request)
 
     # ── Handle speech timeout (no speech detected) ──────────────────────────
     if timeout:
         twiml = _build_twiml_gather(
             "I'm sorry, I didn't hear anything. Could you please say something?",
             action_url,
+            partial_url,
         )
         return Response(content=twiml, media_type=TWIML_CONTENT_TYPE)
 
     user_speech = (SpeechResult or "").strip()
 
     # ── Detect end-of-call intent ────────────────────────────────────────────
-    farewell_phrases = (
-        "bye", "goodbye", "hang up", "end call", "stop", "not interested",
-        "no thanks", "don't call", "remove me", "do not call"
-    )
-    if any(phrase in user_speech.lower() for phrase in farewell_phrases):
-        _clear_history(CallSid or "")
-        twiml = _build_twiml_say_hangup(
-            "Thank you for your time. Have a wonderful day! Goodbye."
-        )
+    if _is_farewell(user_speech):
+        await _end_conversation(db, CallSid, To, user_speech)
+        twiml = _build_twiml_say_hangup(FAREWELL_MESSAGE)
         return Response(content=twiml, media_type=TWIML_CONTENT_TYPE)
 
     # ── Build conversation history ───────────────────────────────────────────
+    store = get_conversation_store()
     if CallSid:
-        _append_history(CallSid, "user", user_speech)
-        _trim_history(CallSid)
-        history = _get_history(CallSid)
+        history = await store.append(CallSid, "user", user_speech)
     else:
         history = [{"role": "user", "content": user_speech}]
 
-    # ── Call Groq ────────────────────────────────────────────────────────────
-    try:
-        groq = get_groq_service()
-        messages = [{"role": "system", "content": SALES_AGENT_SYSTEM_PROMPT}] + history
-
-        response = await groq.client.chat.completions.create(
-            model=groq.fast_model,   # Use fast model for real-time voice
-            messages=messages,
-            temperature=0.65,
-            max_tokens=256,          # Keep responses short for voice
-        )
-        ai_reply = (response.choices[0].message.content or "").strip()
-    except Exception as exc:
-        logger.error(f"[twilio/process-speech] Groq error: {exc}", exc_info=True)
-        ai_reply = (
-            "I'm having a brief technical issue. Could you give me just a moment? "
-            "Please try again."
-        )
-
-    # Append AI reply to history
+    # ── Call Groq (within the latency budget) ────────────────────────────────
+    # A completion speculatively started from the interim transcript, if it
+    # heard the same words on the same conversation
+    completion = None
     if CallSid:
-        _append_history(CallSid, "assistant", ai_reply)
+        completion = _take_speculation(CallSid, user_speech, history[-2] if len(history) > 1 else None)
+    if completion is None:
+        prompt = await _call_prompt(db, CallSid, To)
+        messages = [{"role": "system", "content": prompt["system_prompt"]}] + history
+        completion = _complete(messages)
+    reply = asyncio.create_task(_generate_reply(CallSid, completion))
+    budget = get_settings().voice_reply_budget_seconds
+    if CallSid and budget > 0:
+        done, _ = await asyncio.wait({reply}, timeout=budget)
+        if not done:
+            # Say something now; /pending-reply serves the reply when it is ready
+            logger.info(f"[twilio/process-speech] CallSid={CallSid} reply over {budget}s budget — filler")
+            _hold_reply(CallSid, reply)
+            twiml = _build_twiml_filler(
+                random.choice(FILLER_PHRASES), _webhook_url(request, "twilio_pending_reply")
+            )
+            return Response(content=twiml, media_type=TWIML_CONTENT_TYPE)
+    ai_reply = await reply
 
     # ── Return TwiML ─────────────────────────────────────────────────────────
-    twiml = _build_twiml_gather(ai_reply, action_url)
+    twiml = _build_twiml_gather(ai_reply, action_url, partial_url)
     return Response(content=twiml, media_type=TWIML_CONTENT_TYPE)
 
 
+@router.post("/pending-reply")
+async def twilio_pending_reply(
+    request: Request,
+    CallSid: Optional[str] = Form(None),
+):
+    """
+    Serve a reply that missed the latency budget.
+
+    Twilio follows the <Redirect> here once the filler has been said; the
+    completion has usually finished by then. If it is still not ready after
+    PENDING_REPLY_TIMEOUT_SECONDS, the lead is asked to repeat themselves.
+    """
+    ai_reply = await _await_pending_reply(CallSid) if CallSid else None
+    if ai_reply is None:
+        logger.warning(f"[twilio/pending-reply] No reply for CallSid={CallSid} — asking to repeat")
+        ai_reply = LLM_ERROR_MESSAGE
+    twiml = _build_twiml_gather(ai_reply, _process_speech_url(request), _partial_speech_url(request))
+    return Response(content=twiml, media_type=TWIML_CONTENT_TYPE)
+
+
+class _RelayCall:
+    """
+    One ConversationRelay session. Each final prompt starts a reply task that
+    streams clauses back; a new prompt or an interruption cancels the reply
+    still being spoken, and only what the lead actually heard is kept in the
+    conversation.
+    """
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.call_sid: Optional[str] = None
+        self.to: Optional[str] = None
+        self.system_prompt = build_call_prompt(None)["system_prompt"]
+        self._reply: Optional[asyncio.Task] = None
+
+    async def handle(self, message: dict) -> bool:
+        """Act on one message from Twilio. Returns False once the call is over."""
+        kind = message.get("type")
+        if kind == "setup":
+            self.call_sid = message.get("callSid")
+            self.to = message.get("to")
+            logger.info(f"[twilio/relay] Connected CallSid={self.call_sid} To={self.to}")
+            try:
+                async with SessionLocal() as db:
+                    self.system_prompt = (await _call_prompt(db, self.call_sid, self.to))["system_prompt"]
+            except Exception as exc:
+                logger.warning(f"[twilio/relay] CallSid={self.call_sid} generic prompt — could not load it: {exc}")
+        elif kind == "prompt":
+            speech = (message.get("voicePrompt") or "").strip()
+            if message.get("last", True) and speech:
+                return await self._on_prompt(speech)
+        elif kind == "interrupt":
+            await self._cancel_reply(message.get("utteranceUntilInterrupt") or "")
+        elif kind == "error":
+            logger.warning(f"[twilio/relay] CallSid={self.call_sid} error: {message.get('description')}")
+        return True
+
+    async def _on_prompt(self, speech: str) -> bool:
+        logger.info(f"[twilio/relay] CallSid={self.call_sid} Speech='{speech[:80]}'")
+        await self._cancel_reply()
+        if _is_farewell(speech):
+            async with SessionLocal() as db:
+                await _end_conversation(db, self.call_sid, self.to, speech)
+            await self._send_text(FAREWELL_MESSAGE, last=True)
+            await self.websocket.send_json({"type": "end"})
+            return False
+        self._reply = asyncio.create_task(self._speak_reply(speech))
+        self._reply.add_done_callback(self._reply_done)
+        return True
+
+    def _reply_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"[twilio/relay] CallSid={self.call_sid} reply failed: {task.exception()}")
+
+    async def _speak_reply(self, speech: str) -> None:
+        store = get_conversation_store()
+        if self.call_sid:
+            history = await store.append(self.call_sid, "user", speech)
+        else:
+            history = [{"role": "user", "content": speech}]
+        messages = [{"role": "system", "content": self.system_prompt}] + history
+
+        started = time.perf_counter()
+        spoken: List[str] = []
+        try:
+            async for clause in _stream_reply(messages):
+                if not spoken:
+                    logger.info(
+                        f"[twilio/relay] CallSid={self.call_sid} first clause after "
+                        f"{(time.perf_counter() - started) * 1000:.0f}ms"
+                    )
+                spoken.append(clause)
+                await self._send_text(clause)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"[twilio/relay] Groq error: {exc}", exc_info=True)
+            if not spoken:
+                spoken.append(LLM_ERROR_MESSAGE)
+                await self._send_text(LLM_ERROR_MESSAGE)
+        await self._send_text("", last=True)
+
+        reply = "".join(spoken).strip()
+        if self.call_sid and reply:
+            await store.append(self.call_sid, "assistant", reply)
+
+    async def _cancel_reply(self, heard: str = "") -> None:
+        """Stop the reply in progress; `heard` is the part the lead heard before interrupting."""
+        task, self._reply = self._reply, None
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass   # failures are logged by _reply_done
+        if self.call_sid and heard.strip():
+            await get_conversation_store().append(self.call_sid, "assistant", heard.strip())
+
+    async def _send_text(self, token: str, last: bool = False) -> None:
+        await self.websocket.send_json({"type": "text", "token": token, "last": last})
+
+    async def close(self) -> None:
+        await self._cancel_reply()
+
+
+@router.websocket("/relay", name="twilio_relay")
+async def twilio_relay(websocket: WebSocket):
+    """
+    ConversationRelay WebSocket (TWILIO_VOICE_MODE=relay).
+
+    Twilio sends a ``setup`` message, then a ``prompt`` with each transcribed
+    utterance of the lead (and ``interrupt`` when the lead talks over the
+    agent). Replies are streamed from Groq and sent back as ``text`` tokens
+    one clause at a time, so speech starts with the first clause.
+    The conversation is kept in the conversation store, like the <Gather> loop's,
+    and /status still saves it when the call ends.
+    """
+    await websocket.accept()
+    call = _RelayCall(websocket)
+    try:
+        async for message in websocket.iter_json():
+            if not await call.handle(message):
+                break
+    except Exception as exc:
+        logger.warning(f"[twilio/relay] CallSid={call.call_sid} connection error: {exc}")
+    finally:
+        await call.close()
+    logger.info(f"[twilio/relay] Disconnected CallSid={call.call_sid}")
+
+
 @router.post("/status")
 async def twilio_status(
     request: Request,
@@ -271,9 +813,9 @@ async def twilio_status(
       initiated → ringing → in-progress → completed | busy | no-answer | failed | canceled
 
     On terminal statuses we:
-      - Update the CallQueue row
+      - Update the CallQueue row (or reschedule it per the retry policy)
       - Persist a minimal CallSession and clean up history
-      - Clean up in-memory conversation history
+      - Remove the call's conversation from the conversation store
     """
     logger.info(
         f"[twilio/status] CallSid={CallSid} Status={CallStatus} "
@@ -286,37 +828,38 @@ async def twilio_status(
         # Non-terminal — nothing to do
         return Response(content="", status_code=204)
 
-    # ── Clean up in-memory history ───────────────────────────────────────────
-    history = _conversation_history.pop(CallSid or "", [])
+    # ── Take the conversation out of the store ───────────────────────────────
+    if CallSid:
+        _drop_pending_reply(CallSid)
+        _drop_speculation(CallSid)
+    history = await get_conversation_store().pop(CallSid) if CallSid else []
 
-    # ── Map Twilio status → queue status ────────────────────────────────────
-    _status_map = {
-        "completed": "completed",
-        "no-answer": "no_answer",
-        "busy":      "failed",
-        "canceled":  "failed",
-        "failed":    "failed",
-    }
-    queue_status = _status_map.get(CallStatus, "failed")
+    # ── Map Twilio status → attempt outcome ─────────────────────────────────
+    outcome = TWILIO_CALL_OUTCOMES.get(CallStatus, "failed")
+    session_status = TERMINAL_QUEUE_STATUS[outcome]
 
-    phone = To
+    phone = normalize_phone(To)
     duration = int(CallDuration or 0)
 
-    if not phone:
-        logger.warning("[twilio/status] No 'To' phone in status callback — cannot update DB")
+    if not phone and not CallSid:
+        logger.warning("[twilio/status] Neither CallSid nor 'To' in status callback — cannot update DB")
         return Response(content="", status_code=204)
 
     try:
-        # Update the queue item
-        await db.execute(
-            update(CallQueue)
-            .where(CallQueue.phone_number == phone)
-            .where(CallQueue.status == "calling")
-            .values(status=queue_status)
-        )
+        # Update the queue item (found by CallSid) — terminal, or rescheduled per the retry policy
+        item_id = await QueueManager.resolve_call_item(db, CallSid, phone)
+        new_status = None
+        if item_id is not None:
+            new_status = await QueueManager.apply_call_outcome(db, item_id, outcome)
+
+        # The lead is upserted by number: without 'To', the one the row was dialed at
+        if not phone:
+            phone = await _call_phone_number(db, CallSid)
 
         # Persist a CallSession for every terminal outcome
-        save_session = True
+        save_session = phone is not None
+        if not save_session:
+            logger.warning(f"[twilio/status] No 'To' and no queue row for CallSid={CallSid} — no CallSession saved")
         if save_session:
             # Reconstruct a plain-text transcript from history (empty for no-answer/busy)
             transcript_lines = [
@@ -355,7 +898,7 @@ async def twilio_status(
                     }.get(CallStatus, "[No speech captured]"),
                     structured_data={},
                     call_duration=duration,
-                    call_status=queue_status,  # "completed" | "no_answer"
+                    call_status=session_status,  # "completed" | "no_answer" | "failed"
                 )
                 db.add(session)
                 logger.info(
@@ -365,10 +908,12 @@ async def twilio_status(
 
         await db.commit()
 
-        # ── Signal campaign runner / trigger next item ────────────────────
-        from app.services.queue_manager import notify_call_completed, QueueManager
-        notify_call_completed(phone)
-        asyncio.create_task(QueueManager.process_next_item())
+        # ── Signal campaign runner (in any worker) / trigger next item ────
+        if CallSid:
+            await get_completion_bus().publish(
+                CallSid, {"status": new_status, "outcome": outcome, "duration": duration}
+            )
+        _in_background(QueueManager.process_next_item(), "Dialing the next queue item")
 
     except Exception as exc:
         logger.error(f"[twilio/status] DB update failed: {exc}", exc_info=True)
@@ -5,14 +5,15 @@ Groups:
   - Lead schemas      — CRUD for lead profiles
   - Queue schemas     — Call queue management
   - CallSession       — Completed call records
+  - Do-not-call       — Suppression list management
   - Webhook schemas   — Twilio status callbacks (internal use)
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
 
 # ──────────────────────────────────────────────
@@ -103,6 +104,7 @@ class QueueStatsResponse(BaseModel):
     completed: int
     no_answer: int = 0
     failed:    int
+    canceled:  int = 0
     total:     int
 
 
@@ -140,14 +142,101 @@ class QueueListResponse(BaseModel):
     limit:  int
 
 
+QueueStatus = Literal["pending", "calling", "completed", "no_answer", "failed", "canceled"]
+
+
+class QueueOperationRequest(BaseModel):
+    """Filters (ANDed) for a bulk queue operation; omitted ones match everything."""
+    statuses:           Optional[List[QueueStatus]] = None   # default depends on the operation
+    campaign_id:        Optional[UUID] = None
+    older_than_minutes: Optional[int] = Field(None, ge=1)    # last changed at least this long ago
+    phone_numbers:      Optional[List[str]] = None
+    dry_run:            bool = False                         # only count and preview
+
+
+class QueueOperationResponse(BaseModel):
+    id:          Optional[UUID] = None   # None for a dry run
+    operation:   str
+    status:      str                     # dry_run | running | completed | failed
+    filters:     Dict[str, Any]
+    matched:     int
+    affected:    int = 0
+    sample:      Optional[List[Dict[str, Any]]] = None
+    error:       Optional[str] = None
+    created_at:  Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
 # ──────────────────────────────────────────────
 #  CAMPAIGN SCHEMAS
 # ──────────────────────────────────────────────
 
+class CampaignStartRequest(BaseModel):
+    name:                 Optional[str] = None
+    max_concurrent_calls: Optional[int] = Field(None, ge=1)   # parallel call slots
+    dial_mode:            Optional[Literal["progressive", "predictive"]] = None
+
+
 class CampaignStartResponse(BaseModel):
-    campaign_id: str
-    status:      str
-    message:     str
+    campaign_id:          str
+    status:               str
+    max_concurrent_calls: int
+    dial_mode:            str = "progressive"
+    total_items:          int = 0
+    message:              str
+
+
+class CampaignResponse(BaseModel):
+    id:                   UUID
+    name:                 Optional[str] = None
+    status:               str
+    max_concurrent_calls: int
+    dial_mode:            str = "progressive"
+    total_items:          int
+    completed_count:      int
+    no_answer_count:      int
+    failed_count:         int
+    canceled_count:       int
+    created_at:           datetime
+    updated_at:           datetime
+    finished_at:          Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def remaining(self) -> int:
+        done = self.completed_count + self.no_answer_count + self.failed_count + self.canceled_count
+        return max(self.total_items - done, 0)
+
+
+class CampaignListResponse(BaseModel):
+    campaigns: List[CampaignResponse]
+    limit:     int
+    offset:    int
+
+
+# ──────────────────────────────────────────────
+#  DO-NOT-CALL SCHEMAS
+# ──────────────────────────────────────────────
+
+class DoNotCallRequest(BaseModel):
+    phone_numbers: List[str] = Field(..., min_length=1)
+
+
+class DoNotCallResponse(BaseModel):
+    phone_number: str
+    reason:       str
+    call_sid:     Optional[str] = None
+    created_at:   datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DoNotCallListResponse(BaseModel):
+    numbers: List[DoNotCallResponse]
+    total:   int
+    page:    int
+    limit:   int
 
 
 # ──────────────────────────────────────────────
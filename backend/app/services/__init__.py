@@ -1,2 +1,5 @@
 # Services package — outbound AI sales calling platform
-# Services: groq_service, queue_manager
+# Services: groq_service, queue_manager, call_pacer, twilio_client,
+#           telephony, completion_bus, call_reaper, queue_compactor,
+#           lead_scoring, call_scheduler, predictive_dialer, dnc_list,
+#           queue_operations, phone_numbers, conversation_store
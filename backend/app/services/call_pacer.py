@@ -0,0 +1,183 @@
+"""
+Call Pacer
+==========
+Account-wide token bucket for outbound dials, coordinated through PostgreSQL.
+
+Twilio enforces a calls-per-second (CPS) limit per account, not per process,
+so the bucket lives in the ``dial_rate_limits`` table and every dialer worker
+takes tokens from the same row.
+
+How a take works:
+  - One UPDATE refills the bucket from the time elapsed since ``refilled_at``
+    (capped at the burst size) and removes a token, but only if at least one
+    token is available and no 429 back-off is in force.
+  - Row-level locking serialises concurrent takers, and each one re-evaluates
+    the refill against the latest row — no token is handed out twice.
+  - When the take is refused, a read tells the caller how long to sleep. Only
+    a successful UPDATE grants a token: a bucket that refilled between the two
+    statements just means a short sleep and another try.
+
+HTTP 429 from Twilio empties the bucket and blocks it for ``Retry-After``
+seconds, or exponentially longer on consecutive 429s when no header is sent.
+"""
+
+import asyncio
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy import Float, func, literal, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import get_settings
+from app.db.database import SessionLocal
+from app.db.models import DialRateLimit
+
+logger = logging.getLogger(__name__)
+
+BACKOFF_BASE_SECONDS = 1.0    # First 429 without Retry-After blocks dialing this long
+BACKOFF_MAX_SECONDS  = 60.0   # Cap for consecutive 429 back-off
+MIN_WAIT_SECONDS     = 0.02   # Don't spin on sub-millisecond waits
+MAX_WAIT_SECONDS     = 5.0    # Re-check at least this often (rate may be changed)
+
+
+class CallPacer:
+    """
+    Shared token bucket — ``await pacer.acquire()`` before every outbound dial.
+
+    Example usage:
+        pacer = get_call_pacer()
+        await pacer.acquire()
+        ...dial...
+    """
+
+    def __init__(
+        self,
+        bucket: str = "twilio",
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+    ):
+        settings = get_settings()
+        self.bucket = bucket
+        self.rate = rate or settings.dialer_calls_per_second
+        self.burst = float(max(1, burst or settings.dialer_cps_burst))
+        self._backing_off = False  # True once this process has reported a 429
+
+    def _available(self):
+        """SQL expression: tokens in the bucket right now, refill included."""
+        elapsed = func.extract("epoch", func.clock_timestamp() - DialRateLimit.refilled_at)
+        return func.least(self.burst, DialRateLimit.tokens + elapsed * self.rate)
+
+    async def acquire(self) -> None:
+        """Block until a dial token is granted to this process."""
+        while True:
+            granted, wait = await self._try_take()
+            if granted:
+                return
+            await asyncio.sleep(min(max(wait, MIN_WAIT_SECONDS), MAX_WAIT_SECONDS))
+
+    async def _try_take(self) -> Tuple[bool, float]:
+        """Take one token. Returns (granted, seconds until one may be available)."""
+        available = self._available()
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(DialRateLimit)
+                .where(DialRateLimit.name == self.bucket)
+                .where(
+                    (DialRateLimit.backoff_until.is_(None))
+                    | (DialRateLimit.backoff_until <= func.clock_timestamp())
+                )
+                .where(available >= 1)
+                .values(tokens=available - 1, refilled_at=func.clock_timestamp())
+                .returning(DialRateLimit.tokens)
+            )
+            granted = result.first() is not None
+            await db.commit()
+            if granted:
+                return True, 0.0
+
+            row = (
+                await db.execute(
+                    select(
+                        available,
+                        func.extract(
+                            "epoch", DialRateLimit.backoff_until - func.clock_timestamp()
+                        ),
+                    ).where(DialRateLimit.name == self.bucket)
+                )
+            ).first()
+
+            if row is None:
+                # First use of this bucket — start it full, then retry at once
+                await db.execute(
+                    pg_insert(DialRateLimit)
+                    .values(name=self.bucket, tokens=self.burst, backoff_level=0)
+                    .on_conflict_do_nothing(index_elements=[DialRateLimit.name])
+                )
+                await db.commit()
+                return False, MIN_WAIT_SECONDS
+
+        tokens, backoff_remaining = row
+        refill_wait = (1.0 - float(tokens)) / self.rate
+        return False, max(refill_wait, float(backoff_remaining or 0.0), MIN_WAIT_SECONDS)
+
+    async def penalize(self, retry_after: Optional[float] = None) -> None:
+        """
+        Record an HTTP 429 from Twilio: drain the bucket and block every worker
+        for ``retry_after`` seconds (or an exponential back-off).
+        """
+        if retry_after is not None:
+            delay = literal(float(retry_after), Float)
+        else:
+            delay = func.least(
+                BACKOFF_MAX_SECONDS,
+                BACKOFF_BASE_SECONDS * func.power(2, DialRateLimit.backoff_level),
+            )
+        blocked_until = func.clock_timestamp() + delay * literal_column("INTERVAL '1 second'")
+
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(DialRateLimit)
+                .where(DialRateLimit.name == self.bucket)
+                .values(
+                    tokens=0.0,
+                    refilled_at=func.clock_timestamp(),
+                    backoff_until=func.greatest(
+                        func.coalesce(DialRateLimit.backoff_until, blocked_until),
+                        blocked_until,
+                    ),
+                    backoff_level=DialRateLimit.backoff_level + 1,
+                )
+                .returning(DialRateLimit.backoff_until)
+            )
+            until = result.scalar()
+            await db.commit()
+
+        self._backing_off = True
+        logger.warning(f"[Pacer] Twilio rate limit hit — dialing paused until {until}")
+
+    async def record_success(self) -> None:
+        """Reset the exponential back-off after a dial goes through."""
+        if not self._backing_off:
+            return
+        async with SessionLocal() as db:
+            await db.execute(
+                update(DialRateLimit)
+                .where(DialRateLimit.name == self.bucket)
+                .where(DialRateLimit.backoff_level > 0)
+                .values(backoff_level=0)
+            )
+            await db.commit()
+        self._backing_off = False
+
+
+# ── Module-level singleton (lazy-initialized) ─────────────────────────────────
+_call_pacer: Optional[CallPacer] = None
+
+
+def get_call_pacer() -> CallPacer:
+    """Return the process-wide CallPacer for the configured Twilio account."""
+    global _call_pacer
+    if _call_pacer is None:
+        settings = get_settings()
+        _call_pacer = CallPacer(bucket=f"twilio:{settings.twilio_account_sid or 'default'}")
+    return _call_pacer
@@ -0,0 +1,205 @@
+"""
+Stuck-Call Reaper
+=================
+Periodic lifespan task that reconciles in-flight calls with the telephony
+provider (Twilio, or the simulator).
+
+A queue row stays ``calling`` until Twilio's status webhook reports how the
+call ended. If that webhook is lost (deploy, network blip, crashed worker),
+the row — and the line and campaign slot behind it — would never be freed.
+Guessing is worse: a call can legitimately run for many minutes.
+
+Every REAPER_INTERVAL_SECONDS one worker (advisory lock) runs a pass:
+  1. Pick up to REAPER_BATCH_SIZE rows dialed more than STALE_CALL_SECONDS ago.
+  2. Look all their CallSids up at once — for Twilio, one paged Calls-list
+     query with direct fetches for the few the listing did not cover (a
+     handful of SIDs, e.g. one call a runner waits on, are only fetched).
+  3. Apply the real terminal status of every finished call in one bulk update
+     (retry scheduling + campaign counters included), record a CallSession
+     with the reported duration, and wake any runner waiting on those calls.
+
+Calls the provider still reports as queued / ringing / in-progress are left
+alone, and so are those it cannot report on (a lookup that failed, or a
+simulated call placed by another worker). Only a CallSid the provider
+confirms it never placed (Twilio: 404) is counted as a failed attempt.
+A row that never got a CallSid (the worker died while dialing) is matched to
+the call placed to that number, if any, else counted as a failed attempt.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.database import SessionLocal
+from app.db.models import CallQueue, CallSession, Lead
+from app.services.completion_bus import get_completion_bus
+from app.services.queue_manager import QueueManager
+from app.services.retry_policy import TERMINAL_QUEUE_STATUS, TWILIO_CALL_OUTCOMES
+from app.services.telephony import get_telephony_provider
+
+logger = logging.getLogger(__name__)
+
+REAPER_INTERVAL_SECONDS = 60    # Time between reconciliation passes
+STALE_CALL_SECONDS      = 120   # Only reconcile calls dialed at least this long ago
+REAPER_BATCH_SIZE       = 500   # In-flight rows examined per pass
+
+# Arbitrary constant identifying the reaper lock (pg_try_advisory_xact_lock key)
+_REAPER_LOCK_KEY = 0x7265_6170  # "reap"
+
+# CallSession transcript for calls whose conversation was never captured
+_RECONCILED_TRANSCRIPTS = {
+    "completed": "[Status callback lost — reconciled with the provider]",
+    "no-answer": "[No answer]",
+    "busy":      "[Busy]",
+    "failed":    "[Call failed]",
+    "canceled":  "[Call canceled]",
+}
+
+
+async def reap_stuck_calls(
+    item_ids: Optional[List[Any]] = None,
+    stale_seconds: int = STALE_CALL_SECONDS,
+) -> Dict[Any, str]:
+    """
+    Reconcile in-flight queue rows with the provider — the stale ones, or exactly
+    ``item_ids`` when given. Returns ``{item_id: new queue status}`` for the
+    rows settled by this call.
+    """
+    async with SessionLocal() as db:
+        query = (
+            select(CallQueue.id, CallQueue.phone_number, CallQueue.call_sid, CallQueue.dialed_at)
+            .where(CallQueue.status == "calling")
+        )
+        if item_ids is not None:
+            query = query.where(CallQueue.id.in_(item_ids))
+        else:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_seconds)
+            dialed_at = func.coalesce(CallQueue.dialed_at, CallQueue.updated_at)
+            query = query.where(dialed_at < cutoff).order_by(dialed_at).limit(REAPER_BATCH_SIZE)
+        rows = (await db.execute(query)).all()
+    if not rows:
+        return {}
+
+    oldest = min(row.dialed_at or datetime.now(timezone.utc) for row in rows)
+    by_sid, latest_by_phone = await get_telephony_provider().lookup_calls(
+        (row.call_sid for row in rows if row.call_sid),
+        (row.phone_number for row in rows if not row.call_sid),
+        since=oldest,
+    )
+
+    # ── Decide which rows have really finished ────────────────────────────
+    finished: Dict[Any, Dict[str, Any]] = {}
+    for row in rows:
+        if row.call_sid:
+            if row.call_sid not in by_sid:
+                continue   # the provider cannot tell right now — a later pass will
+            # None: the provider confirms it never placed the call
+            call = by_sid[row.call_sid] or {"sid": row.call_sid, "status": "failed"}
+        else:
+            call = latest_by_phone.get(row.phone_number)
+            started = _parse_twilio_time(call.get("date_created")) if call else None
+            if call is None or (row.dialed_at and started and started < row.dialed_at - timedelta(minutes=1)):
+                # Never reached the provider (or only an older call exists)
+                call = {"sid": None, "status": "failed"}
+        if call.get("status") in TWILIO_CALL_OUTCOMES:
+            finished[row.id] = {"row": row, "call": call}
+    if not finished:
+        return {}
+
+    # ── Apply everything in one transaction ───────────────────────────────
+    async with SessionLocal() as db:
+        applied = await QueueManager.apply_call_outcomes(
+            db,
+            {item_id: TWILIO_CALL_OUTCOMES[f["call"]["status"]] for item_id, f in finished.items()},
+            skip_locked=True,   # the webhook may be settling the same call right now
+        )
+        if not applied:
+            return {}
+        settled = [finished[item_id] for item_id in applied]
+        await _record_sessions(db, settled)
+        await db.commit()
+
+    await get_completion_bus().publish_many(
+        (
+            f["row"].call_sid or f["call"]["sid"],
+            {
+                "status":   applied[f["row"].id],
+                "outcome":  TWILIO_CALL_OUTCOMES[f["call"]["status"]],
+                "duration": int(f["call"].get("duration") or 0),
+            },
+        )
+        for f in settled
+        if f["row"].call_sid or f["call"]["sid"]
+    )
+    logger.info(f"[Reaper] Settled {len(applied)} of {len(rows)} in-flight calls")
+    return applied
+
+
+async def _record_sessions(db, settled: List[Dict[str, Any]]) -> None:
+    """Insert a CallSession per settled call; calls the webhook already saved are skipped."""
+    with_sid = [f for f in settled if f["call"].get("sid")]
+    if not with_sid:
+        return
+    result = await db.execute(
+        select(Lead.phone_number, Lead.id)
+        .where(Lead.phone_number.in_({f["row"].phone_number for f in with_sid}))
+    )
+    lead_ids = dict(result.all())
+
+    sessions = []
+    for f in with_sid:
+        lead_id = lead_ids.get(f["row"].phone_number)
+        if lead_id is None:
+            continue
+        twilio_status = f["call"]["status"]
+        sessions.append({
+            "id":              uuid.uuid4(),
+            "call_sid":        f["call"]["sid"],
+            "lead_id":         lead_id,
+            "transcript":      _RECONCILED_TRANSCRIPTS.get(twilio_status, "[No speech captured]"),
+            "structured_data": {},
+            "call_duration":   int(f["call"].get("duration") or 0),
+            "call_status":     TERMINAL_QUEUE_STATUS[TWILIO_CALL_OUTCOMES[twilio_status]],
+        })
+    if sessions:
+        await db.execute(
+            pg_insert(CallSession)
+            .values(sessions)
+            .on_conflict_do_nothing(index_elements=[CallSession.call_sid])
+        )
+
+
+def _parse_twilio_time(value: Optional[str]) -> Optional[datetime]:
+    """Twilio timestamps are RFC 2822, e.g. 'Sat, 18 Oct 2026 10:00:00 +0000'."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def run_call_reaper() -> None:
+    """Lifespan task: one reconciliation pass every REAPER_INTERVAL_SECONDS."""
+    try:
+        get_telephony_provider()
+    except ValueError as e:
+        logger.warning(f"[Reaper] Not started: {e}")
+        return
+
+    while True:
+        await asyncio.sleep(REAPER_INTERVAL_SECONDS)
+        try:
+            # Only one worker reconciles per pass; the lock ends with the transaction
+            async with SessionLocal() as lock_db:
+                locked = await lock_db.execute(select(func.pg_try_advisory_xact_lock(_REAPER_LOCK_KEY)))
+                if locked.scalar():
+                    await reap_stuck_calls()
+        except Exception as e:
+            logger.warning(f"[Reaper] Pass failed: {e}")
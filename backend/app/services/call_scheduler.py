@@ -0,0 +1,316 @@
+"""
+Best-Time Call Scheduler
+========================
+Defers each pending queue item to the hour it is most likely to be answered.
+
+Answer-rate histograms (calls placed / answered per UTC hour-of-week) are kept
+in ``answer_rate_buckets`` at three levels:
+
+  - global  — every call
+  - region  — calls to the same phone prefix (REGION_PREFIX_LENGTH characters
+              of the E.164 number: country code plus leading digits)
+  - lead    — calls to the same lead, where history exists
+
+They are built incrementally: each pass folds in only the CallSessions that
+arrived since the ``job_watermarks`` row, in one upsert per level.
+
+For every item not yet scheduled for its current attempt, the answer
+probability of each of the next 168 hours is estimated by shrinking the lead
+histogram towards the region, and the region towards the global one
+(SHRINKAGE_CALLS pseudo-calls), so sparse history never dominates. The item's
+``next_attempt_at`` is moved to the first hour within WINDOW_TOLERANCE of the
+best one — never earlier than the retry policy allowed. ``scheduled_attempt``
+records the attempt this was done for, so an item is scheduled once per attempt.
+
+Nothing is deferred until the global histogram holds MIN_HISTORY_CALLS calls.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import DateTime, Integer, String, cast, column, func, literal, or_, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+
+from app.config import get_settings
+from app.db.database import SessionLocal
+from app.db.models import AnswerRateBucket, CallQueue, CallSession, JobWatermark, Lead
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_INTERVAL_SECONDS = 600     # Time between histogram refresh + scheduling passes
+SCHEDULE_CHUNK_SIZE        = 5000    # Queue items scheduled per statement
+SESSION_SETTLE_SECONDS     = 60      # Newer sessions may still be committing — next pass
+REGION_PREFIX_LENGTH       = 5       # "+1555…", "+9198…"
+MIN_HISTORY_CALLS          = 200     # No deferral before the global histogram has this many
+SHRINKAGE_CALLS            = 20.0    # Pseudo-calls pulling a histogram towards its parent
+WINDOW_TOLERANCE           = 0.1     # Take the first hour within 10% of the best one
+
+HOURS_PER_WEEK    = 7 * 24
+ANSWERED_STATUS   = "completed"
+COUNTED_STATUSES  = ("completed", "no_answer")   # failed calls say nothing about the hour
+HISTOGRAM_WATERMARK = "answer_rate_buckets"
+
+# Arbitrary constant identifying the scheduler lock (pg_try_advisory_xact_lock key)
+_SCHEDULER_LOCK_KEY = 0x7768_656e  # "when"
+
+Histogram = Tuple[np.ndarray, np.ndarray]   # (calls, answered), each of shape (168,)
+
+
+# ──────────────────────────────────────────────
+#  HISTOGRAMS
+# ──────────────────────────────────────────────
+
+async def refresh_answer_histograms(db) -> None:
+    """
+    Fold CallSessions recorded since the last refresh into the histograms.
+    Runs in the caller's transaction — commit it to publish the counts and the
+    new watermark together. Callers must serialise (see run_call_scheduler).
+    """
+    result = await db.execute(
+        select(JobWatermark.processed_until).where(JobWatermark.name == HISTOGRAM_WATERMARK)
+    )
+    processed_until = result.scalar()
+    upper = datetime.now(timezone.utc) - timedelta(seconds=SESSION_SETTLE_SECONDS)
+
+    utc = func.timezone("UTC", CallSession.timestamp)
+    sessions = (
+        select(
+            CallSession.lead_id,
+            Lead.phone_number,
+            CallSession.call_status,
+            cast(func.extract("isodow", utc) - 1, Integer).label("day_of_week"),
+            cast(func.extract("hour", utc), Integer).label("hour"),
+        )
+        .join(Lead, Lead.id == CallSession.lead_id)
+        .where(CallSession.call_status.in_(COUNTED_STATUSES))
+        .where(CallSession.timestamp <= upper)
+    )
+    if processed_until is not None:
+        sessions = sessions.where(CallSession.timestamp > processed_until)
+    sessions = sessions.cte("new_sessions")
+
+    scopes = {
+        "global": None,
+        "region": func.left(sessions.c.phone_number, REGION_PREFIX_LENGTH),
+        "lead":   cast(sessions.c.lead_id, String),
+    }
+    for scope, key in scopes.items():
+        group_by = [sessions.c.day_of_week, sessions.c.hour] + ([key] if key is not None else [])
+        counts = (
+            select(
+                literal(scope, String),
+                key if key is not None else literal("", String),
+                sessions.c.day_of_week,
+                sessions.c.hour,
+                func.count(),
+                func.count().filter(sessions.c.call_status == ANSWERED_STATUS),
+            )
+            .group_by(*group_by)
+        )
+        upsert = pg_insert(AnswerRateBucket).from_select(
+            ["scope", "key", "day_of_week", "hour", "calls", "answered"], counts
+        )
+        await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["scope", "key", "day_of_week", "hour"],
+                set_={
+                    "calls":    AnswerRateBucket.calls + upsert.excluded.calls,
+                    "answered": AnswerRateBucket.answered + upsert.excluded.answered,
+                },
+            )
+        )
+
+    watermark = pg_insert(JobWatermark).values(name=HISTOGRAM_WATERMARK, processed_until=upper)
+    await db.execute(
+        watermark.on_conflict_do_update(
+            index_elements=[JobWatermark.name],
+            set_={"processed_until": watermark.excluded.processed_until},
+        )
+    )
+
+
+async def _load_histograms(db, scope: str, keys) -> Dict[str, Histogram]:
+    """Histograms of ``scope`` for ``keys``, as dense hour-of-week arrays."""
+    keys = list(keys)
+    if not keys:
+        return {}
+    result = await db.execute(
+        select(
+            AnswerRateBucket.key,
+            AnswerRateBucket.day_of_week,
+            AnswerRateBucket.hour,
+            AnswerRateBucket.calls,
+            AnswerRateBucket.answered,
+        )
+        .where(AnswerRateBucket.scope == scope)
+        .where(AnswerRateBucket.key.in_(keys))
+    )
+    histograms: Dict[str, Histogram] = {}
+    for key, day_of_week, hour, calls, answered in result.all():
+        if key not in histograms:
+            histograms[key] = (np.zeros(HOURS_PER_WEEK), np.zeros(HOURS_PER_WEEK))
+        slot = day_of_week * 24 + hour
+        histograms[key][0][slot] = calls
+        histograms[key][1][slot] = answered
+    return histograms
+
+
+def _shrink(prior: np.ndarray, keys, histograms: Dict[str, Histogram]) -> np.ndarray:
+    """
+    Row i: answer rate per hour from ``histograms[keys[i]]`` pulled towards
+    ``prior[i]`` (or just ``prior[i]`` without history).
+    """
+    calls = np.zeros_like(prior)
+    answered = np.zeros_like(prior)
+    for i, key in enumerate(keys):
+        if key in histograms:
+            calls[i], answered[i] = histograms[key]
+    return (answered + SHRINKAGE_CALLS * prior) / (calls + SHRINKAGE_CALLS)
+
+
+# ──────────────────────────────────────────────
+#  SCHEDULING
+# ──────────────────────────────────────────────
+
+def best_hour_offsets(rates: np.ndarray, start_slots: np.ndarray) -> np.ndarray:
+    """
+    For row i, hours to wait after hour-of-week ``start_slots[i]`` until the
+    first hour whose answer rate is within WINDOW_TOLERANCE of the week's best.
+    """
+    slots = (start_slots[:, None] + np.arange(HOURS_PER_WEEK)) % HOURS_PER_WEEK
+    window = np.take_along_axis(rates, slots, axis=1)
+    good = window >= (1.0 - WINDOW_TOLERANCE) * window.max(axis=1, keepdims=True)
+    return good.argmax(axis=1)   # first True
+
+
+async def schedule_call_windows(campaign_id=None) -> int:
+    """
+    Move unscheduled pending items (of ``campaign_id``, or all) to their best
+    calling hour. Returns the number of items deferred.
+    """
+    if not get_settings().dialer_best_time_scheduling:
+        return 0
+
+    async with SessionLocal() as db:
+        overall = (await _load_histograms(db, "global", [""])).get("")
+    if overall is None or overall[0].sum() < MIN_HISTORY_CALLS:
+        return 0
+    calls, answered = overall
+    base_rate = (answered.sum() + 1.0) / (calls.sum() + 2.0)
+    global_rates = (answered + SHRINKAGE_CALLS * base_rate) / (calls + SHRINKAGE_CALLS)
+
+    deferred = 0
+    scheduled = 0
+    after_id = None
+    while True:
+        async with SessionLocal() as db:
+            query = (
+                select(
+                    CallQueue.id,
+                    CallQueue.phone_number,
+                    CallQueue.attempts,
+                    CallQueue.next_attempt_at,
+                    Lead.id.label("lead_id"),
+                )
+                .outerjoin(Lead, Lead.phone_number == CallQueue.phone_number)
+                .where(CallQueue.status == "pending")
+                .where(
+                    or_(
+                        CallQueue.scheduled_attempt.is_(None),
+                        CallQueue.scheduled_attempt != CallQueue.attempts,
+                    )
+                )
+                .order_by(CallQueue.id)
+                .limit(SCHEDULE_CHUNK_SIZE)
+            )
+            if campaign_id is not None:
+                query = query.where(CallQueue.campaign_id == campaign_id)
+            if after_id is not None:
+                query = query.where(CallQueue.id > after_id)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                break
+            after_id = rows[-1].id
+
+            regions = [r.phone_number[:REGION_PREFIX_LENGTH] for r in rows]
+            leads = [str(r.lead_id) if r.lead_id else None for r in rows]
+            rates = np.tile(global_rates, (len(rows), 1))
+            rates = _shrink(rates, regions, await _load_histograms(db, "region", set(regions)))
+            rates = _shrink(rates, leads, await _load_histograms(db, "lead", set(leads) - {None}))
+
+            now = datetime.now(timezone.utc)
+            starts = [
+                max(now, r.next_attempt_at).astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+                for r in rows
+            ]
+            start_slots = np.fromiter(
+                (s.weekday() * 24 + s.hour for s in starts), dtype=np.intp, count=len(rows)
+            )
+            offsets = best_hour_offsets(rates, start_slots)
+
+            changes = []
+            for row, start, offset in zip(rows, starts, offsets):
+                not_before: Optional[datetime] = start + timedelta(hours=int(offset)) if offset else None
+                changes.append((row.id, row.attempts, not_before))
+            deferred += int(np.count_nonzero(offsets))
+            scheduled += len(changes)
+
+            window = values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("attempts", Integer),
+                column("not_before", DateTime(timezone=True)),
+                name="window",
+            ).data(changes)
+            await db.execute(
+                update(CallQueue)
+                .where(CallQueue.id == window.c.id)
+                .where(CallQueue.status == "pending")
+                .where(CallQueue.attempts == window.c.attempts)
+                # a row in some runner's local buffer is about to be dialed anyway
+                .where(
+                    or_(
+                        CallQueue.lease_expires_at.is_(None),
+                        CallQueue.lease_expires_at < func.now(),
+                    )
+                )
+                .values(
+                    # greatest() ignores NULL: items already in their best hour keep their time
+                    next_attempt_at=func.greatest(
+                        CallQueue.next_attempt_at,
+                        cast(window.c.not_before, DateTime(timezone=True)),
+                    ),
+                    scheduled_attempt=window.c.attempts,
+                    updated_at=CallQueue.updated_at,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        if len(rows) < SCHEDULE_CHUNK_SIZE:
+            break
+
+    if scheduled:
+        logger.info(f"[Scheduler] Deferred {deferred} of {scheduled} items to their best calling hour")
+    return deferred
+
+
+async def run_call_scheduler() -> None:
+    """Lifespan task: refresh the histograms, then schedule new items, every SCHEDULER_INTERVAL_SECONDS."""
+    if not get_settings().dialer_best_time_scheduling:
+        logger.info("[Scheduler] Best-time scheduling disabled (DIALER_BEST_TIME_SCHEDULING)")
+        return
+
+    while True:
+        try:
+            # Only one worker refreshes per pass — the counts are increments
+            async with SessionLocal() as db:
+                locked = await db.execute(select(func.pg_try_advisory_xact_lock(_SCHEDULER_LOCK_KEY)))
+                if locked.scalar():
+                    await refresh_answer_histograms(db)
+                    await db.commit()
+                    await schedule_call_windows()
+        except Exception as e:
+            logger.warning(f"[Scheduler] Pass failed: {e}")
+        await asyncio.sleep(SCHEDULER_INTERVAL_SECONDS)
@@ -0,0 +1,186 @@
+"""
+Call Completion Bus
+===================
+Cross-process "this call has finished" signalling over PostgreSQL LISTEN/NOTIFY.
+
+The campaign runner that dialed a number and the uvicorn worker that receives
+Twilio's /status webhook are often different processes (``--workers N`` or
+several nodes). Every process keeps one dedicated asyncpg connection that
+LISTENs on ``call_completed``; the webhook publishes with ``pg_notify`` and
+whichever process is waiting on that call is woken immediately.
+
+Events are keyed by Twilio CallSid ("call finished"); ``answered_key(sid)``
+carries "call answered" for predictive dialing. A call's SID is only known
+once the dial request returns, so a fast call may complete before anyone
+waits on it; each process therefore remembers the last
+RECENT_COMPLETIONS_KEPT events and ``expect`` on an already-completed key
+resolves at once.
+
+Usage:
+    bus = get_completion_bus()
+    waiter = bus.expect(call_sid)            # right after dialing
+    try:
+        payload = await asyncio.wait_for(waiter, timeout=120)
+    finally:
+        bus.forget(key, waiter)
+
+    await bus.publish(call_sid, {"status": "completed"})   # from the webhook, after commit
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import Text, func, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.db.database import connect_asyncpg, engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "call_completed"
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+RECENT_COMPLETIONS_KEPT = 10_000   # Events remembered for waiters that register late
+
+
+def answered_key(call_sid: str) -> str:
+    """Bus key of a call's "answered" event (the plain CallSid means "finished")."""
+    return f"{call_sid}:answered"
+
+
+class CompletionBus:
+    """Per-process LISTEN connection plus the futures waiting on it."""
+
+    def __init__(self, channel: str = CHANNEL):
+        self.channel = channel
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._recent: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._conn = None
+        self._supervisor: Optional[asyncio.Task] = None
+
+    @property
+    def is_listening(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    # ──────────────────────────────────────────────
+    #  LIFECYCLE
+    # ──────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Open the LISTEN connection and keep it alive in the background."""
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            try:
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+        await self._close_connection()
+
+    async def _supervise(self) -> None:
+        """(Re)connect and LISTEN; back off while the database is unreachable."""
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._conn = await connect_asyncpg()
+                self._conn.add_termination_listener(lambda _conn: lost.set())
+                await self._conn.add_listener(self.channel, self._on_notification)
+                logger.info(f"[CompletionBus] Listening on '{self.channel}'")
+                delay = RECONNECT_MIN_SECONDS
+                await lost.wait()
+                logger.warning("[CompletionBus] LISTEN connection lost — reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[CompletionBus] Cannot LISTEN ({e}) — retrying in {delay:.0f}s")
+            await self._close_connection()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def _close_connection(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close(timeout=5)
+            except Exception:
+                conn.terminate()
+
+    # ──────────────────────────────────────────────
+    #  WAITING
+    # ──────────────────────────────────────────────
+
+    def expect(self, key: str) -> asyncio.Future:
+        """Register interest in ``key``; already resolved if it completed recently."""
+        waiter = asyncio.get_running_loop().create_future()
+        if key in self._recent:
+            waiter.set_result(self._recent[key])
+        else:
+            self._waiters[key] = waiter
+        return waiter
+
+    def forget(self, key: str, waiter: Optional[asyncio.Future] = None) -> None:
+        """Drop a registration (only if it is still ``waiter``, when given)."""
+        if waiter is None or self._waiters.get(key) is waiter:
+            self._waiters.pop(key, None)
+
+    def _deliver(self, key: str, payload: Dict[str, Any]) -> None:
+        self._recent[key] = payload
+        self._recent.move_to_end(key)
+        while len(self._recent) > RECENT_COMPLETIONS_KEPT:
+            self._recent.popitem(last=False)
+        waiter = self._waiters.get(key)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(payload)
+
+    def _on_notification(self, _conn, _pid: int, _channel: str, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+            self._deliver(message["key"], message.get("data") or {})
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"[CompletionBus] Ignoring malformed notification: {raw[:200]}")
+
+    # ──────────────────────────────────────────────
+    #  PUBLISHING
+    # ──────────────────────────────────────────────
+
+    async def publish(self, key: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Wake whichever process is waiting on ``key``. Call after committing."""
+        await self.publish_many([(key, data or {})])
+
+    async def publish_many(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Publish several completions in one round-trip."""
+        events = list(events)
+        if not events:
+            return
+        payloads = [json.dumps({"key": key, "data": data}, default=str) for key, data in events]
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    select(func.pg_notify(self.channel, func.unnest(literal(payloads, ARRAY(Text)))))
+                )
+        except Exception as e:
+            logger.error(f"[CompletionBus] NOTIFY failed: {e}")
+
+        if not self.is_listening:
+            # No LISTEN connection in this process — at least wake local waiters
+            for key, data in events:
+                self._deliver(key, data)
+
+
+# ── Module-level singleton (started in app.main lifespan) ─────────────────────
+_completion_bus: Optional[CompletionBus] = None
+
+
+def get_completion_bus() -> CompletionBus:
+    global _completion_bus
+    if _completion_bus is None:
+        _completion_bus = CompletionBus()
+    return _completion_bus
@@ -0,0 +1,330 @@
+"""
+Conversation Store
+==================
+Per-call conversation state for the Twilio voice loop, keyed by CallSid.
+
+Each turn is kept as a compact ``(role, content)`` record — role "u" (lead)
+or "a" (agent) — and handed to the LLM as chat messages. Only the last
+CONVERSATION_MAX_TURNS exchanges are kept: that is all the LLM is sent,
+and all the transcript /status saves. A call's context — the personalized
+system prompt and greeting rendered when it is dialed — is kept alongside
+its turns. A conversation ends when /status pops it; one whose status
+callback never arrives expires CONVERSATION_TTL_SECONDS after its last use.
+
+Backends (CONVERSATION_STORE):
+  - memory    — per-process LRU, bounded by CONVERSATION_MAX_CALLS. Fast,
+                but a call's webhooks must all reach the same worker.
+  - postgres  — shared UNLOGGED ``conversation_turns`` / ``conversation_contexts``
+                tables (no WAL, lost on a Postgres crash, which only ends
+                calls in progress), so any worker can serve any webhook of a
+                call. Contexts never change, so each worker caches them.
+
+Usage:
+    store = get_conversation_store()
+    await store.set_context(call_sid, {"system_prompt": ..., "greeting": ...})   # when dialed
+    messages = await store.append(call_sid, "user", speech)   # history, new turn included
+    transcript = await store.pop(call_sid)    # when the call ends
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, union
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import get_settings
+from app.db.database import engine
+from app.db.models import ConversationContext, ConversationTurn
+
+logger = logging.getLogger(__name__)
+
+SWEEP_INTERVAL_SECONDS = 300      # Postgres backend: expired conversations deleted this often
+CONTEXT_CACHE_SIZE     = 10_000   # Postgres backend: call contexts cached per process
+
+# Chat role ↔ compact role code stored per turn
+_ROLE_CODES = {"user": "u", "assistant": "a"}
+_ROLES = {code: role for role, code in _ROLE_CODES.items()}
+
+Turn = Tuple[str, str]   # (role code, content)
+
+
+def _messages(turns) -> List[Dict[str, str]]:
+    return [{"role": _ROLES[code], "content": content} for code, content in turns]
+
+
+class ConversationStore(ABC):
+    """Conversation turns per CallSid, oldest first."""
+
+    def __init__(self, ttl_seconds: float, max_turns: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_messages = max_turns * 2   # one lead + one agent message per turn
+
+    async def start(self) -> None:
+        """Start background upkeep, if the backend needs any."""
+
+    async def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    async def append(self, call_sid: str, role: str, content: str) -> List[Dict[str, str]]:
+        """Add a "user" or "assistant" message; returns the call's kept messages."""
+
+    @abstractmethod
+    async def history(self, call_sid: str) -> List[Dict[str, str]]:
+        """The call's kept messages as chat messages (empty if none)."""
+
+    @abstractmethod
+    async def pop(self, call_sid: str) -> List[Dict[str, str]]:
+        """The call's kept messages, removing the conversation."""
+
+    @abstractmethod
+    async def set_context(self, call_sid: str, context: Dict[str, str]) -> None:
+        """Attach data to the call for as long as its conversation lives."""
+
+    @abstractmethod
+    async def context(self, call_sid: str) -> Optional[Dict[str, str]]:
+        """The call's context, or None if none was set."""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Conversations currently held."""
+
+
+# ──────────────────────────────────────────────
+#  IN-MEMORY (per process)
+# ──────────────────────────────────────────────
+
+class _Conversation:
+    __slots__ = ("turns", "context", "expires_at")
+
+    def __init__(self, max_messages: int):
+        self.turns: Deque[Turn] = deque(maxlen=max_messages)
+        self.context: Optional[Dict[str, str]] = None
+        self.expires_at = 0.0
+
+
+class MemoryConversationStore(ConversationStore):
+    """
+    LRU of conversations. Every access refreshes a conversation's TTL and moves
+    it to the end, so the least recently used one — the first to expire — is
+    always at the front; expired and over-capacity entries are dropped from
+    there on each write.
+    """
+
+    def __init__(self, ttl_seconds: float, max_turns: int, max_calls: int):
+        super().__init__(ttl_seconds, max_turns)
+        self.max_calls = max(1, max_calls)
+        self._conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+
+    def _touch(self, call_sid: str, create: bool) -> Optional[_Conversation]:
+        now = time.monotonic()
+        conversation = self._conversations.get(call_sid)
+        if conversation is not None and conversation.expires_at <= now:
+            del self._conversations[call_sid]
+            conversation = None
+        if conversation is None:
+            if not create:
+                return None
+            conversation = self._conversations[call_sid] = _Conversation(self.max_messages)
+        else:
+            self._conversations.move_to_end(call_sid)
+        conversation.expires_at = now + self.ttl_seconds
+        return conversation
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        while self._conversations:
+            call_sid, oldest = next(iter(self._conversations.items()))
+            if len(self._conversations) <= self.max_calls and oldest.expires_at > now:
+                break
+            del self._conversations[call_sid]
+
+    async def append(self, call_sid: str, role: str, content: str) -> List[Dict[str, str]]:
+        conversation = self._touch(call_sid, create=True)
+        conversation.turns.append((_ROLE_CODES[role], content))
+        self._evict()
+        return _messages(conversation.turns)
+
+    async def history(self, call_sid: str) -> List[Dict[str, str]]:
+        conversation = self._touch(call_sid, create=False)
+        return _messages(conversation.turns) if conversation is not None else []
+
+    async def pop(self, call_sid: str) -> List[Dict[str, str]]:
+        conversation = self._conversations.pop(call_sid, None)
+        if conversation is None or conversation.expires_at <= time.monotonic():
+            return []
+        return _messages(conversation.turns)
+
+    async def set_context(self, call_sid: str, context: Dict[str, str]) -> None:
+        self._touch(call_sid, create=True).context = context
+        self._evict()
+
+    async def context(self, call_sid: str) -> Optional[Dict[str, str]]:
+        conversation = self._touch(call_sid, create=False)
+        return conversation.context if conversation is not None else None
+
+    async def count(self) -> int:
+        self._evict()
+        return len(self._conversations)
+
+
+# ──────────────────────────────────────────────
+#  POSTGRES (shared by all workers)
+# ──────────────────────────────────────────────
+
+class PostgresConversationStore(ConversationStore):
+    """
+    One ``conversation_turns`` row per message. Appends are plain INSERTs;
+    reads take the newest ``max_messages`` rows of the call. A periodic sweep
+    deletes conversations whose newest turn is older than the TTL.
+    One ``conversation_contexts`` row per call, read once per process.
+    """
+
+    def __init__(self, ttl_seconds: float, max_turns: int):
+        super().__init__(ttl_seconds, max_turns)
+        self._sweeper: Optional[asyncio.Task] = None
+        self._contexts: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+
+    def _cache_context(self, call_sid: str, context: Dict[str, str]) -> None:
+        self._contexts[call_sid] = context
+        self._contexts.move_to_end(call_sid)
+        while len(self._contexts) > CONTEXT_CACHE_SIZE:
+            self._contexts.popitem(last=False)
+
+    async def start(self) -> None:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop(self) -> None:
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def _latest(self, call_sid: str):
+        return (
+            select(ConversationTurn.role, ConversationTurn.content)
+            .where(ConversationTurn.call_sid == call_sid)
+            .order_by(ConversationTurn.id.desc())
+            .limit(self.max_messages)
+        )
+
+    async def append(self, call_sid: str, role: str, content: str) -> List[Dict[str, str]]:
+        # One connection for both statements — a turn costs a single pool checkout
+        async with engine.begin() as conn:
+            await conn.execute(
+                insert(ConversationTurn).values(call_sid=call_sid, role=_ROLE_CODES[role], content=content)
+            )
+            rows = (await conn.execute(self._latest(call_sid))).all()
+        return _messages(reversed(rows))
+
+    async def history(self, call_sid: str) -> List[Dict[str, str]]:
+        async with engine.connect() as conn:
+            rows = (await conn.execute(self._latest(call_sid))).all()
+        return _messages(reversed(rows))
+
+    async def pop(self, call_sid: str) -> List[Dict[str, str]]:
+        self._contexts.pop(call_sid, None)
+        async with engine.begin() as conn:
+            rows = (await conn.execute(
+                delete(ConversationTurn)
+                .where(ConversationTurn.call_sid == call_sid)
+                .returning(ConversationTurn.id, ConversationTurn.role, ConversationTurn.content)
+            )).all()
+            await conn.execute(delete(ConversationContext).where(ConversationContext.call_sid == call_sid))
+        rows.sort(key=lambda row: row.id)
+        return _messages((row.role, row.content) for row in rows[-self.max_messages:])
+
+    async def set_context(self, call_sid: str, context: Dict[str, str]) -> None:
+        async with engine.begin() as conn:
+            statement = pg_insert(ConversationContext).values(call_sid=call_sid, context=context)
+            await conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[ConversationContext.call_sid],
+                    set_={"context": statement.excluded.context},
+                )
+            )
+        self._cache_context(call_sid, context)
+
+    async def context(self, call_sid: str) -> Optional[Dict[str, str]]:
+        cached = self._contexts.get(call_sid)
+        if cached is not None:
+            return cached
+        async with engine.connect() as conn:
+            context = (await conn.execute(
+                select(ConversationContext.context).where(ConversationContext.call_sid == call_sid)
+            )).scalar()
+        if context is not None:
+            self._cache_context(call_sid, context)
+        return context
+
+    async def count(self) -> int:
+        calls = union(select(ConversationTurn.call_sid), select(ConversationContext.call_sid)).subquery()
+        async with engine.connect() as conn:
+            return (await conn.execute(select(func.count()).select_from(calls))).scalar() or 0
+
+    async def sweep(self) -> int:
+        """Delete expired conversations. Returns the number of turns deleted."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        expired = (
+            select(ConversationTurn.call_sid)
+            .group_by(ConversationTurn.call_sid)
+            .having(func.max(ConversationTurn.created_at) < cutoff)
+        )
+        async with engine.begin() as conn:
+            result = await conn.execute(delete(ConversationTurn).where(ConversationTurn.call_sid.in_(expired)))
+            # Contexts of calls with no turn left — long enough to outlast ringing and the greeting
+            active = select(ConversationTurn.call_sid).where(ConversationTurn.call_sid == ConversationContext.call_sid)
+            await conn.execute(
+                delete(ConversationContext)
+                .where(ConversationContext.created_at < cutoff)
+                .where(~active.exists())
+            )
+        return result.rowcount
+
+    async def _sweep_forever(self) -> None:
+        while True:
+            try:
+                deleted = await self.sweep()
+                if deleted:
+                    logger.info(f"[Conversations] Expired {deleted} turns of abandoned calls")
+            except Exception as e:
+                logger.warning(f"[Conversations] Sweep failed: {e}")
+            await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
+
+
+# ── Module-level singleton (started in app.main lifespan) ─────────────────────
+_conversation_store: Optional[ConversationStore] = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """
+    Return the process-wide store selected by CONVERSATION_STORE.
+    Raises ValueError if it is unknown.
+    """
+    global _conversation_store
+    if _conversation_store is None:
+        settings = get_settings()
+        choice = settings.conversation_store.lower()
+        if choice == "memory":
+            _conversation_store = MemoryConversationStore(
+                ttl_seconds=settings.conversation_ttl_seconds,
+                max_turns=settings.conversation_max_turns,
+                max_calls=settings.conversation_max_calls,
+            )
+        elif choice == "postgres":
+            _conversation_store = PostgresConversationStore(
+                ttl_seconds=settings.conversation_ttl_seconds,
+                max_turns=settings.conversation_max_turns,
+            )
+        else:
+            raise ValueError(f"Unknown CONVERSATION_STORE '{settings.conversation_store}'")
+    return _conversation_store
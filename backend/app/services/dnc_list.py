@@ -0,0 +1,257 @@
+"""
+Do-Not-Call Suppression List
+============================
+Numbers that must never be queued or dialed, checked in O(1) from memory.
+
+The ``do_not_call`` table is the source of truth. Every process keeps the
+whole list in a hash set, loaded at startup and kept current over Postgres
+LISTEN/NOTIFY on ``dnc_changed``: writers send the numbers they added or
+removed in the same transaction as the change, so every worker sees it as
+soon as it commits. A change too large for one notification asks listeners
+to reload; so does every (re)connect of the LISTEN connection, which covers
+notifications missed while it was down.
+
+Until the first load completes, and while the LISTEN connection is down,
+the in-memory copy cannot be trusted: checks then read ``do_not_call``
+directly, so "not loaded" never passes for "not blocked".
+
+Checked by:
+  - QueueManager.add_to_queue and POST /leads/import — blocked numbers are dropped
+  - QueueManager._initiate_call — a queued item whose number was blocked
+    since it was enqueued is canceled instead of dialed
+
+Numbers are added when a lead asks not to be called again (twilio
+/process-speech) and through the /dnc routes.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import SessionLocal, connect_asyncpg
+from app.db.models import DoNotCall
+from app.services.phone_numbers import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "dnc_changed"
+NOTIFY_MAX_NUMBERS           = 200   # Larger changes make listeners reload instead
+INITIAL_LOAD_TIMEOUT_SECONDS = 10    # start() waits this long for the first load
+CHUNK_SIZE                   = 1000  # Numbers per INSERT / DELETE statement
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+
+class SuppressionList:
+    """Per-process in-memory copy of ``do_not_call``, kept current over LISTEN."""
+
+    def __init__(self, channel: str = CHANNEL):
+        self.channel = channel
+        self._numbers: Set[str] = set()
+        self._loaded = asyncio.Event()
+        self._buffered: Optional[List[dict]] = None   # changes seen while (re)loading
+        self._reload_task: Optional[asyncio.Task] = None
+        self._conn = None
+        self._supervisor: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._numbers)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded.is_set()
+
+    async def _blocked(self, phone_numbers: List[str]) -> Set[str]:
+        if self.is_loaded:
+            return {p for p in phone_numbers if p in self._numbers}
+        # Fail closed: ask the table itself (raises if it cannot be read)
+        blocked: Set[str] = set()
+        async with SessionLocal() as db:
+            for start in range(0, len(phone_numbers), CHUNK_SIZE):
+                chunk = phone_numbers[start:start + CHUNK_SIZE]
+                blocked.update((await db.execute(
+                    select(DoNotCall.phone_number).where(DoNotCall.phone_number.in_(chunk))
+                )).scalars())
+        return blocked
+
+    async def is_blocked(self, phone_number: str) -> bool:
+        return bool(await self._blocked([phone_number]))
+
+    async def allowed(self, phone_numbers: Iterable[str]) -> List[str]:
+        """``phone_numbers`` minus the blocked ones, order kept."""
+        phones = list(phone_numbers)
+        blocked = await self._blocked(phones) if phones else set()
+        return [p for p in phones if p not in blocked]
+
+    # ──────────────────────────────────────────────
+    #  LIFECYCLE
+    # ──────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """LISTEN for changes in the background; wait (briefly) for the first load."""
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise())
+        try:
+            await asyncio.wait_for(self._loaded.wait(), INITIAL_LOAD_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning("[DNC] Suppression list not loaded yet — still trying in the background")
+
+    async def stop(self) -> None:
+        for task in (self._supervisor, self._reload_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._supervisor = self._reload_task = None
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close(timeout=5)
+            except Exception:
+                conn.terminate()
+
+    async def _supervise(self) -> None:
+        """(Re)connect, LISTEN, then reload — nothing committed in between is missed."""
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            lost = asyncio.Event()
+            try:
+                self._conn = await connect_asyncpg()
+                self._conn.add_termination_listener(lambda _conn: lost.set())
+                await self._conn.add_listener(self.channel, self._on_notification)
+                await self.reload()
+                delay = RECONNECT_MIN_SECONDS
+                await lost.wait()
+                # Changes are missed until the next reload — read the table meanwhile
+                self._loaded.clear()
+                logger.warning("[DNC] LISTEN connection lost — reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[DNC] Cannot LISTEN ({e}) — retrying in {delay:.0f}s")
+            conn, self._conn = self._conn, None
+            if conn is not None and not conn.is_closed():
+                conn.terminate()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+
+    async def reload(self) -> None:
+        """Replace the in-memory set with the table's contents."""
+        self._buffered = []
+        try:
+            async with SessionLocal() as db:
+                numbers = set((await db.execute(select(DoNotCall.phone_number))).scalars())
+            for change in self._buffered:
+                self._apply(numbers, change)
+        finally:
+            self._buffered = None
+        self._numbers = numbers
+        self._loaded.set()
+        logger.info(f"[DNC] Loaded {len(numbers)} suppressed numbers")
+
+    # ──────────────────────────────────────────────
+    #  CHANGES
+    # ──────────────────────────────────────────────
+
+    @staticmethod
+    def _apply(numbers: Set[str], change: dict) -> None:
+        if change.get("op") == "add":
+            numbers.update(change["phones"])
+        elif change.get("op") == "remove":
+            numbers.difference_update(change["phones"])
+
+    def _on_notification(self, _conn, _pid: int, _channel: str, raw: str) -> None:
+        try:
+            change = json.loads(raw)
+        except ValueError:
+            logger.warning(f"[DNC] Ignoring malformed notification: {raw[:200]}")
+            return
+        if change.get("op") == "reload":
+            if self._reload_task is None or self._reload_task.done():
+                self._reload_task = asyncio.create_task(self._reload_quietly())
+            return
+        if self._buffered is not None:
+            self._buffered.append(change)
+        self._apply(self._numbers, change)
+
+    async def _reload_quietly(self) -> None:
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.warning(f"[DNC] Reload failed: {e}")
+
+    async def _notify(self, db: AsyncSession, op: str, phones: List[str]) -> None:
+        """Tell every process (this one included) once the transaction commits."""
+        change = {"op": op, "phones": phones} if len(phones) <= NOTIFY_MAX_NUMBERS else {"op": "reload"}
+        await db.execute(select(func.pg_notify(self.channel, json.dumps(change))))
+
+    async def add(
+        self,
+        db: AsyncSession,
+        phone_numbers: Iterable[str],
+        reason: str = "manual",
+        call_sid: Optional[str] = None,
+    ) -> int:
+        """Block numbers (normalized to E.164) and commit. Returns how many were not blocked already."""
+        phones = list(dict.fromkeys(filter(None, map(normalize_phone, phone_numbers))))
+        if not phones:
+            return 0
+        added: List[str] = []
+        for start in range(0, len(phones), CHUNK_SIZE):
+            result = await db.execute(
+                pg_insert(DoNotCall)
+                .values([
+                    {"phone_number": p, "reason": reason, "call_sid": call_sid}
+                    for p in phones[start:start + CHUNK_SIZE]
+                ])
+                .on_conflict_do_nothing(index_elements=[DoNotCall.phone_number])
+                .returning(DoNotCall.phone_number)
+            )
+            added.extend(result.scalars())
+        if added:
+            await self._notify(db, "add", added)
+        await db.commit()
+        # Visible here at once; the notification brings it to the other workers
+        self._numbers.update(added)
+        if added:
+            logger.info(f"[DNC] Blocked {len(added)} numbers ({reason})")
+        return len(added)
+
+    async def remove(self, db: AsyncSession, phone_numbers: Iterable[str]) -> int:
+        """Unblock numbers and commit. Returns how many were blocked."""
+        phones = list(dict.fromkeys(filter(None, map(normalize_phone, phone_numbers))))
+        if not phones:
+            return 0
+        removed: List[str] = []
+        for start in range(0, len(phones), CHUNK_SIZE):
+            result = await db.execute(
+                delete(DoNotCall)
+                .where(DoNotCall.phone_number.in_(phones[start:start + CHUNK_SIZE]))
+                .returning(DoNotCall.phone_number)
+            )
+            removed.extend(result.scalars())
+        if removed:
+            await self._notify(db, "remove", removed)
+        await db.commit()
+        self._numbers.difference_update(removed)
+        if removed:
+            logger.info(f"[DNC] Unblocked {len(removed)} numbers")
+        return len(removed)
+
+
+# ── Module-level singleton (started in app.main lifespan) ─────────────────────
+_suppression_list: Optional[SuppressionList] = None
+
+
+def get_suppression_list() -> SuppressionList:
+    global _suppression_list
+    if _suppression_list is None:
+        _suppression_list = SuppressionList()
+    return _suppression_list
@@ -61,6 +61,13 @@ Your job is to conduct professional, empathetic phone calls with potential insur
 ## RESPONSE FORMAT
 Respond naturally as a voice assistant. Do NOT output JSON — the system handles structured extraction automatically."""
 
+# Spoken when the lead answers and no name is on record
+OPENING_GREETING = (
+    "Hello! This is Priya calling from allAgent, your insurance advisor. "
+    "I'm reaching out to discuss insurance solutions that may benefit you. "
+    "Do you have a few minutes to chat?"
+)
+
 
 class GroqService:
     """
@@ -145,10 +152,13 @@ TRANSCRIPT:
     #  OUTBOUND SYSTEM PROMPT BUILDER
     # ──────────────────────────────────────────────
 
-    def build_outbound_system_prompt(self, lead_context: Dict[str, Any]) -> str:
+    @staticmethod
+    def build_outbound_system_prompt(lead_context: Dict[str, Any], greeting: Optional[str] = None) -> str:
         """
         Build a personalized system prompt for the outbound AI assistant.
         Injects known lead details so the AI never re-asks information.
+        Pass the `greeting` the call opens with when it is spoken before the
+        first turn, so the AI does not greet the lead a second time.
         """
         name            = lead_context.get("name") or "the prospect"
         age             = lead_context.get("age") or "Unknown"
@@ -156,6 +166,11 @@ TRANSCRIPT:
         location        = lead_context.get("location") or "Unknown"
         interest        = lead_context.get("insurance_interest") or "General"
         last_summary    = lead_context.get("last_summary") or "No previous conversations on record."
+        opening = (
+            f'The call has already opened with: "{greeting}" Do not greet them again.'
+            if greeting
+            else f"Start by greeting them: Hello, may I speak with {name}?"
+        )
 
         return f"""{SALES_AGENT_SYSTEM_PROMPT}
 
@@ -167,7 +182,24 @@ TRANSCRIPT:
 - Insurance Interest: {interest}
 - Previous Call Summary: {last_summary}
 
-Start by greeting them: Hello, may I speak with {name}?"""
+{opening}"""
+
+    @staticmethod
+    def build_opening_greeting(lead_context: Dict[str, Any]) -> str:
+        """The first words of the call, addressed to the lead by name when it is known."""
+        name = lead_context.get("name")
+        if not name:
+            return OPENING_GREETING
+        interest = (lead_context.get("insurance_interest") or "").strip().lower()
+        reason = (
+            f"I'm following up on your interest in {interest} insurance."
+            if interest and interest not in ("general", "none")
+            else "I'm reaching out to discuss insurance solutions that may benefit you."
+        )
+        return (
+            f"Hello, may I speak with {name}? This is Priya calling from allAgent, "
+            f"your insurance advisor. {reason} Do you have a few minutes to chat?"
+        )
 
     # ──────────────────────────────────────────────
     #  DIRECT CHAT (for testing / fallback)
@@ -200,6 +232,20 @@ Start by greeting them: Hello, may I speak with {name}?"""
             return "I am having trouble connecting to the AI service right now."
 
 
+def build_call_prompt(lead_context: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    The system prompt and opening greeting of one call, rendered once when it
+    is dialed and reused by every turn. Generic when no lead is on record.
+    """
+    if not lead_context:
+        return {"system_prompt": SALES_AGENT_SYSTEM_PROMPT, "greeting": OPENING_GREETING}
+    greeting = GroqService.build_opening_greeting(lead_context)
+    return {
+        "system_prompt": GroqService.build_outbound_system_prompt(lead_context, greeting),
+        "greeting":      greeting,
+    }
+
+
 # ── Module-level singleton (lazy-initialized) ─────────────────────────────────
 _groq_service: Optional[GroqService] = None
 
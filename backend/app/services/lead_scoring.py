@@ -0,0 +1,213 @@
+"""
+Lead Scoring
+============
+Batch conversion-propensity scoring that decides dial order.
+
+For every pending queue item the engine loads what we know about the number —
+the Lead profile (lead_status, insurance_interest, age, last_summary) and its
+CallSession history (calls, answered calls, talk time) — into one NumPy
+feature matrix and scores the whole chunk in a single vectorized pass:
+
+    priority = sigmoid(BIAS + features @ weights)       ∈ (0, 1)
+
+The result is written to ``call_queue.priority``; the dialer leases due items
+by ``(priority DESC, created_at)`` through ``ix_call_queue_pending_priority``,
+so line time goes to the leads most likely to convert.
+
+Scoring runs when a campaign runner starts (its own items) and periodically
+in the lifespan (every pending item — lead data and outcomes keep changing).
+Only rows whose priority actually moved are rewritten.
+"""
+
+import asyncio
+import logging
+from typing import Any, List
+
+import numpy as np
+from sqlalchemy import Float, column, func, select, true, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.db.database import SessionLocal
+from app.db.models import CallQueue, CallSession, Lead
+
+logger = logging.getLogger(__name__)
+
+SCORING_INTERVAL_SECONDS = 300      # Time between full re-scoring passes
+SCORING_CHUNK_SIZE       = 10_000   # Pending items scored (and written) per pass
+PRIORITY_EPSILON         = 1e-3     # Smaller changes are not written back
+
+# Arbitrary constant identifying the scoring lock (pg_try_advisory_xact_lock key)
+_SCORING_LOCK_KEY = 0x7363_6f72  # "scor"
+
+# ── Model ────────────────────────────────────────────────────────────────────
+# Hand-tuned logistic weights. Leads without a Lead row score as "new".
+BIAS = -0.5
+
+LEAD_STATUS_WEIGHTS = {
+    "new":            0.0,
+    "contacted":      0.2,
+    "follow_up":      0.9,
+    "interested":     1.6,
+    "not_interested": -2.5,
+    "unreachable":    -1.0,
+    "converted":      -1.5,   # already sold — not the best use of a line
+}
+LEAD_STATUSES = tuple(LEAD_STATUS_WEIGHTS)
+
+FEATURE_WEIGHTS = {
+    "known_interest": 0.6,    # insurance_interest captured (and not "none")
+    "age_fit":        0.5,    # 1.0 at PRIME_AGE, fading with distance
+    "has_summary":    0.3,    # a real conversation happened before
+    "answer_rate":    1.2,    # smoothed answered / calls, centred on 0.5
+    "talk_minutes":   0.4,    # log1p of average answered-call minutes
+    "never_called":   0.2,    # fresh leads get a small exploration bonus
+    "attempts":       -0.35,  # per failed attempt on this queue item
+}
+FEATURES = tuple(FEATURE_WEIGHTS)
+
+PRIME_AGE        = 40.0
+AGE_SPREAD_YEARS = 15.0
+
+WEIGHTS = np.array(
+    [LEAD_STATUS_WEIGHTS[s] for s in LEAD_STATUSES] + [FEATURE_WEIGHTS[f] for f in FEATURES]
+)
+
+
+def build_features(rows: List[Any]) -> np.ndarray:
+    """
+    Feature matrix (one row per queue item) from the rows loaded by
+    ``_load_chunk``: lead-status one-hot columns, then FEATURES in order.
+    """
+    n = len(rows)
+    status_index = {status: i for i, status in enumerate(LEAD_STATUSES)}
+    status = np.fromiter(
+        (status_index.get(r.lead_status or "new", 0) for r in rows), dtype=np.intp, count=n
+    )
+    interest = np.fromiter(
+        (bool(r.insurance_interest) and r.insurance_interest.lower() != "none" for r in rows),
+        dtype=np.float64, count=n,
+    )
+    age = np.fromiter((np.nan if r.age is None else r.age for r in rows), dtype=np.float64, count=n)
+    has_summary = np.fromiter((r.has_summary or False for r in rows), dtype=np.float64, count=n)
+    calls = np.fromiter((r.calls or 0 for r in rows), dtype=np.float64, count=n)
+    answered = np.fromiter((r.answered or 0 for r in rows), dtype=np.float64, count=n)
+    talk = np.fromiter((r.avg_talk_seconds or 0 for r in rows), dtype=np.float64, count=n)
+    attempts = np.fromiter((r.attempts for r in rows), dtype=np.float64, count=n)
+
+    age_fit = np.nan_to_num(np.exp(-(((age - PRIME_AGE) / AGE_SPREAD_YEARS) ** 2)), nan=0.0)
+    answer_rate = (answered + 1.0) / (calls + 2.0) - 0.5   # Laplace-smoothed
+
+    columns = {
+        "known_interest": interest,
+        "age_fit":        age_fit,
+        "has_summary":    has_summary,
+        "answer_rate":    answer_rate,
+        "talk_minutes":   np.log1p(talk / 60.0),
+        "never_called":   (calls == 0).astype(np.float64),
+        "attempts":       attempts,
+    }
+    features = np.zeros((n, len(LEAD_STATUSES) + len(FEATURES)))
+    features[np.arange(n), status] = 1.0
+    for offset, name in enumerate(FEATURES, start=len(LEAD_STATUSES)):
+        features[:, offset] = columns[name]
+    return features
+
+
+def score(features: np.ndarray) -> np.ndarray:
+    """Conversion propensity in (0, 1) for every row of ``features``."""
+    return 1.0 / (1.0 + np.exp(-(BIAS + features @ WEIGHTS)))
+
+
+async def _load_chunk(db, after_id, campaign_id) -> List[Any]:
+    """Next chunk of pending items (by id) with their lead profile and call history."""
+    history = (
+        select(
+            func.count().label("calls"),
+            func.count().filter(CallSession.call_status == "completed").label("answered"),
+            func.avg(CallSession.call_duration)
+            .filter(CallSession.call_status == "completed")
+            .label("avg_talk_seconds"),
+        )
+        .where(CallSession.lead_id == Lead.id)
+        .lateral("history")
+    )
+    query = (
+        select(
+            CallQueue.id,
+            CallQueue.attempts,
+            CallQueue.priority,
+            Lead.lead_status,
+            Lead.insurance_interest,
+            Lead.age,
+            Lead.last_summary.isnot(None).label("has_summary"),
+            history.c.calls,
+            history.c.answered,
+            history.c.avg_talk_seconds,
+        )
+        .outerjoin(Lead, Lead.phone_number == CallQueue.phone_number)
+        .outerjoin(history, true())
+        .where(CallQueue.status == "pending")
+        .order_by(CallQueue.id)
+        .limit(SCORING_CHUNK_SIZE)
+    )
+    if campaign_id is not None:
+        query = query.where(CallQueue.campaign_id == campaign_id)
+    if after_id is not None:
+        query = query.where(CallQueue.id > after_id)
+    return (await db.execute(query)).all()
+
+
+async def score_pending_items(campaign_id=None) -> int:
+    """
+    (Re)score pending items — those of ``campaign_id``, or all of them.
+    Returns the number of priorities written.
+    """
+    written = 0
+    after_id = None
+    while True:
+        async with SessionLocal() as db:
+            rows = await _load_chunk(db, after_id, campaign_id)
+            if not rows:
+                break
+            after_id = rows[-1].id
+
+            priorities = np.round(score(build_features(rows)), 4)
+            current = np.fromiter((r.priority for r in rows), dtype=np.float64, count=len(rows))
+            changed = np.flatnonzero(np.abs(priorities - current) >= PRIORITY_EPSILON)
+            if changed.size:
+                new_priority = values(
+                    column("id", PG_UUID(as_uuid=True)),
+                    column("priority", Float),
+                    name="new_priority",
+                ).data([(rows[i].id, float(priorities[i])) for i in changed])
+                await db.execute(
+                    update(CallQueue)
+                    .where(CallQueue.id == new_priority.c.id)
+                    .where(CallQueue.status == "pending")
+                    # a re-score is not a change of the item — keep updated_at
+                    .values(priority=new_priority.c.priority, updated_at=CallQueue.updated_at)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
+                written += int(changed.size)
+        if len(rows) < SCORING_CHUNK_SIZE:
+            break
+
+    if written:
+        scope = f"campaign {campaign_id}" if campaign_id is not None else "all pending items"
+        logger.info(f"[Scoring] Re-prioritised {written} queue items ({scope})")
+    return written
+
+
+async def run_lead_scoring() -> None:
+    """Lifespan task: re-score every pending item every SCORING_INTERVAL_SECONDS."""
+    while True:
+        try:
+            # Only one worker scores per pass; the lock ends with the transaction
+            async with SessionLocal() as lock_db:
+                locked = await lock_db.execute(select(func.pg_try_advisory_xact_lock(_SCORING_LOCK_KEY)))
+                if locked.scalar():
+                    await score_pending_items()
+        except Exception as e:
+            logger.warning(f"[Scoring] Pass failed: {e}")
+        await asyncio.sleep(SCORING_INTERVAL_SECONDS)
@@ -0,0 +1,283 @@
+"""
+Phone Numbers
+=============
+E.164 normalization of every number that enters the system, and the merge of
+rows stored before numbers were normalized.
+
+    normalize_phone("+91 98765 43210") == normalize_phone("098765 43210") == "+919876543210"
+
+Numbers without a +country code are read in PHONE_DEFAULT_REGION. Parses are
+memoised in an LRU cache, and strings already in E.164 form skip the parser,
+so webhooks (Twilio always sends E.164) pay a regex match. Anything that
+cannot be a phone number normalizes to None and is rejected by the caller.
+
+Applied at every ingest point — add_to_queue, POST/PUT /leads and the phone
+filter, the CSV import, the do-not-call list, bulk queue operation filters —
+and to the numbers in Twilio webhooks. Duplicates are then exact matches on
+unique columns: leads.phone_number, do_not_call.phone_number and
+uq_call_queue_active_phone (one pending / calling item per number).
+
+merge_duplicate_numbers rewrites rows stored before that — run by a periodic
+lifespan job that catches rows written by workers still running older code
+(the migration that adds uq_call_queue_active_phone runs a frozen copy):
+  - leads that normalize to one number collapse into one (the one already
+    normalized, else the oldest); its empty profile fields are filled from
+    the others (most recently updated first) and their call sessions move to it
+  - do_not_call entries are rewritten (and every worker reloads the list)
+  - call_queue / call_queue_archive numbers are rewritten; of several
+    pending / calling items for one number only one is kept (the in-flight
+    one, else the oldest) and the others are canceled
+Only rows not in E.164 form are candidates, so a pass over clean tables
+finds nothing to do.
+"""
+
+import asyncio
+import logging
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+import phonenumbers
+from sqlalchemy import String, bindparam, column, delete, func, inspect, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.engine import Connection
+
+from app.config import get_settings
+from app.db.database import engine
+from app.db.models import Campaign, CallQueue, CallQueueArchive, CallSession, DoNotCall, Lead
+
+logger = logging.getLogger(__name__)
+
+PARSE_CACHE_SIZE           = 100_000   # Distinct (number, region) parses remembered
+MERGE_CHUNK_SIZE           = 5000      # Numbers / ids per statement while merging
+NORMALIZE_INTERVAL_SECONDS = 3600      # Time between merge passes of the lifespan job
+
+# Arbitrary constant identifying the merge lock (pg_try_advisory_xact_lock key)
+_NORMALIZE_LOCK_KEY = 0x7068_6f6e  # "phon"
+
+E164_PATTERN = r"^\+[1-9][0-9]{6,14}$"
+_E164 = re.compile(E164_PATTERN)
+
+# Lead fields a merged lead takes from its duplicates when it has none itself
+PROFILE_FIELDS = ("name", "age", "occupation", "location", "insurance_interest", "last_summary")
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(raw: str, region: str) -> Optional[str]:
+    try:
+        number = phonenumbers.parse(raw, region)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_possible_number(number):
+        return None
+    return phonenumbers.format_number(number, phonenumbers.PhoneNumberFormat.E164)
+
+
+def normalize_phone(raw, region: Optional[str] = None) -> Optional[str]:
+    """``raw`` in E.164 form, or None if it cannot be a phone number."""
+    if raw is None:
+        return None
+    raw = str(raw).strip()
+    if not raw:
+        return None
+    if _E164.match(raw):
+        return raw
+    return _parse(raw, (region or get_settings().phone_default_region).upper())
+
+
+# ──────────────────────────────────────────────
+#  MERGING STORED DUPLICATES
+# ──────────────────────────────────────────────
+
+def _chunks(items: List, size: int = MERGE_CHUNK_SIZE) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _renames(conn: Connection, phone_column, region: Optional[str]) -> Dict[str, str]:
+    """{stored number: E.164 number} for the stored numbers not yet normalized."""
+    stored = conn.execute(
+        select(phone_column).where(~phone_column.regexp_match(E164_PATTERN)).distinct()
+    ).scalars().all()
+    renames = {}
+    for raw in stored:
+        normalized = normalize_phone(raw, region)
+        if normalized is not None and normalized != raw:
+            renames[raw] = normalized
+    return renames
+
+
+def _merge_leads(conn: Connection, region: Optional[str], counts: Counter) -> None:
+    renames = _renames(conn, Lead.phone_number, region)
+    if not renames:
+        return
+    leads = Lead.__table__
+    rows = []
+    for chunk in _chunks(list(renames) + list(set(renames.values()))):
+        rows += conn.execute(select(leads).where(leads.c.phone_number.in_(chunk))).all()
+
+    groups = defaultdict(list)
+    for row in rows:
+        groups[renames.get(row.phone_number, row.phone_number)].append(row)
+
+    merged_into = []   # (duplicate id, kept id)
+    kept = []
+    for number, group in groups.items():
+        group.sort(key=lambda r: (r.phone_number != number, r.created_at))
+        keeper, duplicates = group[0], group[1:]
+        newest_first = sorted(duplicates, key=lambda r: r.updated_at, reverse=True)
+        change = {"b_id": keeper.id, "b_phone_number": number}
+        for field in PROFILE_FIELDS:
+            change[f"b_{field}"] = getattr(keeper, field)
+            if change[f"b_{field}"] is None:
+                change[f"b_{field}"] = next(
+                    (getattr(d, field) for d in newest_first if getattr(d, field) is not None), None
+                )
+        change["b_lead_status"] = keeper.lead_status
+        if keeper.lead_status == "new":
+            change["b_lead_status"] = next(
+                (d.lead_status for d in newest_first if d.lead_status != "new"), "new"
+            )
+        kept.append(change)
+        merged_into.extend((d.id, keeper.id) for d in duplicates)
+
+    for chunk in _chunks(merged_into):
+        mapping = values(
+            column("old_id", PG_UUID(as_uuid=True)),
+            column("new_id", PG_UUID(as_uuid=True)),
+            name="merged",
+        ).data(chunk)
+        conn.execute(
+            update(CallSession.__table__)
+            .where(CallSession.__table__.c.lead_id == mapping.c.old_id)
+            .values(lead_id=mapping.c.new_id)
+        )
+        conn.execute(delete(leads).where(leads.c.id.in_([old for old, _ in chunk])))
+    # Duplicates are gone, so every kept lead can take its normalized number
+    conn.execute(
+        update(leads)
+        .where(leads.c.id == bindparam("b_id"))
+        .values(
+            phone_number=bindparam("b_phone_number"),
+            lead_status=bindparam("b_lead_status"),
+            **{field: bindparam(f"b_{field}") for field in PROFILE_FIELDS},
+        ),
+        kept,
+    )
+    counts["leads_normalized"] += len(kept)
+    counts["leads_merged"] += len(merged_into)
+
+
+def _merge_do_not_call(conn: Connection, region: Optional[str], counts: Counter) -> None:
+    from app.services.dnc_list import CHANNEL as DNC_CHANNEL
+
+    renames = _renames(conn, DoNotCall.phone_number, region)
+    if not renames:
+        return
+    table = DoNotCall.__table__
+    for chunk in _chunks(list(renames)):
+        rows = conn.execute(select(table).where(table.c.phone_number.in_(chunk))).all()
+        conn.execute(
+            pg_insert(table)
+            .values([{**row._mapping, "phone_number": renames[row.phone_number]} for row in rows])
+            .on_conflict_do_nothing(index_elements=[table.c.phone_number])
+        )
+        conn.execute(delete(table).where(table.c.phone_number.in_(chunk)))
+    # Every worker's in-memory list reloads once this commits
+    conn.execute(select(func.pg_notify(DNC_CHANNEL, '{"op": "reload"}')))
+    counts["do_not_call_normalized"] += len(renames)
+
+
+def _merge_queue(conn: Connection, region: Optional[str], counts: Counter, has_archive: bool) -> None:
+    renames = _renames(conn, CallQueue.phone_number, region)
+    archive_renames = _renames(conn, CallQueueArchive.phone_number, region) if has_archive else {}
+    queue = CallQueue.__table__
+
+    held = set()   # in-flight duplicates — renamed by a later pass, once they finish
+    if renames:
+        active = []
+        for chunk in _chunks(list(renames) + list(set(renames.values()))):
+            active += conn.execute(
+                select(queue.c.id, queue.c.phone_number, queue.c.status, queue.c.campaign_id, queue.c.created_at)
+                .where(queue.c.phone_number.in_(chunk))
+                .where(queue.c.status.in_(["pending", "calling"]))
+                .with_for_update()
+            ).all()
+        groups = defaultdict(list)
+        for row in active:
+            groups[renames.get(row.phone_number, row.phone_number)].append(row)
+
+        canceled = []
+        campaign_counts: Counter = Counter()
+        for group in groups.values():
+            group.sort(key=lambda r: (r.status != "calling", r.created_at))
+            for row in group[1:]:
+                if row.status == "pending":
+                    canceled.append(row.id)
+                    if row.campaign_id is not None:
+                        campaign_counts[row.campaign_id] += 1
+                else:
+                    held.add(row.id)
+        for chunk in _chunks(canceled):
+            conn.execute(
+                update(queue)
+                .where(queue.c.id.in_(chunk))
+                .values(status="canceled", lease_owner=None, lease_expires_at=None)
+            )
+        for campaign_id, n in campaign_counts.items():
+            conn.execute(
+                update(Campaign.__table__)
+                .where(Campaign.__table__.c.id == campaign_id)
+                .values(canceled_count=Campaign.__table__.c.canceled_count + n)
+            )
+        counts["queue_duplicates_canceled"] += len(canceled)
+
+    for table, table_renames in ((queue, renames), (CallQueueArchive.__table__, archive_renames)):
+        for chunk in _chunks(list(table_renames.items())):
+            mapping = values(column("raw", String), column("e164", String), name="renamed").data(chunk)
+            statement = (
+                update(table)
+                .where(table.c.phone_number == mapping.c.raw)
+                .values(phone_number=mapping.c.e164)
+            )
+            if held and table is queue:
+                statement = statement.where(table.c.id.not_in(held))
+            counts[f"{table.name}_normalized"] += conn.execute(statement).rowcount
+
+
+def merge_duplicate_numbers(conn: Connection, region: Optional[str] = None) -> Dict[str, int]:
+    """
+    Normalize stored numbers and merge the duplicates that appear, in the
+    caller's transaction.
+    Returns counts of what changed; tables that do not exist yet are skipped.
+    """
+    tables = set(inspect(conn).get_table_names())
+    counts: Counter = Counter()
+    if "leads" in tables:
+        _merge_leads(conn, region, counts)
+    if "do_not_call" in tables:
+        _merge_do_not_call(conn, region, counts)
+    if "call_queue" in tables:
+        _merge_queue(conn, region, counts, has_archive="call_queue_archive" in tables)
+    return {name: n for name, n in counts.items() if n}
+
+
+def _merge_if_leader(conn: Connection) -> Dict[str, int]:
+    # Only one worker merges per pass; the lock ends with the transaction
+    if not conn.execute(select(func.pg_try_advisory_xact_lock(_NORMALIZE_LOCK_KEY))).scalar():
+        return {}
+    return merge_duplicate_numbers(conn)
+
+
+async def run_number_normalizer() -> None:
+    """Lifespan task: a merge pass at startup, then every NORMALIZE_INTERVAL_SECONDS."""
+    while True:
+        try:
+            async with engine.begin() as conn:
+                counts = await conn.run_sync(_merge_if_leader)
+            if counts:
+                logger.info(f"[Phones] Normalized stored numbers: {counts}")
+        except Exception as e:
+            logger.warning(f"[Phones] Merge pass failed: {e}")
+        await asyncio.sleep(NORMALIZE_INTERVAL_SECONDS)
@@ -0,0 +1,209 @@
+"""
+Predictive Dialer
+=================
+Per-campaign line gate: decides how many numbers may be ringing at once.
+
+A campaign's ``max_concurrent_calls`` is its conversation capacity — the
+number of calls the AI agent may be talking on at the same time (seats).
+
+  - progressive  — one line per free seat. A seat sits idle for the whole
+                   ring time, and for nothing when the number rings out.
+  - predictive   — dial more numbers than free seats, based on the rolling
+                   answer rate, ring time and talk time of the campaign's own
+                   recent calls (timed from their answer and status callbacks).
+
+How many lines may ring in predictive mode:
+  With ``n`` lines ringing and answer rate ``p``, the number of answers is
+  X ~ Binomial(n, p). Seats available when they answer are the free seats
+  plus those expected to free up within a typical ring time (talk times are
+  treated as exponential). An answer that finds no seat is *abandoned* — the
+  callee hears a short apology and the item is retried soon. We take the
+  largest ``n`` whose expected abandonment ratio E[max(X - seats, 0)] / E[X]
+  stays under DIALER_MAX_ABANDON_RATE, up to DIALER_MAX_LINES_PER_SLOT lines
+  per seat (and DIALER_MAX_CONCURRENT_CALLS lines per process). Until
+  MIN_OBSERVED_CALLS outcomes are known, or while the observed abandonment
+  rate is above the cap, it dials progressively.
+
+Seats are enforced across workers by QueueManager.claim_conversation_seat
+when a call is answered; this gate only decides when to dial.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+ANSWER_WINDOW_CALLS = 200   # Recent outcomes the rolling rates are computed from
+MIN_OBSERVED_CALLS  = 30    # Dial progressively until this many outcomes are known
+
+DIAL_MODES = ("progressive", "predictive")
+
+
+def expected_abandon_ratio(lines: int, answer_rate: float, seats: float) -> float:
+    """E[max(X - seats, 0)] / E[X] for X ~ Binomial(lines, answer_rate)."""
+    if lines <= 0 or answer_rate <= 0:
+        return 0.0
+    answers = np.arange(lines + 1)
+    pmf = np.array([math.comb(lines, k) for k in answers], dtype=np.float64)
+    pmf *= answer_rate ** answers * (1.0 - answer_rate) ** (lines - answers)
+    overflow = np.maximum(answers - seats, 0.0)
+    return float(pmf @ overflow) / (lines * answer_rate)
+
+
+class DialLine:
+    """One dial attempt holding a line of the gate until released."""
+
+    def __init__(self, dialer: "PredictiveDialer"):
+        self._dialer = dialer
+        self._dialed_at: Optional[float] = None
+        self._answered_at: Optional[float] = None
+        self._answered = False
+        self._seated = False
+        self._released = False
+
+    def dialed(self) -> None:
+        """The provider accepted the call — it is ringing from now on."""
+        self._dialed_at = time.monotonic()
+
+    def answered(self, seated: bool) -> None:
+        """The callee picked up; ``seated`` is False if the call was abandoned."""
+        if self._answered or self._released:
+            return
+        self._answered = True
+        self._seated = seated
+        self._answered_at = time.monotonic()
+        ring = self._answered_at - self._dialed_at if self._dialed_at is not None else None
+        self._dialer._on_answered(seated, ring)
+
+    def finished(self, outcome: Optional[str]) -> None:
+        """The call ended with attempt ``outcome`` (None: unknown)."""
+        if self._released:
+            return
+        if outcome == "completed" and not self._answered:
+            self.answered(seated=True)   # the answer event was lost or never published
+        self._release(outcome)
+
+    def release(self) -> None:
+        """Give the line back without recording an outcome (not dialed, unknown end)."""
+        if not self._released:
+            self._release(None)
+
+    def _release(self, outcome: Optional[str]) -> None:
+        self._released = True
+        talk = time.monotonic() - self._answered_at if self._seated else None
+        self._dialer._on_finished(self._answered, self._seated, outcome, talk)
+
+
+class PredictiveDialer:
+    """
+    Line gate for one campaign runner. Slots ``await acquire_line()`` before
+    dialing and report answers and hang-ups on the returned DialLine.
+    """
+
+    def __init__(
+        self,
+        seats: int,
+        mode: str = "progressive",
+        max_abandon_rate: float = 0.03,
+        max_lines_per_seat: float = 3.0,
+        line_cap: Optional[int] = None,
+    ):
+        self.seats = max(1, seats)
+        self.predictive = mode == "predictive"
+        self.max_abandon_rate = max_abandon_rate
+        self.max_lines = self.seats
+        if self.predictive:
+            # Lines share the process-wide call cap (DIALER_MAX_CONCURRENT_CALLS)
+            lines = math.ceil(self.seats * max_lines_per_seat)
+            self.max_lines = max(self.seats, min(lines, line_cap or lines))
+        self.ringing = 0
+        self.talking = 0
+        self._answers: deque = deque(maxlen=ANSWER_WINDOW_CALLS)     # per ended dial: answered?
+        self._abandons: deque = deque(maxlen=ANSWER_WINDOW_CALLS)    # per answer: abandoned?
+        self._ring_seconds: deque = deque(maxlen=ANSWER_WINDOW_CALLS)
+        self._talk_seconds: deque = deque(maxlen=ANSWER_WINDOW_CALLS)
+        self._changed = asyncio.Event()
+
+    # ── Rolling statistics ───────────────────────────────────────────────────
+
+    @property
+    def answer_rate(self) -> float:
+        """Laplace-smoothed share of recent dials that were answered."""
+        return (sum(self._answers) + 1.0) / (len(self._answers) + 2.0)
+
+    @property
+    def abandon_rate(self) -> float:
+        return sum(self._abandons) / len(self._abandons) if self._abandons else 0.0
+
+    @property
+    def avg_ring_seconds(self) -> float:
+        return sum(self._ring_seconds) / len(self._ring_seconds) if self._ring_seconds else 0.0
+
+    @property
+    def avg_talk_seconds(self) -> float:
+        return sum(self._talk_seconds) / len(self._talk_seconds) if self._talk_seconds else 0.0
+
+    # ── Gate ─────────────────────────────────────────────────────────────────
+
+    def ringing_allowed(self) -> int:
+        """How many lines may be ringing right now."""
+        free = max(self.seats - self.talking, 0)
+        if (
+            not self.predictive
+            or len(self._answers) < MIN_OBSERVED_CALLS
+            or self.abandon_rate > self.max_abandon_rate
+        ):
+            return free
+
+        seats = float(free)
+        if self.talking and self.avg_talk_seconds > 0:
+            # Seats expected to free up while the new calls are still ringing
+            seats += self.talking * (1.0 - math.exp(-self.avg_ring_seconds / self.avg_talk_seconds))
+
+        allowed = free
+        for lines in range(free + 1, self.max_lines - self.talking + 1):
+            if expected_abandon_ratio(lines, self.answer_rate, seats) > self.max_abandon_rate:
+                break
+            allowed = lines
+        return allowed
+
+    async def acquire_line(self, timeout: float) -> Optional[DialLine]:
+        """A line to dial on, or None if none was free within ``timeout`` seconds."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.ringing >= self.ringing_allowed():
+            self._changed.clear()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        self.ringing += 1
+        return DialLine(self)
+
+    def _on_answered(self, seated: bool, ring_seconds: Optional[float]) -> None:
+        self.ringing -= 1
+        if seated:
+            self.talking += 1
+        self._abandons.append(not seated)
+        if ring_seconds is not None:
+            self._ring_seconds.append(ring_seconds)
+        self._changed.set()
+
+    def _on_finished(
+        self, answered: bool, seated: bool, outcome: Optional[str], talk_seconds: Optional[float]
+    ) -> None:
+        if not answered:
+            self.ringing -= 1
+        elif seated:
+            self.talking -= 1
+        if outcome is not None:
+            self._answers.append(answered)
+            if talk_seconds is not None:
+                self._talk_seconds.append(talk_seconds)
+        self._changed.set()
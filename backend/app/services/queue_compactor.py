@@ -0,0 +1,96 @@
+"""
+Queue Compactor
+===============
+Periodic lifespan task that keeps call_queue small by moving finished rows
+(completed | no_answer | failed | canceled) into call_queue_archive.
+
+Each batch is one statement in its own short transaction:
+
+    WITH moved AS (DELETE FROM call_queue WHERE id IN (... LIMIT n FOR UPDATE
+                   SKIP LOCKED) RETURNING ...)
+    INSERT INTO call_queue_archive SELECT ... FROM moved
+
+so a row is always in exactly one of the two tables, concurrent workers
+never fight over the same rows, and the status counters (which count both
+tables) are unaffected. Rows stay in the hot table for ARCHIVE_AFTER_SECONDS
+after finishing, so late webhooks and the dashboard still find them there.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select
+
+from app.db.database import SessionLocal
+from app.db.models import CallQueue, CallQueueArchive
+
+logger = logging.getLogger(__name__)
+
+COMPACT_INTERVAL_SECONDS = 300    # Time between compaction runs
+ARCHIVE_AFTER_SECONDS    = 3600   # Finished rows younger than this stay hot
+COMPACT_BATCH_SIZE       = 2000   # Rows moved per transaction
+MAX_BATCHES_PER_RUN      = 50     # Bound one run; the backlog drains over several
+BATCH_PAUSE_SECONDS      = 0.1    # Breathing room for other writers between batches
+
+FINISHED_STATUSES = ("completed", "no_answer", "failed", "canceled")
+
+# Columns carried over — everything except the dialer lease
+_ARCHIVED_COLUMNS = (
+    "id", "phone_number", "status", "campaign_id", "attempts", "next_attempt_at",
+    "call_sid", "dialed_at", "created_at", "updated_at",
+)
+
+
+async def compact_batch(
+    batch_size: int = COMPACT_BATCH_SIZE,
+    archive_after_seconds: int = ARCHIVE_AFTER_SECONDS,
+) -> int:
+    """Move one batch of finished rows to the archive. Returns the number moved."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=archive_after_seconds)
+    candidates = (
+        select(CallQueue.id)
+        .where(CallQueue.status.in_(FINISHED_STATUSES))
+        .where(CallQueue.updated_at < cutoff)
+        .order_by(CallQueue.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        delete(CallQueue)
+        .where(CallQueue.id.in_(candidates.scalar_subquery()))
+        .returning(*(getattr(CallQueue, name) for name in _ARCHIVED_COLUMNS))
+        .cte("moved")
+    )
+    statement = insert(CallQueueArchive).from_select(
+        list(_ARCHIVED_COLUMNS),
+        select(*(moved.c[name] for name in _ARCHIVED_COLUMNS)),
+    )
+    async with SessionLocal() as db:
+        result = await db.execute(statement)
+        await db.commit()
+    return result.rowcount
+
+
+async def compact_queue(max_batches: int = MAX_BATCHES_PER_RUN) -> int:
+    """Archive finished rows batch by batch until none are due (or max_batches)."""
+    total = 0
+    for _ in range(max_batches):
+        moved = await compact_batch()
+        total += moved
+        if moved < COMPACT_BATCH_SIZE:
+            break
+        await asyncio.sleep(BATCH_PAUSE_SECONDS)
+    if total:
+        logger.info(f"[Compactor] Archived {total} finished queue rows")
+    return total
+
+
+async def run_queue_compactor() -> None:
+    """Lifespan task: compact the queue every COMPACT_INTERVAL_SECONDS."""
+    while True:
+        try:
+            await compact_queue()
+        except Exception as e:
+            logger.warning(f"[Compactor] Run failed: {e}")
+        await asyncio.sleep(COMPACT_INTERVAL_SECONDS)
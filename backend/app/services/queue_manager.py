@@ -1,55 +1,129 @@
 """
 Call Queue Manager
 ==================
-Manages the outbound call queue and orchestrates Twilio calls.
+Manages the outbound call queue and orchestrates outbound calls.
 
 Responsibilities:
   - Add phone numbers to the queue (single or batch)
-  - Process the queue sequentially (one active call at a time)
-  - Trigger Twilio outbound calls via REST API
+  - Process the queue through N parallel call slots (per-campaign + global caps)
+  - Place outbound calls through the configured telephony provider (Twilio, or
+    the simulator for load tests), paced by the shared token bucket in
+    call_pacer (account-wide CPS, backs off on HTTP 429)
   - Update queue item status after each call
-  - Retry logic for failed calls (max 3 attempts)
+  - Schedule retries via retry_policy (exponential back-off with jitter per
+    outcome); the dialer only dequeues rows whose next_attempt_at is due
+  - Dial due rows in lead_scoring priority order (most likely to convert first),
+    each deferred by call_scheduler to its historically best hour
+  - In-flight calls whose status webhook never arrives are reconciled with
+    the provider by call_reaper, not assumed failed
+  - Never queue or dial numbers on the do-not-call list (dnc_list)
+  - Render each dialed lead's personalized prompt and greeting once and cache
+    them per CallSid in the conversation store for the Twilio voice loop
+
+Multi-worker claiming:
+  Dialer processes lease batches of pending rows in one
+  ``UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)`` statement
+  (lease_owner + lease_expires_at). A row is only dialed by the worker that
+  holds its lease; expired leases are picked up by any other worker.
+
+Campaigns:
+  start_campaign persists a Campaign that adopts every pending item outside a
+  campaign. Its runner heartbeats; pause / resume / cancel change the stored
+  status, and any worker adopts running campaigns whose runner went silent
+  (see adopt_orphaned_campaigns / supervise_campaigns).
+  max_concurrent_calls is the campaign's conversation capacity. In the
+  ``predictive`` dial mode the runner rings more numbers than free slots
+  (see predictive_dialer); an answered call that finds every slot busy is
+  abandoned with an apology and retried shortly.
 
 Queue states:
-  pending   → ready to be called
-  calling   → Twilio call in-flight
+  pending   → ready to be called once next_attempt_at is due
+  calling   → call in-flight
   completed → call ended successfully and status callback received
+  no_answer → max attempts reached, the last one unanswered
   failed    → max attempts reached or permanent error
+  canceled  → dropped because its campaign was cancelled, or its number was
+              put on the do-not-call list (dnc_list) before it was dialed
 """
 
 import asyncio
 import logging
+import os
+import socket
 import uuid
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-import httpx
-from sqlalchemy import select, update
+from sqlalchemy import (
+    DateTime, String, case, cast, column, func, or_, select, union_all, update, values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import SessionLocal
-from app.db.models import CallQueue, Lead
+from app.db.models import Campaign, CallQueue, CallQueueArchive, Lead, QueueStatusCount
 from app.config import get_settings
+from app.services.call_pacer import get_call_pacer
+from app.services.call_scheduler import schedule_call_windows
+from app.services.completion_bus import answered_key, get_completion_bus
+from app.services.conversation_store import get_conversation_store
+from app.services.dnc_list import get_suppression_list
+from app.services.groq_service import build_call_prompt
+from app.services.lead_scoring import score_pending_items
+from app.services.phone_numbers import normalize_phone
+from app.services.predictive_dialer import DIAL_MODES, DialLine, PredictiveDialer
+from app.services.retry_policy import MAX_RETRY_ATTEMPTS, next_queue_state
+from app.services.telephony import TelephonyRateLimitError, get_telephony_provider
 
 logger = logging.getLogger(__name__)
 
-TWILIO_API_BASE = "https://api.twilio.com/2010-04-01"
-MAX_RETRY_ATTEMPTS = 3
-CALL_INTERVAL_SECONDS = 3   # Pause between consecutive calls
-CALL_TIMEOUT_SECONDS = 120  # Max wait for a single call to finish
-STUCK_CALL_MINUTES = 2      # Mark calls in "calling" longer than this as failed
+CALL_TIMEOUT_SECONDS = 120  # Wait this long for the status webhook before asking the provider
+MAX_CALL_SECONDS = 3600     # A slot stops waiting on a still-live call after this
+BULK_CHUNK_SIZE = 1000      # Rows per multi-row INSERT when bulk-enqueueing
+IDLE_POLL_SECONDS = 30      # Max sleep of an idle slot waiting for a scheduled retry
+# A leased row waits in a local buffer until a slot frees up — at most about
+# one call duration — so the lease must outlive the longest call.
+LEASE_SECONDS = CALL_TIMEOUT_SECONDS + 60
+RUNNER_HEARTBEAT_SECONDS = 10   # Campaign runner liveness / status poll interval
+RUNNER_STALE_SECONDS = 60       # A runner silent this long is presumed dead
+
+# Identifies this process as a lease owner (unique per worker and restart)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Campaign runners living in this process, keyed by runner token
+_campaign_runners: dict[str, asyncio.Task] = {}
+
+# Terminal queue status → Campaign progress counter column
+_CAMPAIGN_COUNTERS = {
+    "completed": "completed_count",
+    "no_answer": "no_answer_count",
+    "failed":    "failed_count",
+    "canceled":  "canceled_count",
+}
+
+# Statuses never found in call_queue_archive (only finished rows are compacted)
+ACTIVE_STATUSES = ("pending", "calling")
+
+# ── Concurrency control ──────────────────────────────────────────────────────
+# Every in-flight call in this process holds one permit of the global semaphore.
+_global_call_slots: Optional[asyncio.Semaphore] = None
+
+
+def _new_runner_token() -> str:
+    """Runner ownership token — unique per launch, so a takeover is detectable."""
+    return f"{WORKER_ID}:{uuid.uuid4().hex[:8]}"
 
-# ── Event system for call-completion signalling ──────────────────────────────
-# The campaign runner waits on these asyncio Events; the Twilio webhook sets them.
-_call_completion_events: dict[str, asyncio.Event] = {}
-_campaign_active = False
 
+def _campaign_filter(campaign_id):
+    return CallQueue.campaign_id.is_(None) if campaign_id is None else CallQueue.campaign_id == campaign_id
 
-def notify_call_completed(phone_number: str):
-    """Signal that a call reached a terminal status.  Called by the Twilio webhook."""
-    event = _call_completion_events.get(phone_number)
-    if event:
-        event.set()
+
+def _get_global_call_slots() -> asyncio.Semaphore:
+    global _global_call_slots
+    if _global_call_slots is None:
+        _global_call_slots = asyncio.Semaphore(get_settings().dialer_max_concurrent_calls)
+    return _global_call_slots
 
 
 class QueueManager:
@@ -59,24 +133,19 @@ class QueueManager:
     Example usage:
         manager = QueueManager()
         await manager.add_numbers(["+91XXXXXXXXXX", "+91YYYYYYYYYY"])
-        await manager.start_campaign()
+        await manager.start_campaign(max_concurrent_calls=5)
+        await QueueManager.pause_campaign(campaign_id)
     """
 
     def __init__(self):
         settings = get_settings()
-        self.twilio_account_sid  = settings.twilio_account_sid
-        self.twilio_auth_token   = settings.twilio_auth_token
         self.twilio_phone_number = settings.twilio_phone_number
         self.twilio_base_url     = settings.twilio_base_url.rstrip("/")
         self.groq_api_key        = settings.groq_api_key
 
-        if not self.twilio_account_sid or not self.twilio_auth_token:
-            raise ValueError(
-                "TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set — "
-                "cannot make outbound calls"
-            )
-        if not self.twilio_phone_number:
-            raise ValueError("TWILIO_PHONE_NUMBER is not set — cannot make outbound calls")
+        # Raises ValueError if the provider (e.g. Twilio credentials) is not configured
+        self.telephony = get_telephony_provider()
+        self.pacer = get_call_pacer()
 
     # ──────────────────────────────────────────────
     #  QUEUE MANAGEMENT
@@ -86,78 +155,94 @@ class QueueManager:
     async def add_to_queue(
         db: AsyncSession,
         entries,
-    ) -> List[CallQueue]:
+    ) -> int:
         """
         Insert entries into the call queue (status=pending) and ensure
         a Lead record exists for each phone number.
 
         ``entries`` is a list of objects with ``.phone_number`` and optional ``.name``.
-        Skips numbers already in queue with status pending or calling.
-        Returns list of newly created queue items.
+        Set-based: numbers are normalized to E.164 and de-duplicated in memory
+        (unparseable ones are skipped), leads are upserted with
+        ``INSERT ... ON CONFLICT (phone_number)`` and queue rows are inserted in
+        chunked multi-row statements that skip numbers already pending/calling
+        (``ON CONFLICT`` on uq_call_queue_active_phone). Numbers on the
+        do-not-call list are dropped (checked in memory once loaded). Returns
+        the number of newly queued items.
         """
-        created = []
+        # De-duplicate in memory — first occurrence keeps its position,
+        # a later entry may still supply a missing name.
+        names: dict[str, Optional[str]] = {}
+        invalid = 0
         for entry in entries:
-            phone = entry.phone_number.strip() if isinstance(entry.phone_number, str) else str(entry.phone_number).strip()
-            name = getattr(entry, "name", None)
-            if not phone:
+            phone = normalize_phone(entry.phone_number)
+            if phone is None:
+                invalid += 1
                 continue
+            name = getattr(entry, "name", None)
+            if phone not in names or (name and not names[phone]):
+                names[phone] = name
+        if invalid:
+            logger.info(f"[Queue] Skipped {invalid} entries that are not valid phone numbers")
+
+        phones = await get_suppression_list().allowed(names)
+        if len(phones) < len(names):
+            logger.info(f"[Queue] Dropped {len(names) - len(phones)} numbers on the do-not-call list")
+        added = 0
+        for start in range(0, len(phones), BULK_CHUNK_SIZE):
+            chunk = phones[start:start + BULK_CHUNK_SIZE]
 
-            # Check for existing pending/calling entry
-            existing = await db.execute(
-                select(CallQueue).where(
-                    CallQueue.phone_number == phone,
-                    CallQueue.status.in_(["pending", "calling"]),
+            # Ensure a Lead record exists (fill the name only if it is missing)
+            lead_insert = pg_insert(Lead).values([
+                {"id": uuid.uuid4(), "phone_number": p, "name": names[p], "lead_status": "new"}
+                for p in chunk
+            ])
+            await db.execute(
+                lead_insert.on_conflict_do_update(
+                    index_elements=[Lead.phone_number],
+                    set_={"name": lead_insert.excluded.name},
+                    where=Lead.name.is_(None) & lead_insert.excluded.name.is_not(None),
                 )
             )
-            if existing.scalars().first():
-                logger.info(f"[Queue] Skipping {phone} — already in queue")
-                continue
 
-            # Ensure a Lead record exists
-            lead_result = await db.execute(
-                select(Lead).where(Lead.phone_number == phone)
-            )
-            lead = lead_result.scalars().first()
-            if not lead:
-                lead = Lead(
-                    id=uuid.uuid4(),
-                    phone_number=phone,
-                    name=name,
-                    lead_status="new",
+            # Queue every number without a pending/calling row in one statement
+            result = await db.execute(
+                pg_insert(CallQueue)
+                .values([
+                    {"id": uuid.uuid4(), "phone_number": p, "status": "pending", "attempts": 0}
+                    for p in chunk
+                ])
+                .on_conflict_do_nothing(
+                    index_elements=[CallQueue.phone_number],
+                    index_where=CallQueue.status.in_(ACTIVE_STATUSES),
                 )
-                db.add(lead)
-            elif name and not lead.name:
-                lead.name = name
-
-            item = CallQueue(
-                id=uuid.uuid4(),
-                phone_number=phone,
-                status="pending",
-                attempts=0,
+                .returning(CallQueue.id)
             )
-            db.add(item)
-            created.append(item)
+            added += len(result.all())
 
-        if created:
-            await db.commit()
-            logger.info(f"[Queue] Added {len(created)} numbers to queue")
+        await db.commit()
+        skipped = len(entries) - added
+        if skipped:
+            logger.info(f"[Queue] Skipped {skipped} duplicate or already-queued numbers")
+        if added:
+            logger.info(f"[Queue] Added {added} numbers to queue")
 
-        return created
+        return added
 
     @staticmethod
     async def get_queue_stats(db: AsyncSession) -> dict:
-        """Return counts per status for the dashboard."""
-        from sqlalchemy import func as sa_func
-        result = await db.execute(
-            select(CallQueue.status, sa_func.count(CallQueue.id)).group_by(CallQueue.status)
-        )
-        stats = {row[0]: row[1] for row in result.fetchall()}
+        """
+        Return counts per status for the dashboard — read from the
+        trigger-maintained queue_status_counts table, O(1) in queue size.
+        """
+        result = await db.execute(select(QueueStatusCount.status, QueueStatusCount.count))
+        stats = {status: count for status, count in result.all()}
         return {
             "pending":   stats.get("pending", 0),
             "calling":   stats.get("calling", 0),
             "completed": stats.get("completed", 0),
             "no_answer": stats.get("no_answer", 0),
             "failed":    stats.get("failed", 0),
+            "canceled":  stats.get("canceled", 0),
             "total":     sum(stats.values()),
         }
 
@@ -167,192 +252,816 @@ class QueueManager:
         status: Optional[str] = None,
         limit: int = 50,
         offset: int = 0,
-    ) -> List[CallQueue]:
-        """Paginated queue item retrieval, optionally filtered by status."""
-        query = select(CallQueue).order_by(CallQueue.created_at.asc()).limit(limit).offset(offset)
+    ) -> List[Any]:
+        """
+        Paginated queue item retrieval, optionally filtered by status.
+        Finished items may already have been moved to call_queue_archive by the
+        compactor, so both tables are read (each side pre-limited to the page).
+        Ties on created_at (bulk inserts) are broken by id for stable paging.
+        """
+        columns = ("id", "phone_number", "status", "attempts", "created_at", "updated_at")
+        sides = [CallQueue] if status in ACTIVE_STATUSES else [CallQueue, CallQueueArchive]
+        selects = []
+        for model in sides:
+            side = (
+                select(*(getattr(model, name) for name in columns))
+                .order_by(model.created_at.asc(), model.id)
+                .limit(offset + limit)
+            )
+            if status:
+                side = side.where(model.status == status)
+            selects.append(side)
+
+        if len(selects) == 1:
+            query = selects[0].offset(offset).limit(limit)
+        else:
+            merged = union_all(*(side.subquery().select() for side in selects)).subquery()
+            query = (
+                select(merged)
+                .order_by(merged.c.created_at.asc(), merged.c.id)
+                .offset(offset)
+                .limit(limit)
+            )
+        result = await db.execute(query)
+        return result.all()
+
+    # ──────────────────────────────────────────────
+    #  CAMPAIGNS
+    # ──────────────────────────────────────────────
+
+    async def start_campaign(
+        self,
+        max_concurrent_calls: Optional[int] = None,
+        name: Optional[str] = None,
+        dial_mode: Optional[str] = None,
+    ) -> dict:
+        """
+        Create a campaign over every pending item not yet in a campaign and
+        start its runner in the background (N parallel call slots).
+        Returns immediately with the persisted campaign ID.
+        """
+        settings = get_settings()
+        slots = max_concurrent_calls or settings.campaign_max_concurrent_calls
+        slots = max(1, min(slots, settings.dialer_max_concurrent_calls))
+        dial_mode = dial_mode or settings.dialer_mode
+        if dial_mode not in DIAL_MODES:
+            raise ValueError(f"Unknown dial mode '{dial_mode}' — expected one of {', '.join(DIAL_MODES)}")
+
+        campaign_id = uuid.uuid4()
+        runner_token = _new_runner_token()
+        async with SessionLocal() as db:
+            db.add(Campaign(
+                id=campaign_id,
+                name=name,
+                status="running",
+                max_concurrent_calls=slots,
+                dial_mode=dial_mode,
+                runner_id=runner_token,
+                runner_heartbeat_at=datetime.now(timezone.utc),
+            ))
+            await db.flush()
+            adopted = await db.execute(
+                update(CallQueue)
+                .where(CallQueue.status == "pending")
+                .where(CallQueue.campaign_id.is_(None))
+                .values(campaign_id=campaign_id)
+            )
+            total = adopted.rowcount
+            await db.execute(
+                update(Campaign).where(Campaign.id == campaign_id).values(total_items=total)
+            )
+            await db.commit()
+
+        logger.info(
+            f"[Campaign {campaign_id}] Starting outbound calling campaign — "
+            f"{total} items, {slots} slots, {dial_mode} dialing"
+        )
+        self._launch_runner(campaign_id, slots, runner_token, dial_mode)
+        return {
+            "campaign_id": str(campaign_id),
+            "status": "started",
+            "max_concurrent_calls": slots,
+            "dial_mode": dial_mode,
+            "total_items": total,
+        }
+
+    async def resume_campaign(self, campaign_id) -> Optional[Campaign]:
+        """
+        Resume a paused campaign and run it in this process. Taking over the
+        runner token makes a runner still draining the pause step aside.
+        Returns the campaign, or None if it was not paused.
+        """
+        runner_token = _new_runner_token()
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .where(Campaign.status == "paused")
+                .values(
+                    status="running",
+                    runner_id=runner_token,
+                    runner_heartbeat_at=func.now(),
+                )
+                .returning(Campaign)
+            )
+            campaign = result.scalar()
+            await db.commit()
+
+        if campaign is None:
+            return None
+        logger.info(f"[Campaign {campaign_id}] Resumed")
+        self._launch_runner(campaign.id, campaign.max_concurrent_calls, runner_token, campaign.dial_mode)
+        return campaign
+
+    @staticmethod
+    async def pause_campaign(campaign_id) -> Optional[Campaign]:
+        """
+        Pause a running campaign. Its runner stops claiming new items and exits
+        once in-flight calls finish. Returns the campaign, or None if not running.
+        """
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .where(Campaign.status == "running")
+                .values(status="paused")
+                .returning(Campaign)
+            )
+            campaign = result.scalar()
+            await db.commit()
+        if campaign is not None:
+            logger.info(f"[Campaign {campaign_id}] Paused")
+        return campaign
+
+    @staticmethod
+    async def cancel_campaign(campaign_id) -> Optional[Campaign]:
+        """
+        Cancel a running or paused campaign: its pending items become
+        ``canceled``; calls already in flight finish normally.
+        Returns the campaign, or None if it had already ended.
+        """
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .where(Campaign.status.in_(["running", "paused"]))
+                .values(status="cancelled", finished_at=func.now())
+                .returning(Campaign.id)
+            )
+            if result.scalar() is None:
+                return None
+
+            canceled = await db.execute(
+                update(CallQueue)
+                .where(CallQueue.campaign_id == campaign_id)
+                .where(CallQueue.status == "pending")
+                .values(status="canceled", lease_owner=None, lease_expires_at=None)
+            )
+            result = await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values(canceled_count=Campaign.canceled_count + canceled.rowcount)
+                .returning(Campaign)
+            )
+            campaign = result.scalar()
+            await db.commit()
+
+        logger.info(f"[Campaign {campaign_id}] Cancelled — {canceled.rowcount} pending items dropped")
+        return campaign
+
+    @staticmethod
+    async def get_campaign(db: AsyncSession, campaign_id) -> Optional[Campaign]:
+        result = await db.execute(select(Campaign).where(Campaign.id == campaign_id))
+        return result.scalars().first()
+
+    @staticmethod
+    async def list_campaigns(
+        db: AsyncSession,
+        status: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Campaign]:
+        query = select(Campaign).order_by(Campaign.created_at.desc()).limit(limit).offset(offset)
         if status:
-            query = query.where(CallQueue.status == status)
+            query = query.where(Campaign.status == status)
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def adopt_orphaned_campaigns(self) -> int:
+        """
+        Start runners here for running campaigns that have no live runner —
+        never started, or their worker died / was redeployed.
+        Returns the number of campaigns adopted.
+        """
+        stale = func.now() - timedelta(seconds=RUNNER_STALE_SECONDS)
+        orphaned = (
+            (Campaign.runner_id.is_(None)) | (Campaign.runner_heartbeat_at < stale)
+        )
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(Campaign.id).where(Campaign.status == "running").where(orphaned)
+            )
+            candidates = result.scalars().all()
+
+        adopted = 0
+        for campaign_id in candidates:
+            runner_token = _new_runner_token()
+            async with SessionLocal() as db:
+                result = await db.execute(
+                    update(Campaign)
+                    .where(Campaign.id == campaign_id)
+                    .where(Campaign.status == "running")
+                    .where(orphaned)
+                    .values(runner_id=runner_token, runner_heartbeat_at=func.now())
+                    .returning(Campaign.max_concurrent_calls, Campaign.dial_mode)
+                )
+                adopted_row = result.first()
+                await db.commit()
+            if adopted_row is None:
+                continue  # another worker got there first
+            logger.info(f"[Campaign {campaign_id}] Adopted unfinished campaign")
+            self._launch_runner(campaign_id, adopted_row.max_concurrent_calls, runner_token, adopted_row.dial_mode)
+            adopted += 1
+        return adopted
+
     # ──────────────────────────────────────────────
     #  CAMPAIGN RUNNER
     # ──────────────────────────────────────────────
 
-    async def start_campaign(self) -> dict:
+    def _launch_runner(self, campaign_id, slots: int, runner_token: str, dial_mode: str = "progressive") -> None:
+        task = asyncio.create_task(self._process_queue(campaign_id, slots, runner_token, dial_mode))
+        _campaign_runners[runner_token] = task
+        task.add_done_callback(lambda _t: _campaign_runners.pop(runner_token, None))
+
+    async def _process_queue(self, campaign_id, slots: int, runner_token: str, dial_mode: str = "progressive"):
         """
-        Start processing the pending queue.
-        Runs in background — processes all pending items sequentially.
-        Returns immediately with a campaign ID.
+        Background task: run independent call slots for one campaign until its
+        items are drained, it is paused/cancelled, or another runner takes it
+        over — `slots` of them, or one per line the predictive dialer may use.
         """
-        campaign_id = str(uuid.uuid4())
-        logger.info(f"[Campaign {campaign_id}] Starting outbound calling campaign")
-        asyncio.create_task(self._process_queue(campaign_id))
-        return {"campaign_id": campaign_id, "status": "started"}
-
-    async def _process_queue(self, campaign_id: str):
-        """Background task: process pending queue items one-by-one, waiting for each to complete."""
-        global _campaign_active
-        _campaign_active = True
-        logger.info(f"[Campaign {campaign_id}] Queue processor started")
-        processed = 0
-        failed = 0
+        settings = get_settings()
+        dialer = PredictiveDialer(
+            seats=slots,
+            mode=dial_mode,
+            max_abandon_rate=settings.dialer_max_abandon_rate,
+            max_lines_per_seat=settings.dialer_max_lines_per_slot,
+            line_cap=settings.dialer_max_concurrent_calls,
+        )
+        lines = dialer.max_lines
+        logger.info(f"[Campaign {campaign_id}] Queue processor started ({dial_mode}, up to {lines} lines)")
+        state = {"status": "running", "drained": False}
+        leased: deque = deque()
+        claim_lock = asyncio.Lock()
+        heartbeat = asyncio.create_task(self._heartbeat(campaign_id, runner_token, state))
 
         try:
-            # Recover calls stuck from a previous run
-            await self._recover_stuck_calls()
+            # Dial the most promising leads first, each in its best calling hour
+            for prepare in (score_pending_items, schedule_call_windows):
+                try:
+                    await prepare(campaign_id)
+                except Exception as e:
+                    logger.warning(f"[Campaign {campaign_id}] {prepare.__name__} failed: {e}")
+            await asyncio.gather(
+                *(
+                    self._run_call_slot(campaign_id, n, state, leased, claim_lock, lines, dialer)
+                    for n in range(lines)
+                )
+            )
+        except asyncio.CancelledError:
+            logger.info(f"[Campaign {campaign_id}] Runner stopped — campaign can be resumed")
+        except Exception as e:
+            logger.error(f"[Campaign {campaign_id}] Fatal error: {e}", exc_info=True)
+        finally:
+            heartbeat.cancel()
+            # Hand back anything still sitting in the local buffer, then ownership
+            await self.release_leases([item_id for item_id, _ in leased])
+            campaign = await self._release_runner(campaign_id, runner_token, state["drained"])
 
-            while True:
-                # Fetch ONE pending item fresh from DB each iteration
+        if campaign is not None:
+            logger.info(
+                f"[Campaign {campaign_id}] Runner finished — status={campaign.status} "
+                f"completed={campaign.completed_count} no_answer={campaign.no_answer_count} "
+                f"failed={campaign.failed_count} of {campaign.total_items}"
+            )
+
+    @staticmethod
+    async def _heartbeat(campaign_id, runner_token: str, state: dict):
+        """Keep runner ownership alive and mirror the campaign status into ``state``."""
+        while True:
+            await asyncio.sleep(RUNNER_HEARTBEAT_SECONDS)
+            try:
                 async with SessionLocal() as db:
                     result = await db.execute(
-                        select(CallQueue)
-                        .where(CallQueue.status == "pending")
-                        .where(CallQueue.attempts < MAX_RETRY_ATTEMPTS)
-                        .order_by(CallQueue.created_at.asc())
-                        .limit(1)
+                        update(Campaign)
+                        .where(Campaign.id == campaign_id)
+                        .where(Campaign.runner_id == runner_token)
+                        .values(runner_heartbeat_at=func.now())
+                        .returning(Campaign.status)
                     )
-                    item = result.scalars().first()
-                    if not item:
-                        logger.info(f"[Campaign {campaign_id}] No more pending items")
-                        break
-                    # Snapshot values — object is detached once session closes
-                    item_id = item.id
-                    item_phone = item.phone_number
-
-                logger.info(f"[Campaign {campaign_id}] Processing {item_phone}")
-
-                # Register a completion event so the webhook can wake us up
-                event = asyncio.Event()
-                _call_completion_events[item_phone] = event
+                    status = result.scalar()
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"[Campaign {campaign_id}] Heartbeat failed: {e}")
+                continue
+            # None: another runner took the campaign over
+            state["status"] = status or "taken_over"
 
-                try:
-                    success = await self._initiate_call(item_id, item_phone)
-                    if not success:
-                        failed += 1
-                        await asyncio.sleep(CALL_INTERVAL_SECONDS)
-                        continue
+    @staticmethod
+    async def _release_runner(campaign_id, runner_token: str, drained: bool) -> Optional[Campaign]:
+        """Give up runner ownership; mark the campaign completed if it was drained."""
+        changes = {"runner_id": None, "runner_heartbeat_at": None}
+        if drained:
+            changes.update(
+                status=case((Campaign.status == "running", "completed"), else_=Campaign.status),
+                finished_at=case((Campaign.status == "running", func.now()), else_=Campaign.finished_at),
+            )
+        try:
+            async with SessionLocal() as db:
+                result = await db.execute(
+                    update(Campaign)
+                    .where(Campaign.id == campaign_id)
+                    .where(Campaign.runner_id == runner_token)
+                    .values(**changes)
+                    .returning(Campaign)
+                )
+                campaign = result.scalar()
+                await db.commit()
+            return campaign
+        except Exception as e:
+            logger.error(f"[Campaign {campaign_id}] Could not release runner: {e}")
+            return None
 
-                    # ── Wait for the Twilio status webhook to fire ───────────
-                    try:
-                        await asyncio.wait_for(event.wait(), timeout=CALL_TIMEOUT_SECONDS)
-                    except asyncio.TimeoutError:
-                        logger.warning(
-                            f"[Campaign {campaign_id}] Timeout for {item_phone} "
-                            f"after {CALL_TIMEOUT_SECONDS}s — marking failed"
-                        )
-                        async with SessionLocal() as db:
-                            await db.execute(
-                                update(CallQueue)
-                                .where(CallQueue.id == item_id)
-                                .where(CallQueue.status == "calling")
-                                .values(status="failed")
+    async def _run_call_slot(
+        self,
+        campaign_id,
+        slot: int,
+        state: dict,
+        leased: deque,
+        claim_lock: asyncio.Lock,
+        batch_size: int,
+        dialer: PredictiveDialer,
+    ):
+        """
+        One call slot: wait for the dialer to allow another ringing line, take
+        the next leased item, dial it and wait for the outcome, then repeat
+        while the campaign is running. Each slot also holds one of the
+        process-wide call permits for the duration of its call.
+        """
+        while state["status"] == "running":
+            line = await dialer.acquire_line(timeout=RUNNER_HEARTBEAT_SECONDS)
+            if line is None:
+                continue  # re-check the campaign status
+            try:
+                async with _get_global_call_slots():
+                    async with claim_lock:
+                        if not leased:
+                            leased.extend(await self.lease_batch(batch_size, campaign_id=campaign_id))
+                        item = leased.popleft() if leased else None
+                    if item:
+                        item_id, item_phone = item
+                        logger.info(f"[Campaign {campaign_id}] Slot {slot}: processing {item_phone}")
+                        try:
+                            await self._dial_and_wait(campaign_id, item_id, item_phone, line)
+                        except Exception as e:
+                            logger.error(
+                                f"[Campaign {campaign_id}] Error processing {item_phone}: {e}",
+                                exc_info=True,
                             )
-                            await db.commit()
-                        failed += 1
-                        await asyncio.sleep(CALL_INTERVAL_SECONDS)
                         continue
+            finally:
+                line.release()
 
-                    # Read final status written by the webhook
-                    async with SessionLocal() as db:
-                        result = await db.execute(
-                            select(CallQueue.status).where(CallQueue.id == item_id)
-                        )
-                        final_status = result.scalar()
+            # Nothing due right now — idle until the next scheduled retry, if any
+            wait = await self._seconds_until_next_due(campaign_id)
+            if wait is None:
+                logger.info(f"[Campaign {campaign_id}] Slot {slot}: no more pending items")
+                state["drained"] = True
+                return
+            await asyncio.sleep(min(max(wait, 1.0), IDLE_POLL_SECONDS))
 
-                    if final_status == "completed":
-                        processed += 1
-                    else:
-                        failed += 1
+        logger.info(f"[Campaign {campaign_id}] Slot {slot}: stopping — campaign {state['status']}")
 
-                    await asyncio.sleep(CALL_INTERVAL_SECONDS)
+    @staticmethod
+    async def lease_batch(
+        limit: int,
+        campaign_id=None,
+        owner: str = WORKER_ID,
+        lease_seconds: int = LEASE_SECONDS,
+    ) -> List[tuple]:
+        """
+        Lease up to ``limit`` pending items of ``campaign_id`` (None: items in
+        no campaign) for ``owner`` in a single statement.
 
-                except Exception as e:
-                    logger.error(
-                        f"[Campaign {campaign_id}] Error processing {item_phone}: {e}",
-                        exc_info=True,
+        Only rows whose ``next_attempt_at`` is due are considered, highest
+        lead-scoring priority first, then oldest (served by the partial
+        priority index on pending rows). Rows locked by a concurrent claimer
+        are skipped rather than waited on, and rows whose lease has expired
+        are up for grabs again. Returns ``(id, phone_number)`` tuples in dial order.
+        """
+        candidates = (
+            select(CallQueue.id)
+            .where(CallQueue.status == "pending")
+            .where(CallQueue.next_attempt_at <= func.now())
+            .where(CallQueue.attempts < MAX_RETRY_ATTEMPTS)
+            .where(_campaign_filter(campaign_id))
+            .where(
+                or_(
+                    CallQueue.lease_expires_at.is_(None),
+                    CallQueue.lease_expires_at < func.now(),
+                )
+            )
+            .order_by(CallQueue.priority.desc(), CallQueue.created_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(CallQueue)
+                .where(CallQueue.id.in_(candidates.scalar_subquery()))
+                .values(
+                    lease_owner=owner,
+                    lease_expires_at=func.now() + timedelta(seconds=lease_seconds),
+                )
+                .returning(CallQueue.id, CallQueue.phone_number, CallQueue.priority, CallQueue.created_at)
+                .execution_options(synchronize_session=False)
+            )
+            rows = result.all()
+            await db.commit()
+
+        # RETURNING order is arbitrary
+        rows.sort(key=lambda r: (-r.priority, r.created_at))
+        return [(r.id, r.phone_number) for r in rows]
+
+    @staticmethod
+    async def release_leases(item_ids: list, owner: str = WORKER_ID) -> None:
+        """Drop this worker's lease on items it will not dial after all."""
+        if not item_ids:
+            return
+        async with SessionLocal() as db:
+            await db.execute(
+                update(CallQueue)
+                .where(CallQueue.id.in_(item_ids))
+                .where(CallQueue.lease_owner == owner)
+                .where(CallQueue.status == "pending")
+                .values(lease_owner=None, lease_expires_at=None)
+            )
+            await db.commit()
+
+    @staticmethod
+    async def _seconds_until_next_due(campaign_id=None) -> Optional[float]:
+        """
+        Seconds until the campaign's earliest pending item is due (<= 0 if
+        overdue). While only calls are in flight — whose outcome may still
+        schedule a retry — returns IDLE_POLL_SECONDS. None once nothing is left.
+        """
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(
+                    func.extract(
+                        "epoch",
+                        func.min(CallQueue.next_attempt_at).filter(CallQueue.status == "pending")
+                        - func.now(),
+                    ),
+                    func.count().filter(CallQueue.status == "calling"),
+                )
+                .where(
+                    or_(
+                        CallQueue.status == "calling",
+                        (CallQueue.status == "pending") & (CallQueue.attempts < MAX_RETRY_ATTEMPTS),
                     )
-                    failed += 1
-                finally:
-                    _call_completion_events.pop(item_phone, None)
+                )
+                .where(_campaign_filter(campaign_id))
+            )
+            seconds, in_flight = result.one()
+        if seconds is not None:
+            return float(seconds)
+        return float(IDLE_POLL_SECONDS) if in_flight else None
 
-        except Exception as e:
-            logger.error(f"[Campaign {campaign_id}] Fatal error: {e}", exc_info=True)
-        finally:
-            _campaign_active = False
+    @staticmethod
+    async def apply_call_outcome(db: AsyncSession, item_id, outcome: str) -> Optional[str]:
+        """
+        Move an in-flight (calling) item on after an attempt ended with
+        ``outcome`` (completed | no_answer | busy | failed): terminal, or back
+        to pending with a back-off per retry_policy. A terminal status also
+        bumps the owning campaign's progress counter in the same transaction.
+        Does not commit. Returns the new status, or None if the item was no
+        longer in flight.
+        """
+        applied = await QueueManager.apply_call_outcomes(db, {item_id: outcome})
+        return applied.get(item_id)
 
-        logger.info(
-            f"[Campaign {campaign_id}] Finished — processed={processed} failed={failed}"
+    @staticmethod
+    async def apply_call_outcomes(
+        db: AsyncSession,
+        outcomes: Dict[Any, str],
+        skip_locked: bool = False,
+    ) -> Dict[Any, str]:
+        """
+        Bulk form of apply_call_outcome: ``{item_id: outcome}`` → one locking
+        SELECT, one UPDATE ... FROM (VALUES ...) and one counter UPDATE per
+        campaign touched. Items no longer in flight (or locked by another
+        transaction, with ``skip_locked``) are left out of the result.
+        Does not commit.
+        """
+        if not outcomes:
+            return {}
+        result = await db.execute(
+            select(CallQueue.id, CallQueue.attempts, CallQueue.campaign_id, CallQueue.abandoned)
+            .where(CallQueue.id.in_(list(outcomes)))
+            .where(CallQueue.status == "calling")
+            .with_for_update(skip_locked=skip_locked)
+        )
+        rows = result.all()
+        if not rows:
+            return {}
+
+        applied: Dict[Any, str] = {}
+        changes = []
+        counters: Dict[Any, Counter] = defaultdict(Counter)
+        for row in rows:
+            outcome = outcomes[row.id]
+            if row.abandoned and outcome == "completed":
+                outcome = "abandoned"   # answered, but we had no free slot to talk
+            status, next_attempt_at = next_queue_state(outcome, row.attempts)
+            applied[row.id] = status
+            changes.append((row.id, status, next_attempt_at))
+            counter = _CAMPAIGN_COUNTERS.get(status)
+            if row.campaign_id is not None and counter is not None:
+                counters[row.campaign_id][counter] += 1
+
+        new_state = values(
+            column("id", PG_UUID(as_uuid=True)),
+            column("status", String),
+            column("next_attempt_at", DateTime(timezone=True)),
+            name="new_state",
+        ).data(changes)
+        await db.execute(
+            update(CallQueue)
+            .where(CallQueue.id == new_state.c.id)
+            .values(
+                status=new_state.c.status,
+                # cast: an all-NULL VALUES column would otherwise be typed text
+                next_attempt_at=func.coalesce(
+                    cast(new_state.c.next_attempt_at, DateTime(timezone=True)),
+                    CallQueue.next_attempt_at,
+                ),
+            )
+            .execution_options(synchronize_session=False)
         )
 
-    async def _initiate_call(self, item_id, phone_number: str) -> bool:
+        for campaign_id, increments in counters.items():
+            await db.execute(
+                update(Campaign)
+                .where(Campaign.id == campaign_id)
+                .values({name: getattr(Campaign, name) + n for name, n in increments.items()})
+            )
+        return applied
+
+    @staticmethod
+    async def claim_conversation_seat(db: AsyncSession, item_id) -> bool:
+        """
+        Called when a call is answered: grant it one of its campaign's
+        conversation slots (max_concurrent_calls), or mark it abandoned when
+        every slot is taken — possible only with predictive dialing. The
+        campaign row lock serialises concurrent answers. Does not commit.
+        """
+        result = await db.execute(
+            select(CallQueue.campaign_id, CallQueue.answered_at, CallQueue.abandoned)
+            .where(CallQueue.id == item_id)
+            .where(CallQueue.status == "calling")
+        )
+        row = result.first()
+        if row is None or row.answered_at is not None:
+            return True
+        if row.abandoned:
+            return False
+
+        seated = True
+        if row.campaign_id is not None:
+            result = await db.execute(
+                select(Campaign.max_concurrent_calls)
+                .where(Campaign.id == row.campaign_id)
+                .with_for_update()
+            )
+            capacity = result.scalar()
+            talking = await db.execute(
+                select(func.count())
+                .select_from(CallQueue)
+                .where(CallQueue.campaign_id == row.campaign_id)
+                .where(CallQueue.status == "calling")
+                .where(CallQueue.answered_at.isnot(None))
+            )
+            seated = capacity is None or talking.scalar() < capacity
+
+        change = {"answered_at": func.now()} if seated else {"abandoned": True}
+        await db.execute(update(CallQueue).where(CallQueue.id == item_id).values(**change))
+        return seated
+
+    @staticmethod
+    async def resolve_call_item(db: AsyncSession, call_sid: Optional[str], phone_number: Optional[str]):
         """
-        Atomically claim a queue item and trigger a Twilio outbound call.
-        Returns True if the call was successfully initiated.
+        Return the id of the queue row for a provider callback. One unique-index
+        lookup by CallSid; only a callback that beats the dialer storing the SID
+        falls back to the number's in-flight row and links the SID to it.
         """
+        if call_sid:
+            result = await db.execute(select(CallQueue.id).where(CallQueue.call_sid == call_sid))
+            item_id = result.scalar()
+            if item_id is not None or not phone_number:
+                return item_id
+        if not phone_number:
+            return None
+
+        result = await db.execute(
+            select(CallQueue.id)
+            .where(CallQueue.phone_number == phone_number)
+            .where(CallQueue.status == "calling")
+            .where(CallQueue.call_sid.is_(None))
+            .order_by(CallQueue.dialed_at.desc())
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        item_id = result.scalar()
+        if item_id is not None and call_sid:
+            await db.execute(update(CallQueue).where(CallQueue.id == item_id).values(call_sid=call_sid))
+        return item_id
+
+    async def _dial_and_wait(self, campaign_id, item_id, item_phone: str, line: DialLine) -> bool:
+        """
+        Dial a leased item and wait for the Twilio status webhook, which may be
+        served by any worker — it reaches us through the completion bus.
+        If the webhook is late, the call is reconciled with the provider directly;
+        a call that is still live keeps its slot. Answer and hang-up are
+        reported on ``line`` for the predictive dialer. Returns True if the
+        call ended as completed.
+        """
+        from app.services.call_reaper import reap_stuck_calls
+
+        call_sid = await self._initiate_call(item_id, item_phone)
+        if call_sid is None:
+            return False
+        line.dialed()
+
+        # Events are keyed by CallSid; one that already fired resolves at once
+        bus = get_completion_bus()
+        waiter = bus.expect(call_sid)
+        answered = bus.expect(answered_key(call_sid))
+        pending = {waiter, answered}
+        try:
+            # ── Wait for the status webhook; ask the provider when it's late ──
+            loop = asyncio.get_running_loop()
+            give_up_at = loop.time() + MAX_CALL_SECONDS
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, timeout=CALL_TIMEOUT_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                )
+                if answered in done:
+                    line.answered(seated=answered.result().get("seated", True))
+                    if waiter not in done:
+                        continue
+                if waiter in done:
+                    # The webhook publishes the status it wrote — no need to re-read it
+                    payload = waiter.result()
+                    line.finished(payload.get("outcome"))
+                    return payload.get("status") == "completed"
+
+                reconciled = await reap_stuck_calls(item_ids=[item_id])
+                if item_id in reconciled:
+                    return reconciled[item_id] == "completed"
+                if loop.time() >= give_up_at:
+                    logger.warning(
+                        f"[Campaign {campaign_id}] {item_phone} still in flight after "
+                        f"{MAX_CALL_SECONDS}s — freeing the slot; the reaper will settle it"
+                    )
+                    return False
+        finally:
+            bus.forget(call_sid, waiter)
+            bus.forget(answered_key(call_sid), answered)
+
+    async def _initiate_call(self, item_id, phone_number: str) -> Optional[str]:
+        """
+        Atomically claim a leased queue item and place the outbound call.
+        Waits for a token from the account-wide call pacer first. An item whose
+        number was put on the do-not-call list after it was queued is canceled.
+        Returns the CallSid (also stored on the row), or None if no call was placed.
+        """
+        try:
+            blocked = await get_suppression_list().is_blocked(phone_number)
+        except Exception as e:
+            # Never dial unchecked — the lease expires and the item is retried
+            logger.warning(f"[Queue] Cannot check {phone_number} against the do-not-call list: {e}")
+            return None
+        if blocked:
+            await self._cancel_suppressed(item_id, phone_number)
+            return None
+
+        await self.pacer.acquire()
+
         async with SessionLocal() as db:
-            # Atomically claim: only succeeds if still pending
+            # Atomically claim: only succeeds if still pending and still leased
+            # to this worker — an expired lease may have been taken over.
             result = await db.execute(
                 update(CallQueue)
                 .where(CallQueue.id == item_id)
                 .where(CallQueue.status == "pending")
-                .values(status="calling", attempts=CallQueue.attempts + 1)
+                .where(CallQueue.lease_owner == WORKER_ID)
+                .values(
+                    status="calling",
+                    attempts=CallQueue.attempts + 1,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    call_sid=None,
+                    dialed_at=func.now(),
+                    answered_at=None,
+                    abandoned=False,
+                )
             )
             await db.commit()
 
             if result.rowcount == 0:
-                logger.warning(f"[Queue] Could not claim {phone_number} — not pending")
-                return False
+                logger.warning(f"[Queue] Could not claim {phone_number} — lease lost or not pending")
+                return None
 
-            await self._get_or_create_lead(db, phone_number)
+            lead = await self._get_or_create_lead(db, phone_number)
 
         try:
-            call_sid = await self._trigger_twilio_call(phone_number)
-            logger.info(f"[Queue] Initiated Twilio call {call_sid} for {phone_number}")
-            return True
-        except Exception as e:
-            logger.error(f"[Queue] Twilio call failed for {phone_number}: {e}")
+            call_sid = await self._place_call(phone_number)
+            logger.info(f"[Queue] Initiated {self.telephony.name} call {call_sid} for {phone_number}")
+            await self.pacer.record_success()
+        except TelephonyRateLimitError as e:
+            # Not dialed — slow every worker down and put the item back untouched
+            logger.warning(f"[Queue] Provider rate-limited the call to {phone_number}")
+            await self.pacer.penalize(e.retry_after)
             async with SessionLocal() as db:
-                res = await db.execute(
-                    select(CallQueue.attempts).where(CallQueue.id == item_id)
-                )
-                attempts = res.scalar() or 0
-                new_status = "failed" if attempts >= MAX_RETRY_ATTEMPTS else "pending"
                 await db.execute(
                     update(CallQueue)
                     .where(CallQueue.id == item_id)
-                    .values(status=new_status)
+                    .where(CallQueue.status == "calling")
+                    .values(status="pending", attempts=CallQueue.attempts - 1)
                 )
                 await db.commit()
-            return False
+            return None
+        except Exception as e:
+            logger.error(f"[Queue] Call failed for {phone_number}: {e}")
+            async with SessionLocal() as db:
+                await self.apply_call_outcome(db, item_id, "failed")
+                await db.commit()
+            return None
+
+        # Rendered while the phone rings, so no turn of the call loads the lead
+        try:
+            await self.cache_call_prompt(call_sid, lead)
+        except Exception as e:
+            logger.warning(f"[Queue] Could not cache the prompt of {call_sid} — /voice renders it: {e}")
 
-    async def _trigger_twilio_call(self, phone_number: str) -> str:
-        """
-        POST to Twilio REST API to initiate an outbound call.
-        Twilio will hit our /api/twilio/voice webhook when the lead picks up.
-        Returns the Twilio CallSid.
-        """
-        voice_url    = f"{self.twilio_base_url}/api/twilio/voice"
-        status_url   = f"{self.twilio_base_url}/api/twilio/status"
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{TWILIO_API_BASE}/Accounts/{self.twilio_account_sid}/Calls.json",
-                auth=(self.twilio_account_sid, self.twilio_auth_token),
-                data={
-                    "From":           self.twilio_phone_number,
-                    "To":             phone_number,
-                    "Url":            voice_url,
-                    "StatusCallback": status_url,
-                    "StatusCallbackMethod": "POST",
-                    "StatusCallbackEvent":  "completed ringing answered",
-                    "Timeout":        30,   # seconds to ring before no-answer
-                    "MachineDetection": "Enable",   # skip voicemail greeting
-                },
+        # Webhooks find the row by CallSid; the reaper uses it for lost webhooks.
+        # An early callback may already have linked it (see resolve_call_item).
+        async with SessionLocal() as db:
+            await db.execute(
+                update(CallQueue)
+                .where(CallQueue.id == item_id)
+                .where(CallQueue.status == "calling")
+                .where(CallQueue.call_sid.is_(None))
+                .values(call_sid=call_sid)
             )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("sid", "unknown")
+            await db.commit()
+        return call_sid
+
+    @staticmethod
+    async def _cancel_suppressed(item_id, phone_number: str) -> None:
+        """Cancel a leased item instead of dialing a do-not-call number."""
+        async with SessionLocal() as db:
+            result = await db.execute(
+                update(CallQueue)
+                .where(CallQueue.id == item_id)
+                .where(CallQueue.status == "pending")
+                .where(CallQueue.lease_owner == WORKER_ID)
+                .values(status="canceled", lease_owner=None, lease_expires_at=None)
+                .returning(CallQueue.campaign_id)
+            )
+            row = result.first()
+            if row is not None and row.campaign_id is not None:
+                await db.execute(
+                    update(Campaign)
+                    .where(Campaign.id == row.campaign_id)
+                    .values(canceled_count=Campaign.canceled_count + 1)
+                )
+            await db.commit()
+        if row is not None:
+            logger.info(f"[Queue] Canceled {phone_number} — on the do-not-call list")
+
+    async def _place_call(self, phone_number: str) -> str:
+        """
+        Start an outbound call through the configured telephony provider.
+        The provider hits our /api/twilio/voice webhook when the lead picks up.
+        Returns the CallSid. Raises TelephonyRateLimitError when refused for pacing.
+        """
+        return await self.telephony.create_call(
+            to=phone_number,
+            from_=self.twilio_phone_number,
+            voice_url=f"{self.twilio_base_url}/api/twilio/voice",
+            status_url=f"{self.twilio_base_url}/api/twilio/status",
+        )
 
     @staticmethod
     async def _get_or_create_lead(db: AsyncSession, phone_number: str) -> Lead:
@@ -369,51 +1078,52 @@ class QueueManager:
             logger.info(f"[Queue] Created new lead for {phone_number}")
         return lead
 
-    @staticmethod
-    async def _recover_stuck_calls():
-        """Mark calls stuck in 'calling' for longer than STUCK_CALL_MINUTES as failed."""
-        cutoff = datetime.now(timezone.utc) - timedelta(minutes=STUCK_CALL_MINUTES)
-        async with SessionLocal() as db:
-            result = await db.execute(
-                update(CallQueue)
-                .where(CallQueue.status == "calling")
-                .where(CallQueue.updated_at < cutoff)
-                .values(status="failed")
-            )
-            await db.commit()
-            if result.rowcount > 0:
-                logger.warning(f"[Queue] Recovered {result.rowcount} stuck calls → failed")
-
     @staticmethod
     async def process_next_item():
         """
         Process the next pending queue item (single shot).
-        Called from the Twilio webhook when no campaign is actively running.
+        Called from the Twilio webhook; only dials items outside any campaign,
+        and only while no campaign is running.
         """
-        if _campaign_active:
+        if _campaign_runners:
             return  # Campaign runner handles advancement
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(Campaign.id).where(Campaign.status == "running").limit(1)
+            )
+            if result.first():
+                return
 
         try:
             manager = QueueManager()
         except ValueError:
-            return  # Twilio not configured
+            return  # Telephony not configured
 
-        async with SessionLocal() as db:
-            result = await db.execute(
-                select(CallQueue)
-                .where(CallQueue.status == "pending")
-                .where(CallQueue.attempts < MAX_RETRY_ATTEMPTS)
-                .order_by(CallQueue.created_at.asc())
-                .limit(1)
-            )
-            item = result.scalars().first()
-            if not item:
-                return
-            item_id = item.id
-            item_phone = item.phone_number
+        leased = await QueueManager.lease_batch(1)
+        if not leased:
+            return
+        item_id, item_phone = leased[0]
 
         await manager._initiate_call(item_id, item_phone)
 
+    @staticmethod
+    async def stop_campaign_runners() -> None:
+        """Stop this process's runners on shutdown, handing their campaigns back."""
+        tasks = list(_campaign_runners.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def cache_call_prompt(call_sid: str, lead: Optional[Lead]) -> Dict[str, str]:
+        """
+        Render the call's system prompt and greeting from the lead's profile
+        and keep them in the conversation store for the life of the call.
+        """
+        prompt = build_call_prompt(QueueManager._build_lead_context(lead) if lead is not None else None)
+        await get_conversation_store().set_context(call_sid, prompt)
+        return prompt
+
     @staticmethod
     def _build_lead_context(lead: Lead) -> dict:
         return {
@@ -424,3 +1134,24 @@ class QueueManager:
             "insurance_interest": lead.insurance_interest,
             "last_summary":       lead.last_summary,
         }
+
+
+async def supervise_campaigns() -> None:
+    """
+    Lifespan task: resume unfinished campaigns on startup, then keep adopting
+    campaigns whose runner died on another worker.
+    """
+    try:
+        manager = QueueManager()
+    except ValueError as e:
+        logger.warning(f"[Campaign] Supervisor not started: {e}")
+        return
+
+    while True:
+        try:
+            adopted = await manager.adopt_orphaned_campaigns()
+            if adopted:
+                logger.info(f"[Campaign] Resumed {adopted} unfinished campaign(s)")
+        except Exception as e:
+            logger.warning(f"[Campaign] Supervisor pass failed: {e}")
+        await asyncio.sleep(RUNNER_STALE_SECONDS / 2)
@@ -0,0 +1,358 @@
+"""
+Bulk Queue Operations
+=====================
+Operator-driven changes to many queue rows at once:
+
+  - requeue         — finished rows (default no_answer | failed) back to
+                      pending, attempts reset, outside any campaign (the next
+                      campaign started adopts them). Archived rows are moved
+                      back into call_queue. At most one row per number is
+                      requeued; numbers already pending / calling or on the
+                      do-not-call list are left alone.
+  - cancel          — pending rows → canceled (campaign counters bumped)
+  - purge           — delete finished rows, from call_queue and the archive
+  - reset_attempts  — pending rows get a fresh retry budget (attempts = 0)
+
+Rows are selected by ``filters`` (all optional, ANDed):
+    statuses            — queue statuses the operation applies to (validated per operation)
+    campaign_id         — only this campaign's rows
+    older_than_minutes  — last changed (updated_at) at least this long ago
+    phone_numbers       — only these numbers
+
+Every operation runs as a series of set-based chunks of OPERATION_CHUNK_SIZE
+rows, each its own short transaction that skips rows locked by the dialer or
+a webhook, so no lock is held for long. Progress is stored on a
+``queue_operations`` row; large operations run in the background and can be
+polled from any worker. A dry run only counts the matching rows and returns
+a sample of them (for requeue, an upper bound — one row per number is used).
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, false, func, literal, null, select, union_all, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from app.db.database import SessionLocal
+from app.db.models import Campaign, CallQueue, CallQueueArchive, DoNotCall, QueueOperation
+from app.services.phone_numbers import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+OPERATION_CHUNK_SIZE = 2000   # Rows changed per transaction
+CHUNK_PAUSE_SECONDS  = 0.05   # Breathing room for the dialer between chunks
+PREVIEW_ROWS         = 20     # Sample rows returned by a dry run
+
+FINISHED_STATUSES = ("completed", "no_answer", "failed", "canceled")
+
+# Operation → (statuses it may touch, default statuses, tables it reads)
+OPERATIONS = {
+    "requeue":        (FINISHED_STATUSES, ("no_answer", "failed"), (CallQueue, CallQueueArchive)),
+    "cancel":         (("pending",), ("pending",), (CallQueue,)),
+    "purge":          (FINISHED_STATUSES, FINISHED_STATUSES, (CallQueue, CallQueueArchive)),
+    "reset_attempts": (("pending",), ("pending",), (CallQueue,)),
+}
+
+# Background operations of this process, kept referenced until they finish
+_running: set = set()
+
+
+def resolve_filters(operation: str, filters: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate ``filters`` for ``operation`` and fill in its default statuses.
+    Raises ValueError for an unknown operation or a status it cannot touch.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown queue operation '{operation}'")
+    allowed, default, _ = OPERATIONS[operation]
+    statuses = list(filters.get("statuses") or default)
+    invalid = sorted(set(statuses) - set(allowed))
+    if invalid:
+        raise ValueError(f"{operation} cannot touch {', '.join(invalid)} rows (allowed: {', '.join(allowed)})")
+    resolved = {key: value for key, value in filters.items() if value is not None}
+    resolved["statuses"] = statuses
+    if "phone_numbers" in resolved:
+        resolved["phone_numbers"] = [normalize_phone(p) or p.strip() for p in resolved["phone_numbers"]]
+    if "campaign_id" in resolved:
+        resolved["campaign_id"] = str(resolved["campaign_id"])
+    return resolved
+
+
+def _matching(model, operation: str, filters: Dict[str, Any]):
+    """SELECT of the ids of ``model`` rows the operation applies to."""
+    query = select(model.id).where(model.status.in_(filters["statuses"]))
+    if filters.get("campaign_id"):
+        query = query.where(model.campaign_id == filters["campaign_id"])
+    if filters.get("older_than_minutes"):
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=filters["older_than_minutes"])
+        query = query.where(model.updated_at < cutoff)
+    if filters.get("phone_numbers"):
+        query = query.where(model.phone_number.in_(filters["phone_numbers"]))
+
+    if operation == "requeue":
+        queued = aliased(CallQueue)
+        active = select(queued.id).where(
+            queued.phone_number == model.phone_number,
+            queued.status.in_(["pending", "calling"]),
+        )
+        blocked = select(DoNotCall.phone_number).where(DoNotCall.phone_number == model.phone_number)
+        query = query.where(~active.exists()).where(~blocked.exists())
+    elif operation == "reset_attempts":
+        query = query.where(model.attempts > 0)
+    return query
+
+
+# ──────────────────────────────────────────────
+#  DRY RUN
+# ──────────────────────────────────────────────
+
+async def preview(operation: str, filters: Dict[str, Any]) -> Dict[str, Any]:
+    """Count the rows an operation would touch and return a sample of them."""
+    tables = OPERATIONS[operation][2]
+    columns = ("id", "phone_number", "status", "attempts", "campaign_id", "updated_at")
+    async with SessionLocal() as db:
+        matched = 0
+        samples = []
+        for model in tables:
+            ids = _matching(model, operation, filters).subquery()
+            matched += (await db.execute(select(func.count()).select_from(ids))).scalar() or 0
+            samples.append(
+                select(*(getattr(model, name) for name in columns))
+                .where(model.id.in_(select(ids.c.id)))
+                .order_by(model.updated_at)
+                .limit(PREVIEW_ROWS)
+            )
+        merged = union_all(*(sample.subquery().select() for sample in samples)).subquery()
+        rows = (await db.execute(select(merged).order_by(merged.c.updated_at).limit(PREVIEW_ROWS))).all()
+    return {"matched": matched, "sample": [dict(row._mapping) for row in rows]}
+
+
+# ──────────────────────────────────────────────
+#  CHUNKS — one transaction each; return (rows handled, rows changed)
+# ──────────────────────────────────────────────
+
+async def _requeue_chunk(db, model, filters) -> Tuple[int, int]:
+    candidates = (
+        _matching(model, "requeue", filters)
+        .add_columns(model.phone_number)
+        .order_by(model.updated_at.desc())   # the latest row of a number is requeued
+        .limit(OPERATION_CHUNK_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    rows = (await db.execute(candidates)).all()
+    # One pending row per number — duplicates are left finished (and are no
+    # longer candidates once their number is pending again)
+    ids = list({row.phone_number: row.id for row in reversed(rows)}.values())
+    if not ids:
+        return 0, 0
+    # A number may be queued again (add_to_queue) after the guard was checked:
+    # its row stays finished instead of aborting the chunk
+    if model is CallQueue:
+        moved = await _requeue_queue_rows(db, ids)
+    else:
+        moved = await _requeue_archived_rows(db, ids)
+    return len(rows), moved
+
+
+async def _requeue_queue_rows(db, ids: List) -> int:
+    requeue = (
+        update(CallQueue)
+        .values(
+            status="pending",
+            campaign_id=None,
+            attempts=0,
+            next_attempt_at=func.now(),
+            scheduled_attempt=None,
+            call_sid=None,
+            dialed_at=None,
+            answered_at=None,
+            abandoned=False,
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    try:
+        async with db.begin_nested():
+            return (await db.execute(requeue.where(CallQueue.id.in_(ids)))).rowcount
+    except IntegrityError:
+        pass
+    # UPDATE has no ON CONFLICT — row by row, skipping numbers now active
+    # (uq_call_queue_active_phone)
+    moved = 0
+    for item_id in ids:
+        try:
+            async with db.begin_nested():
+                moved += (await db.execute(requeue.where(CallQueue.id == item_id))).rowcount
+        except IntegrityError:
+            continue
+    return moved
+
+
+async def _requeue_archived_rows(db, ids: List) -> int:
+    inserted = (await db.execute(
+        pg_insert(CallQueue)
+        .from_select(
+            [
+                "id", "phone_number", "status", "campaign_id", "attempts",
+                "next_attempt_at", "priority", "abandoned", "created_at",
+            ],
+            select(
+                CallQueueArchive.id,
+                CallQueueArchive.phone_number,
+                literal("pending"),
+                null(),
+                literal(0),
+                func.now(),
+                literal(0.0),
+                false(),
+                CallQueueArchive.created_at,
+            ).where(CallQueueArchive.id.in_(ids)),
+        )
+        .on_conflict_do_nothing(
+            index_elements=[CallQueue.phone_number],
+            index_where=CallQueue.status.in_(["pending", "calling"]),
+        )
+        .returning(CallQueue.id)
+    )).scalars().all()
+    # Only the rows that made it back into call_queue leave the archive
+    if inserted:
+        await db.execute(delete(CallQueueArchive).where(CallQueueArchive.id.in_(inserted)))
+    return len(inserted)
+
+
+async def _cancel_chunk(db, model, filters) -> Tuple[int, int]:
+    result = await db.execute(
+        update(CallQueue)
+        .where(
+            CallQueue.id.in_(
+                _matching(model, "cancel", filters)
+                .limit(OPERATION_CHUNK_SIZE)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+        )
+        .values(status="canceled", lease_owner=None, lease_expires_at=None)
+        .returning(CallQueue.campaign_id)
+        .execution_options(synchronize_session=False)
+    )
+    campaign_ids = result.scalars().all()
+    for campaign_id, n in Counter(c for c in campaign_ids if c is not None).items():
+        await db.execute(
+            update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .values(canceled_count=Campaign.canceled_count + n)
+        )
+    return len(campaign_ids), len(campaign_ids)
+
+
+async def _purge_chunk(db, model, filters) -> Tuple[int, int]:
+    result = await db.execute(
+        delete(model)
+        .where(
+            model.id.in_(
+                _matching(model, "purge", filters)
+                .limit(OPERATION_CHUNK_SIZE)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount, result.rowcount
+
+
+async def _reset_attempts_chunk(db, model, filters) -> Tuple[int, int]:
+    result = await db.execute(
+        update(CallQueue)
+        .where(
+            CallQueue.id.in_(
+                _matching(model, "reset_attempts", filters)
+                .limit(OPERATION_CHUNK_SIZE)
+                .with_for_update(skip_locked=True)
+                .scalar_subquery()
+            )
+        )
+        # the scheduler picks a calling window for the fresh attempt again
+        .values(attempts=0, scheduled_attempt=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount, result.rowcount
+
+
+_CHUNKS = {
+    "requeue":        _requeue_chunk,
+    "cancel":         _cancel_chunk,
+    "purge":          _purge_chunk,
+    "reset_attempts": _reset_attempts_chunk,
+}
+
+
+# ──────────────────────────────────────────────
+#  RUNNING
+# ──────────────────────────────────────────────
+
+async def create_operation(operation: str, filters: Dict[str, Any], matched: int) -> QueueOperation:
+    async with SessionLocal() as db:
+        record = QueueOperation(operation=operation, filters=filters, matched=matched)
+        db.add(record)
+        await db.commit()
+        await db.refresh(record)
+    return record
+
+
+async def run_operation(operation_id) -> None:
+    """Apply a stored operation chunk by chunk, recording progress as it goes."""
+    async with SessionLocal() as db:
+        record = await db.get(QueueOperation, operation_id)
+        operation, filters = record.operation, record.filters
+    chunk = _CHUNKS[operation]
+    affected = 0
+    try:
+        for model in OPERATIONS[operation][2]:
+            while True:
+                async with SessionLocal() as db:
+                    handled, changed = await chunk(db, model, filters)
+                    await db.execute(
+                        update(QueueOperation)
+                        .where(QueueOperation.id == operation_id)
+                        .values(affected=QueueOperation.affected + changed)
+                    )
+                    await db.commit()
+                affected += changed
+                if handled < OPERATION_CHUNK_SIZE:
+                    break
+                await asyncio.sleep(CHUNK_PAUSE_SECONDS)
+        status, error = "completed", None
+    except Exception as e:
+        logger.error(f"[QueueOps] {operation} {operation_id} failed after {affected} rows: {e}")
+        status, error = "failed", str(e)[:1000]
+
+    async with SessionLocal() as db:
+        await db.execute(
+            update(QueueOperation)
+            .where(QueueOperation.id == operation_id)
+            .values(status=status, error=error, finished_at=func.now())
+        )
+        await db.commit()
+    logger.info(f"[QueueOps] {operation} {operation_id} {status} — {affected} rows")
+
+
+def run_in_background(operation_id) -> None:
+    task = asyncio.create_task(run_operation(operation_id))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+
+
+async def get_operation(db, operation_id) -> Optional[QueueOperation]:
+    return await db.get(QueueOperation, operation_id)
+
+
+async def list_operations(db, limit: int = 20) -> List[QueueOperation]:
+    result = await db.execute(select(QueueOperation).order_by(QueueOperation.created_at.desc()).limit(limit))
+    return list(result.scalars().all())
@@ -0,0 +1,69 @@
+"""
+Retry Policy
+============
+Decides what happens to a queue item after each call attempt.
+
+  - completed            → terminal "completed"
+  - no_answer/busy/failed/abandoned
+                          → back to "pending" with ``next_attempt_at`` pushed
+                            out by an exponential back-off with jitter, until
+                            MAX_RETRY_ATTEMPTS is reached; then terminal.
+
+Different outcomes start from different base delays — a busy line is worth
+retrying soon, an unanswered phone is better tried again much later, and a
+call we dropped ourselves (answered while every conversation slot was busy
+— predictive dialing) is returned soonest.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+MAX_RETRY_ATTEMPTS = 3
+
+# First retry delay per outcome (seconds); doubles with every further attempt
+RETRY_BASE_DELAYS = {
+    "no_answer": 30 * 60,
+    "busy":      5 * 60,
+    "failed":    10 * 60,
+    "abandoned": 2 * 60,
+}
+BACKOFF_FACTOR          = 2.0
+MAX_RETRY_DELAY_SECONDS = 6 * 60 * 60
+JITTER_RATIO            = 0.2   # ±20% so retries of one batch don't stampede
+
+# Twilio terminal CallStatus → attempt outcome
+TWILIO_CALL_OUTCOMES = {
+    "completed": "completed",
+    "no-answer": "no_answer",
+    "busy":      "busy",
+    "canceled":  "failed",
+    "failed":    "failed",
+}
+
+# Attempt outcome → queue status once no retries are left
+TERMINAL_QUEUE_STATUS = {
+    "completed": "completed",
+    "no_answer": "no_answer",
+    "busy":      "failed",
+    "failed":    "failed",
+    "abandoned": "no_answer",
+}
+
+
+def retry_delay(outcome: str, attempts: int) -> timedelta:
+    """Back-off before the next attempt, given how many attempts were made so far."""
+    base = RETRY_BASE_DELAYS.get(outcome, RETRY_BASE_DELAYS["failed"])
+    delay = min(base * BACKOFF_FACTOR ** max(0, attempts - 1), MAX_RETRY_DELAY_SECONDS)
+    delay *= random.uniform(1 - JITTER_RATIO, 1 + JITTER_RATIO)
+    return timedelta(seconds=delay)
+
+
+def next_queue_state(outcome: str, attempts: int) -> Tuple[str, Optional[datetime]]:
+    """
+    Return ``(status, next_attempt_at)`` for an item whose latest attempt
+    ended with ``outcome``. ``next_attempt_at`` is None for terminal states.
+    """
+    if outcome == "completed" or attempts >= MAX_RETRY_ATTEMPTS:
+        return TERMINAL_QUEUE_STATUS.get(outcome, "failed"), None
+    return "pending", datetime.now(timezone.utc) + retry_delay(outcome, attempts)
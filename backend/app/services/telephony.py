@@ -0,0 +1,384 @@
+"""
+Telephony Providers
+===================
+Where outbound calls are actually placed — behind one small interface so the
+dialer does not care whether it talks to Twilio or to a simulator.
+
+Providers (TELEPHONY_PROVIDER):
+  - twilio     — real calls through the shared Twilio REST client (default)
+  - simulated  — no network carrier: accepts every dial, then fires realistic
+                 /api/twilio/voice and /api/twilio/status callbacks after
+                 randomized ring / talk times. Lets the full dialer, webhook
+                 and campaign pipeline run on a laptop for load testing.
+
+Call resources returned by ``lookup_calls`` use Twilio's JSON shape
+(``sid``, ``status``, ``to``, ``duration``, ``date_created``) for every provider.
+
+Usage:
+    provider = get_telephony_provider()
+    call_sid = await provider.create_call(to, from_, voice_url, status_url)
+"""
+
+import asyncio
+import logging
+import random
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+import httpx
+
+from app.config import get_settings
+from app.services.twilio_client import (
+    TwilioRateLimitError,
+    close_twilio_client,
+    get_twilio_client,
+)
+
+logger = logging.getLogger(__name__)
+
+CallResources = Dict[str, Optional[Dict[str, Any]]]   # None: the provider never placed it
+
+
+class TelephonyRateLimitError(Exception):
+    """The provider refused a dial for exceeding its calls-per-second limit."""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(f"Telephony rate limit exceeded (retry_after={retry_after})")
+        self.retry_after = retry_after
+
+
+class TelephonyProvider(ABC):
+    """Places outbound calls and reports on them."""
+
+    name: str = ""
+
+    async def start(self) -> None:
+        """Open connections etc. (app lifespan)."""
+
+    async def aclose(self) -> None:
+        """Release everything opened by start() or lazily since."""
+
+    @abstractmethod
+    async def create_call(self, to: str, from_: str, voice_url: str, status_url: str) -> str:
+        """
+        Start an outbound call whose answer hits ``voice_url`` and whose status
+        transitions are POSTed to ``status_url``. Returns the CallSid.
+        Raises TelephonyRateLimitError when the dial was refused for pacing.
+        """
+
+    @abstractmethod
+    async def lookup_calls(
+        self,
+        call_sids: Iterable[str],
+        phones: Iterable[str] = (),
+        since: Optional[datetime] = None,
+    ) -> Tuple[CallResources, CallResources]:
+        """
+        Current state of many calls at once. Returns ``(by_sid, latest_by_phone)``:
+        resources keyed by SID and, for ``phones``, the newest call placed to
+        each number since ``since``. A SID the provider confirms it never
+        placed maps to None; one it cannot report on right now is absent.
+        """
+
+
+# ──────────────────────────────────────────────
+#  TWILIO
+# ──────────────────────────────────────────────
+
+MAX_LIST_PAGES         = 5    # Calls-list pages read before falling back to fetches
+MAX_CONCURRENT_FETCHES = 8    # Parallel single-call lookups
+DIRECT_FETCH_MAX_SIDS  = 20   # Fewer SIDs (and no numbers) are fetched without listing
+
+
+class TwilioProvider(TelephonyProvider):
+    """Real calls via the pooled Twilio REST client."""
+
+    name = "twilio"
+
+    def __init__(self):
+        settings = get_settings()
+        if not settings.twilio_phone_number:
+            raise ValueError("TWILIO_PHONE_NUMBER is not set — cannot make outbound calls")
+        get_twilio_client()   # raises ValueError if credentials are missing
+
+    async def start(self) -> None:
+        get_twilio_client()
+        logger.info("[OK] Twilio REST client ready (pooled, HTTP/2 keep-alive).")
+
+    async def aclose(self) -> None:
+        await close_twilio_client()
+
+    async def create_call(self, to: str, from_: str, voice_url: str, status_url: str) -> str:
+        try:
+            data = await get_twilio_client().create_call({
+                "From":           from_,
+                "To":             to,
+                "Url":            voice_url,
+                "StatusCallback": status_url,
+                "StatusCallbackMethod": "POST",
+                "StatusCallbackEvent":  "completed ringing answered",
+                "Timeout":        30,   # seconds to ring before no-answer
+                "MachineDetection": "Enable",   # skip voicemail greeting
+            })
+        except TwilioRateLimitError as e:
+            raise TelephonyRateLimitError(e.retry_after) from e
+        call_sid = data.get("sid")
+        if not call_sid:
+            # Never store a placeholder — call_sid is unique and webhooks resolve by it
+            raise RuntimeError(f"Twilio response has no call SID: {str(data)[:200]}")
+        return call_sid
+
+    async def lookup_calls(
+        self,
+        call_sids: Iterable[str],
+        phones: Iterable[str] = (),
+        since: Optional[datetime] = None,
+    ) -> Tuple[CallResources, CallResources]:
+        """
+        One paged Calls-list query, then direct fetches for SIDs it did not
+        cover. A few SIDs alone (one call the dialer is waiting on) are only
+        fetched — the listing pays off for the reaper's batch passes.
+        """
+        client = get_twilio_client()
+        wanted = set(call_sids)
+        phones = set(phones)
+        by_sid: CallResources = {}
+        latest_by_phone: CallResources = {}
+
+        if phones or len(wanted) > DIRECT_FETCH_MAX_SIDS:
+            filters = {"StartTime>": since.date().isoformat()} if since else {}
+            pages = 0
+            async for page in client.list_calls(filters):
+                for call in page:
+                    sid = call.get("sid")
+                    if sid in wanted:
+                        by_sid[sid] = call
+                    to = call.get("to")
+                    if to in phones and to not in latest_by_phone:
+                        latest_by_phone[to] = call      # listing is newest first
+                pages += 1
+                done = wanted <= by_sid.keys() and not phones - latest_by_phone.keys()
+                if done or pages >= MAX_LIST_PAGES:
+                    break
+
+        # Calls never started (still queued), beyond the pages read, or not listed
+        missing = wanted - by_sid.keys()
+        if missing:
+            limit = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+            async def fetch(sid: str) -> None:
+                try:
+                    async with limit:
+                        # None: Twilio answered 404 — it never placed this call
+                        by_sid[sid] = await client.fetch_call(sid)
+                except TwilioRateLimitError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"[Twilio] Could not look up {sid}, left for a later pass: {e}")
+
+            await asyncio.gather(*(fetch(sid) for sid in missing))
+
+        return by_sid, latest_by_phone
+
+
+# ──────────────────────────────────────────────
+#  SIMULATED
+# ──────────────────────────────────────────────
+
+SIMULATED_CALLS_KEPT = 200_000   # Finished calls remembered for lookup_calls
+SIMULATED_SID_MARK   = "5e"      # Every simulated CallSid starts with CA5e
+CALLBACK_TIMEOUT     = httpx.Timeout(30.0, connect=5.0)
+
+
+class SimulatedProvider(TelephonyProvider):
+    """
+    In-process stand-in for a carrier. Every dial is accepted; after a random
+    ring time the call is answered, busy, unanswered or fails per the
+    configured mix, and answered calls hang up after a random talk time.
+
+    Times are multiplied by ``time_scale`` (0.01 → 100× faster than real
+    time) while the durations reported in callbacks stay realistic.
+    ``transport`` lets benchmarks deliver callbacks straight into the ASGI app.
+
+    Each simulator only knows its own calls, and the reaper may run in another
+    worker. Simulated SIDs are marked (``CA5e…``): an unmarked SID was never
+    placed by any simulator (not found), while a marked one this simulator
+    does not hold was placed by another process or forgotten (unknown).
+    """
+
+    name = "simulated"
+
+    def __init__(
+        self,
+        answer_rate: float = 0.6,
+        busy_rate: float = 0.1,
+        no_answer_rate: float = 0.25,
+        ring_seconds: float = 8.0,
+        talk_seconds: float = 60.0,
+        time_scale: float = 1.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if min(answer_rate, busy_rate, no_answer_rate) < 0 or answer_rate + busy_rate + no_answer_rate > 1:
+            raise ValueError("Simulated answer/busy/no-answer rates must be >= 0 and sum to at most 1")
+        self.outcomes = ("answered", "busy", "no-answer", "failed")
+        self.weights = (answer_rate, busy_rate, no_answer_rate, 1 - answer_rate - busy_rate - no_answer_rate)
+        self.ring_seconds = ring_seconds
+        self.talk_seconds = talk_seconds
+        self.time_scale = max(time_scale, 0.0)
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._calls: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(transport=self._transport, timeout=CALLBACK_TIMEOUT)
+        return self._http
+
+    async def start(self) -> None:
+        self._client()
+        logger.info(f"[OK] Simulated telephony provider ready (time scale {self.time_scale}).")
+
+    async def aclose(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def create_call(self, to: str, from_: str, voice_url: str, status_url: str) -> str:
+        call_sid = f"CA{SIMULATED_SID_MARK}{uuid.uuid4().hex[len(SIMULATED_SID_MARK):]}"
+        self._calls[call_sid] = {
+            "sid":          call_sid,
+            "to":           to,
+            "from":         from_,
+            "status":       "queued",
+            "duration":     None,
+            "date_created": format_datetime(datetime.now(timezone.utc)),
+        }
+        while len(self._calls) > SIMULATED_CALLS_KEPT:
+            self._calls.popitem(last=False)
+
+        task = asyncio.create_task(self._run_call(call_sid, voice_url, status_url))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return call_sid
+
+    async def lookup_calls(
+        self,
+        call_sids: Iterable[str],
+        phones: Iterable[str] = (),
+        since: Optional[datetime] = None,
+    ) -> Tuple[CallResources, CallResources]:
+        by_sid: CallResources = {}
+        for sid in call_sids:
+            if sid in self._calls:
+                by_sid[sid] = dict(self._calls[sid])
+            elif not sid.startswith(f"CA{SIMULATED_SID_MARK}"):
+                by_sid[sid] = None   # no simulator placed it
+        phones = set(phones)
+        latest_by_phone: CallResources = {}
+        for call in reversed(self._calls.values()):   # newest first
+            if call["to"] in phones and call["to"] not in latest_by_phone:
+                latest_by_phone[call["to"]] = dict(call)
+        return by_sid, latest_by_phone
+
+    async def _sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds * self.time_scale)
+
+    async def _run_call(self, call_sid: str, voice_url: str, status_url: str) -> None:
+        call = self._calls[call_sid]
+        outcome = random.choices(self.outcomes, weights=self.weights)[0]
+
+        call["status"] = "ringing"
+        await self._callback(status_url, call)
+        await self._sleep(random.uniform(0.5, 1.5) * self.ring_seconds)
+
+        if outcome == "answered":
+            call["status"] = "in-progress"
+            await self._callback(voice_url, call)
+            await self._callback(status_url, call)
+            talk = max(1, round(random.expovariate(1 / self.talk_seconds))) if self.talk_seconds else 1
+            await self._sleep(talk)
+            call["duration"] = str(talk)
+            call["status"] = "completed"
+        else:
+            call["duration"] = "0"
+            call["status"] = outcome
+        await self._callback(status_url, call)
+
+    async def _callback(self, url: str, call: Dict[str, Any]) -> None:
+        """POST a Twilio-style webhook; a lost callback is left to the reaper, as with Twilio."""
+        form = {
+            "CallSid":    call["sid"],
+            "To":         call["to"],
+            "From":       call["from"],
+            "CallStatus": call["status"],
+        }
+        if call["duration"] is not None:
+            form["CallDuration"] = call["duration"]
+        try:
+            await self._client().post(url, data=form)
+        except Exception as e:
+            logger.warning(f"[Simulator] Callback to {url} failed for {call['sid']}: {e}")
+
+
+# ── Module-level singleton (opened in app.main lifespan) ──────────────────────
+_provider: Optional[TelephonyProvider] = None
+
+
+def get_telephony_provider() -> TelephonyProvider:
+    """
+    Return the process-wide provider selected by TELEPHONY_PROVIDER.
+    Raises ValueError if it is unknown or not configured.
+    """
+    global _provider
+    if _provider is None:
+        settings = get_settings()
+        choice = settings.telephony_provider.lower()
+        if choice == "twilio":
+            _provider = TwilioProvider()
+        elif choice == "simulated":
+            _provider = SimulatedProvider(
+                answer_rate=settings.sim_answer_rate,
+                busy_rate=settings.sim_busy_rate,
+                no_answer_rate=settings.sim_no_answer_rate,
+                ring_seconds=settings.sim_ring_seconds,
+                talk_seconds=settings.sim_talk_seconds,
+                time_scale=settings.sim_time_scale,
+            )
+        else:
+            raise ValueError(f"Unknown TELEPHONY_PROVIDER '{settings.telephony_provider}'")
+    return _provider
+
+
+def set_telephony_provider(provider: Optional[TelephonyProvider]) -> None:
+    """Install a specific provider instance (benchmarks, scripts)."""
+    global _provider
+    _provider = provider
+
+
+async def open_telephony_provider() -> None:
+    """Start the configured provider on startup. A missing config is not fatal."""
+    try:
+        await get_telephony_provider().start()
+    except ValueError as e:
+        logger.warning(f"Telephony provider not started: {e}")
+
+
+async def close_telephony_provider() -> None:
+    """Stop the provider on shutdown."""
+    global _provider
+    if _provider is not None:
+        await _provider.aclose()
+        _provider = None
@@ -0,0 +1,154 @@
+"""
+Twilio REST Client
+==================
+One long-lived, pooled HTTP client for every call to the Twilio REST API.
+
+Opened by the Twilio telephony provider and closed on shutdown, so outbound
+dials reuse warm keep-alive (HTTP/2) connections to api.twilio.com instead
+of paying a fresh TCP + TLS handshake per call.
+
+Usage:
+    client = get_twilio_client()
+    call = await client.create_call({"To": "+91...", "From": "+1...", "Url": "..."})
+    async for page in client.list_calls({"StartTime>": "2026-10-18"}): ...
+"""
+
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+TWILIO_API_HOST = "https://api.twilio.com"
+TWILIO_API_BASE = f"{TWILIO_API_HOST}/2010-04-01"
+LIST_PAGE_SIZE  = 1000   # Twilio's maximum page size for list resources
+
+# Connection pool — bounded so a burst of concurrent dials can't open
+# hundreds of sockets; HTTP/2 multiplexes requests over the kept-alive ones.
+MAX_CONNECTIONS           = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS  = 120.0
+
+# Default timeouts; individual requests may pass their own
+DEFAULT_TIMEOUT     = httpx.Timeout(15.0, connect=5.0)
+CREATE_CALL_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+
+class TwilioRateLimitError(Exception):
+    """Twilio answered HTTP 429 — the account's calls-per-second limit was exceeded."""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(f"Twilio rate limit exceeded (retry_after={retry_after})")
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a Retry-After header, or None if absent / not numeric."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+class TwilioClient:
+    """Thin async wrapper around the Twilio REST API on a shared connection pool."""
+
+    def __init__(self, account_sid: str, auth_token: str):
+        if not account_sid or not auth_token:
+            raise ValueError(
+                "TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN must be set — "
+                "cannot make outbound calls"
+            )
+        self.account_sid = account_sid
+        self._http = httpx.AsyncClient(
+            base_url=f"{TWILIO_API_BASE}/Accounts/{account_sid}",
+            auth=(account_sid, auth_token),
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=DEFAULT_TIMEOUT,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self._http.is_closed
+
+    async def create_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST /Calls.json — start an outbound call.
+        Returns Twilio's call resource. Raises TwilioRateLimitError on HTTP 429.
+        """
+        response = await self._http.post("/Calls.json", data=params, timeout=CREATE_CALL_TIMEOUT)
+        if response.status_code == 429:
+            raise TwilioRateLimitError(_parse_retry_after(response))
+        response.raise_for_status()
+        return response.json()
+
+    async def fetch_call(self, call_sid: str) -> Optional[Dict[str, Any]]:
+        """GET /Calls/{sid}.json — one call resource, or None if Twilio doesn't know it."""
+        response = await self._http.get(f"/Calls/{call_sid}.json")
+        if response.status_code == 404:
+            return None
+        if response.status_code == 429:
+            raise TwilioRateLimitError(_parse_retry_after(response))
+        response.raise_for_status()
+        return response.json()
+
+    async def list_calls(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = LIST_PAGE_SIZE,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        GET /Calls.json — yield pages of call resources (newest first) matching
+        ``filters`` (e.g. ``{"StartTime>": "2026-10-18", "Status": "completed"}``),
+        following Twilio's next_page_uri until the listing is exhausted.
+        """
+        url: Optional[str] = "/Calls.json"
+        params: Optional[Dict[str, Any]] = {**(filters or {}), "PageSize": page_size}
+        while url:
+            response = await self._http.get(url, params=params)
+            if response.status_code == 429:
+                raise TwilioRateLimitError(_parse_retry_after(response))
+            response.raise_for_status()
+            body = response.json()
+            yield body.get("calls", [])
+
+            next_page = body.get("next_page_uri")
+            # next_page_uri is host-relative and already carries the filters
+            url = f"{TWILIO_API_HOST}{next_page}" if next_page else None
+            params = None
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+# ── Module-level singleton (opened by the Twilio provider) ────────────────────
+_twilio_client: Optional[TwilioClient] = None
+
+
+def get_twilio_client() -> TwilioClient:
+    """
+    Return the shared TwilioClient, creating it on first use outside the app
+    lifespan (e.g. scripts). Raises ValueError if Twilio is not configured.
+    """
+    global _twilio_client
+    if _twilio_client is None or _twilio_client.is_closed:
+        settings = get_settings()
+        _twilio_client = TwilioClient(settings.twilio_account_sid, settings.twilio_auth_token)
+    return _twilio_client
+
+
+async def close_twilio_client() -> None:
+    """Close the shared client and its pooled connections on shutdown."""
+    global _twilio_client
+    if _twilio_client is not None:
+        await _twilio_client.aclose()
+        _twilio_client = None
+        logger.info("Twilio REST client closed.")
@@ -0,0 +1,2 @@
+# Benchmarks package — load generators for hot-path regression checks
+# Benchmarks: twilio_webhooks, voice_relay
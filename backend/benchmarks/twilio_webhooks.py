@@ -0,0 +1,427 @@
+"""
+Twilio Webhook Benchmark
+========================
+Drives /api/twilio/voice, /api/twilio/process-speech (and /pending-reply,
+when a reply misses VOICE_REPLY_BUDGET_SECONDS) and /api/twilio/status
+with N concurrent simulated calls against the in-process FastAPI app (ASGI
+transport — no network), with the LLM replaced by a stub of configurable
+latency. Reports machine-readable JSON:
+
+  - p50 / p95 / p99 / max latency per webhook
+  - DB time and queries per webhook (SQLAlchemy cursor events)
+  - event-loop lag (how late a 10 ms timer fires while under load)
+  - memory: RSS growth and conversation histories left behind
+
+Every call: voice webhook → ``--turns`` speech turns (``--think-ms`` apart)
+→ terminal status callback. Calls start spread over ``--ramp-seconds``.
+With ``--partials N`` each utterance is preceded by N growing interim
+transcripts (/partial-speech, ``--partial-interval-ms`` apart) and the final
+result follows ``--endpointing-ms`` of silence later, as Twilio does with
+partialResultCallback — process-speech latency then shows the speculation gain.
+
+Needs a PostgreSQL database — use a throwaway one. The benchmark seeds its
+own leads / in-flight queue rows (fictitious +1555… numbers) and deletes them
+afterwards; SQL echo and INFO logging are switched off while measuring.
+
+Usage (from backend/):
+    python -m benchmarks.twilio_webhooks --calls 200 --turns 4 --llm-latency-ms 400
+    python -m benchmarks.twilio_webhooks --calls 50 --output bench.json --max-p95-ms 250
+
+Exits with status 1 when a webhook's p95 exceeds ``--max-p95-ms``.
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import time
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy import delete, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.main import app
+from app.db.database import Base, SessionLocal, engine
+from app.db.models import CallQueue, Lead
+from app.db.triggers import install_queue_status_counters
+from app.routes import twilio as twilio_routes
+from app.services.conversation_store import get_conversation_store
+from app.services.queue_manager import QueueManager
+
+LOOP_LAG_INTERVAL = 0.01   # Event-loop probe period (seconds)
+SEED_CHUNK_SIZE   = 1000   # Rows per multi-row INSERT when seeding
+
+# Caller utterances — none may contain a farewell phrase, or the call would end early
+UTTERANCES = (
+    "Hi, yes, who is this?",
+    "I already have some health insurance through my employer.",
+    "What would a term life plan cost for someone my age?",
+    "Does that cover my parents as well?",
+    "Can you tell me more about the premium options?",
+    "Okay, and how do claims work?",
+)
+STUB_REPLY = (
+    "That's a great question. Our term plans start at a few hundred rupees a month "
+    "and can include your family. Would you like me to share the details?"
+)
+
+# Accumulates DB time for the webhook request running in the current context
+_db_probe: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "db_probe", default=None
+)
+
+
+# ──────────────────────────────────────────────
+#  Stubs
+# ──────────────────────────────────────────────
+
+class _StubCompletions:
+    """Stands in for ``AsyncGroq().chat.completions`` with a fixed-ish latency."""
+
+    def __init__(self, latency: float, jitter: float):
+        self.latency = latency
+        self.jitter = jitter
+
+    async def create(self, **_kwargs):
+        await asyncio.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+        message = SimpleNamespace(content=STUB_REPLY)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _install_stubs(llm_latency: float, llm_jitter: float) -> None:
+    completions = _StubCompletions(llm_latency, llm_jitter)
+    stub = SimpleNamespace(
+        fast_model="stub-fast",
+        smart_model="stub-smart",
+        client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+    )
+    twilio_routes.get_groq_service = lambda: stub
+
+    # Never dial real queue items from the status webhook while benchmarking
+    async def _no_next_item():
+        return None
+
+    QueueManager.process_next_item = staticmethod(_no_next_item)
+
+
+def _install_db_probe() -> Dict[str, float]:
+    totals = {"queries": 0, "seconds": 0.0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._bench_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._bench_started
+        totals["queries"] += 1
+        totals["seconds"] += elapsed
+        probe = _db_probe.get()
+        if probe is not None:
+            probe["queries"] += 1
+            probe["seconds"] += elapsed
+
+    return totals
+
+
+# ──────────────────────────────────────────────
+#  Measurements
+# ──────────────────────────────────────────────
+
+def _summary_ms(samples: List[float]) -> Dict[str, float]:
+    """Percentiles of ``samples`` (seconds) in milliseconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean":  round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50":   pct(0.50),
+        "p95":   pct(0.95),
+        "p99":   pct(0.99),
+        "max":   round(ordered[-1] * 1000, 3),
+    }
+
+
+def _rss_kb() -> int:
+    """Current resident set size; peak RSS where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def _probe_loop_lag(samples: List[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        samples.append(max(0.0, loop.time() - started - LOOP_LAG_INTERVAL))
+
+
+class WebhookStats:
+    def __init__(self):
+        self.latency: List[float] = []
+        self.db_seconds: List[float] = []
+        self.queries = 0
+        self.errors = 0
+
+    def report(self) -> dict:
+        return {
+            "requests":            len(self.latency),
+            "errors":              self.errors,
+            "latency_ms":          _summary_ms(self.latency),
+            "db_ms":               _summary_ms(self.db_seconds),
+            "queries_per_request": round(self.queries / len(self.latency), 2) if self.latency else 0,
+        }
+
+
+# ──────────────────────────────────────────────
+#  Load generation
+# ──────────────────────────────────────────────
+
+class Benchmark:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.stats = {
+            name: WebhookStats()
+            for name in ("voice", "partial-speech", "process-speech", "pending-reply", "status")
+        }
+        run = random.randint(100, 999)
+        self.calls = [
+            {"sid": f"CA{uuid.uuid4().hex}", "phone": f"+1555{run}{n:06d}", "name": f"Bench Lead {n}"}
+            for n in range(args.calls)
+        ]
+        self.caller_id = "+15005550006"
+
+    async def _post(self, client: httpx.AsyncClient, name: str, form: dict) -> str:
+        probe = {"queries": 0, "seconds": 0.0}
+        token = _db_probe.set(probe)
+        started = time.perf_counter()
+        body = ""
+        try:
+            response = await client.post(f"/api/twilio/{name}", data=form)
+            failed = response.status_code >= 400
+            body = response.text
+        except Exception:
+            failed = True
+        finally:
+            elapsed = time.perf_counter() - started
+            _db_probe.reset(token)
+        stats = self.stats[name]
+        stats.latency.append(elapsed)
+        stats.db_seconds.append(probe["seconds"])
+        stats.queries += probe["queries"]
+        stats.errors += failed
+        return body
+
+    async def _speak_partials(self, client: httpx.AsyncClient, base: dict, utterance: str) -> None:
+        """Interim transcripts of ``utterance`` as the lead says it, then end-of-speech silence."""
+        words = utterance.rstrip("?.!").lower().split()
+        for n in range(1, self.args.partials + 1):
+            heard = words[:max(1, round(len(words) * n / self.args.partials))]
+            await self._post(client, "partial-speech", {
+                **base,
+                "UnstableSpeechResult": " ".join(heard),
+                "StableSpeechResult":   "",
+                "SequenceNumber":       str(n),
+            })
+            await asyncio.sleep(self.args.partial_interval_ms / 1000)
+        await asyncio.sleep(self.args.endpointing_ms / 1000)
+
+    async def _run_call(self, client: httpx.AsyncClient, call: dict, start_delay: float) -> None:
+        await asyncio.sleep(start_delay)
+        base = {"CallSid": call["sid"], "To": call["phone"], "From": self.caller_id}
+
+        await self._post(client, "voice", {**base, "CallStatus": "in-progress"})
+        for turn in range(self.args.turns):
+            await asyncio.sleep(self.args.think_ms / 1000)
+            utterance = UTTERANCES[turn % len(UTTERANCES)]
+            if self.args.partials:
+                await self._speak_partials(client, base, utterance)
+            twiml = await self._post(client, "process-speech", {
+                **base,
+                "SpeechResult": utterance,
+                "Confidence":   "0.92",
+            })
+            if "/pending-reply" in twiml:
+                # Twilio says the filler, then follows the <Redirect>
+                await self._post(client, "pending-reply", base)
+        await self._post(client, "status", {
+            **base,
+            "CallStatus":   "completed",
+            "CallDuration": str(self.args.turns * 15),
+        })
+
+    async def seed(self) -> None:
+        """
+        Leads plus in-flight queue rows and cached call prompts, as if the
+        dialer had just placed every call.
+        """
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with engine.begin() as conn:
+            await install_queue_status_counters(conn)
+        async with SessionLocal() as db:
+            for i in range(0, len(self.calls), SEED_CHUNK_SIZE):
+                chunk = self.calls[i:i + SEED_CHUNK_SIZE]
+                await db.execute(
+                    pg_insert(Lead)
+                    .values([
+                        {"id": uuid.uuid4(), "phone_number": c["phone"], "name": c["name"], "lead_status": "new"}
+                        for c in chunk
+                    ])
+                    .on_conflict_do_nothing(index_elements=[Lead.phone_number])
+                )
+                await db.execute(
+                    pg_insert(CallQueue).values([
+                        {
+                            "id":           uuid.uuid4(),
+                            "phone_number": c["phone"],
+                            "status":       "calling",
+                            "attempts":     1,
+                            "call_sid":     c["sid"],
+                        }
+                        for c in chunk
+                    ])
+                )
+            await db.commit()
+        for c in self.calls:
+            await QueueManager.cache_call_prompt(c["sid"], Lead(phone_number=c["phone"], name=c["name"]))
+
+    async def cleanup(self) -> None:
+        phones = [c["phone"] for c in self.calls]
+        async with SessionLocal() as db:
+            for i in range(0, len(phones), SEED_CHUNK_SIZE):
+                chunk = phones[i:i + SEED_CHUNK_SIZE]
+                await db.execute(delete(CallQueue).where(CallQueue.phone_number.in_(chunk)))
+                await db.execute(delete(Lead).where(Lead.phone_number.in_(chunk)))   # cascades sessions
+            await db.commit()
+
+    async def run(self) -> dict:
+        args = self.args
+        _install_stubs(args.llm_latency_ms / 1000, args.llm_jitter)
+        await self.seed()
+        db_totals = _install_db_probe()
+
+        lag: List[float] = []
+        stop = asyncio.Event()
+        if args.tracemalloc:
+            tracemalloc.start()
+        rss_start = _rss_kb()
+        # The seeded calls' cached prompts are theirs to clear when they end
+        histories_before = await get_conversation_store().count() - len(self.calls)
+
+        transport = httpx.ASGITransport(app=app)
+        started = time.perf_counter()
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                prober = asyncio.create_task(_probe_loop_lag(lag, stop))
+                await asyncio.gather(*(
+                    self._run_call(client, call, random.uniform(0, args.ramp_seconds))
+                    for call in self.calls
+                ))
+                stop.set()
+                await prober
+        finally:
+            wall = time.perf_counter() - started
+            if not args.keep_data:
+                await self.cleanup()
+
+        memory = {
+            "rss_start_kb":  rss_start,
+            "rss_end_kb":    _rss_kb(),
+            "rss_growth_kb": _rss_kb() - rss_start,
+            "conversation_histories_left": await get_conversation_store().count() - histories_before,
+        }
+        if args.tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            memory["tracemalloc_current_kb"] = current // 1024
+            memory["tracemalloc_peak_kb"] = peak // 1024
+
+        requests = sum(len(s.latency) for s in self.stats.values())
+        return {
+            "config": {
+                "calls":          args.calls,
+                "turns":          args.turns,
+                "think_ms":       args.think_ms,
+                "partials":       args.partials,
+                "ramp_seconds":   args.ramp_seconds,
+                "llm_latency_ms": args.llm_latency_ms,
+                "llm_jitter":     args.llm_jitter,
+            },
+            "wall_seconds":      round(wall, 3),
+            "requests":          requests,
+            "requests_per_second": round(requests / wall, 2) if wall else None,
+            "webhooks":          {name: s.report() for name, s in self.stats.items()},
+            "event_loop_lag_ms": _summary_ms(lag),
+            "db": {
+                "queries":  db_totals["queries"],
+                "total_ms": round(db_totals["seconds"] * 1000, 3),
+            },
+            "memory": memory,
+        }
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=100, help="concurrent simulated calls")
+    parser.add_argument("--turns", type=int, default=4, help="speech turns per call")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="caller pause before each turn")
+    parser.add_argument("--ramp-seconds", type=float, default=1.0, help="spread call starts over this long")
+    parser.add_argument("--partials", type=int, default=0, help="interim transcripts per utterance")
+    parser.add_argument("--partial-interval-ms", type=float, default=150.0, help="time between interim transcripts")
+    parser.add_argument("--endpointing-ms", type=float, default=700.0, help="silence before the final result")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0, help="stub LLM response time")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="± fraction of LLM latency")
+    parser.add_argument("--tracemalloc", action="store_true", help="also trace Python allocations")
+    parser.add_argument("--keep-data", action="store_true", help="don't delete seeded rows afterwards")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--max-p95-ms", type=float, help="exit 1 if any webhook's p95 exceeds this")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+
+    # Measure the hot path, not log formatting
+    logging.getLogger().setLevel(logging.WARNING)
+    engine.echo = False
+
+    report = asyncio.run(Benchmark(args).run())
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.max_p95_ms is not None:
+        slow = {
+            name: w["latency_ms"]["p95"]
+            for name, w in report["webhooks"].items()
+            if w["latency_ms"].get("p95", 0) > args.max_p95_ms
+        }
+        if slow:
+            print(f"p95 over {args.max_p95_ms} ms: {slow}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
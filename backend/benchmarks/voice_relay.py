@@ -0,0 +1,239 @@
+"""
+ConversationRelay Test Client
+=============================
+Plays Twilio's side of the ConversationRelay WebSocket (/api/twilio/relay):
+sends ``setup``, one ``prompt`` per caller utterance and a closing goodbye,
+and times every streamed reply. Reports machine-readable JSON:
+
+  - time to the first spoken clause per turn (what the caller waits for)
+  - time to the complete reply (what the <Gather> loop would wait for)
+  - the clauses as they arrived, and whether the server ended the call
+
+By default the app is served in-process on a free port with the lifespan
+off and the LLM replaced by a streaming stub of configurable first-token
+latency and token rate — no Twilio, Groq key or database is needed (keep
+CONVERSATION_STORE=memory); each call's prompt is cached up front, as the
+dialer does. Pass ``--url`` to talk to a running server (real Groq) instead.
+
+Usage (from backend/):
+    python -m benchmarks.voice_relay --turns 4 --llm-ttft-ms 250 --llm-tokens-per-second 300
+    python -m benchmarks.voice_relay --url ws://localhost:8000/api/twilio/relay
+    python -m benchmarks.voice_relay --interrupt-after-ms 300   # talk over each reply
+
+Needs the ``websockets`` package (installed with uvicorn[standard]).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+from typing import List, Optional
+
+import websockets
+
+from benchmarks.twilio_webhooks import UTTERANCES, _summary_ms
+
+BENCH_LEAD = {"name": "Bench Lead", "insurance_interest": "health"}
+
+GOODBYE = "Okay, thanks. Goodbye."
+STUB_REPLY = (
+    "That's a great question, and I'm glad you asked. Our term plans start at a few "
+    "hundred rupees a month. They can cover your whole family, including your parents. "
+    "Would you like me to share the details on WhatsApp?"
+)
+
+
+# ──────────────────────────────────────────────
+#  In-process server with a streaming LLM stub
+# ──────────────────────────────────────────────
+
+class _StubStreamingCompletions:
+    """Stands in for ``AsyncGroq().chat.completions`` with ``stream=True``."""
+
+    def __init__(self, ttft: float, tokens_per_second: float):
+        self.ttft = ttft
+        self.token_interval = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+
+    async def create(self, **kwargs):
+        if not kwargs.get("stream"):
+            await asyncio.sleep(self.ttft + self.token_interval * len(STUB_REPLY.split()))
+            message = SimpleNamespace(content=STUB_REPLY)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        return self._stream()
+
+    async def _stream(self):
+        await asyncio.sleep(self.ttft)
+        for token in re.findall(r"\S+\s*", STUB_REPLY):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+            await asyncio.sleep(self.token_interval)
+
+
+async def _serve_in_process(ttft: float, tokens_per_second: float):
+    """Start the app on a free local port; returns (server, serving task, relay URL)."""
+    import uvicorn
+
+    from app.main import app
+    from app.routes import twilio as twilio_routes
+
+    completions = _StubStreamingCompletions(ttft, tokens_per_second)
+    stub = SimpleNamespace(
+        fast_model="stub-fast",
+        client=SimpleNamespace(chat=SimpleNamespace(completions=completions)),
+    )
+    twilio_routes.get_groq_service = lambda: stub
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, lifespan="off", log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        if serving.done():
+            serving.result()   # raises the startup error
+        await asyncio.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return server, serving, f"ws://127.0.0.1:{port}/api/twilio/relay"
+
+
+# ──────────────────────────────────────────────
+#  Client
+# ──────────────────────────────────────────────
+
+async def _turn(ws, speech: str, interrupt_after: Optional[float], expect_end: bool = False) -> dict:
+    """Send one prompt and read the reply until its last token (or interrupt it)."""
+    await ws.send(json.dumps({"type": "prompt", "voicePrompt": speech, "lang": "en-IN", "last": True}))
+    started = time.perf_counter()
+    first: Optional[float] = None
+    clauses: List[str] = []
+    ended = interrupted = False
+    while True:
+        timeout = None
+        if interrupt_after is not None and first is not None:
+            timeout = max(first + interrupt_after - (time.perf_counter() - started), 0.0)
+        try:
+            message = json.loads(await asyncio.wait_for(ws.recv(), timeout))
+        except asyncio.TimeoutError:
+            await ws.send(json.dumps({
+                "type": "interrupt",
+                "utteranceUntilInterrupt": "".join(clauses),
+                "durationUntilInterruptMs": int(interrupt_after * 1000),
+            }))
+            interrupted = True
+            break
+        if message.get("type") == "end":
+            ended = True
+            break
+        if message.get("type") != "text":
+            continue
+        if message.get("token"):
+            if first is None:
+                first = time.perf_counter() - started
+            clauses.append(message["token"])
+        if message.get("last"):
+            break
+    if expect_end and not ended:
+        try:
+            ended = json.loads(await asyncio.wait_for(ws.recv(), 5)).get("type") == "end"
+        except (asyncio.TimeoutError, websockets.ConnectionClosed):
+            pass
+    return {
+        "speech":         speech,
+        "first_clause_s": first,
+        "complete_s":     None if interrupted else time.perf_counter() - started,
+        "clauses":        clauses,
+        "interrupted":    interrupted,
+        "ended":          ended,
+    }
+
+
+async def _converse(url: str, turns: int, interrupt_after: Optional[float], in_process: bool) -> List[dict]:
+    call_sid = f"CArelay{uuid.uuid4().hex[:26]}"
+    if in_process:
+        # What the dialer caches when it places the call — the relay loads no lead
+        from app.services.conversation_store import get_conversation_store
+        from app.services.groq_service import build_call_prompt
+
+        await get_conversation_store().set_context(call_sid, build_call_prompt(BENCH_LEAD))
+    async with websockets.connect(url) as ws:
+        await ws.send(json.dumps({
+            "type":      "setup",
+            "sessionId": f"VX{uuid.uuid4().hex[:32]}",
+            "callSid":   call_sid,
+            "from":      "+15550000000",
+            "to":        "+15550000001",
+            "direction": "outbound-api",
+        }))
+        results = []
+        for i in range(turns):
+            results.append(await _turn(ws, UTTERANCES[i % len(UTTERANCES)], interrupt_after))
+        results.append(await _turn(ws, GOODBYE, None, expect_end=True))
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict:
+    server = serving = None
+    url = args.url
+    if url is None:
+        server, serving, url = await _serve_in_process(args.llm_ttft_ms / 1000, args.llm_tokens_per_second)
+    try:
+        interrupt_after = args.interrupt_after_ms / 1000 if args.interrupt_after_ms is not None else None
+        results = await _converse(url, args.turns, interrupt_after, in_process=server is not None)
+    finally:
+        if server is not None:
+            server.should_exit = True
+            await serving
+
+    replies = results[:-1]
+    return {
+        "config": {
+            "url":                   args.url or "in-process (stub LLM)",
+            "turns":                 args.turns,
+            "llm_ttft_ms":           None if args.url else args.llm_ttft_ms,
+            "llm_tokens_per_second": None if args.url else args.llm_tokens_per_second,
+            "interrupt_after_ms":    args.interrupt_after_ms,
+        },
+        "first_clause_ms":   _summary_ms([r["first_clause_s"] for r in replies if r["first_clause_s"] is not None]),
+        "complete_reply_ms": _summary_ms([r["complete_s"] for r in replies if r["complete_s"] is not None]),
+        "call_ended":        results[-1]["ended"],
+        "turns": [
+            {
+                "speech":          r["speech"],
+                "first_clause_ms": round(r["first_clause_s"] * 1000, 1) if r["first_clause_s"] is not None else None,
+                "complete_ms":     round(r["complete_s"] * 1000, 1) if r["complete_s"] is not None else None,
+                "interrupted":     r["interrupted"],
+                "clauses":         r["clauses"],
+            }
+            for r in results
+        ],
+    }
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="relay WebSocket of a running server (default: in-process with a stub LLM)")
+    parser.add_argument("--turns", type=int, default=4, help="caller utterances before saying goodbye")
+    parser.add_argument("--llm-ttft-ms", type=float, default=250.0, help="stub LLM time to first token")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=300.0, help="stub LLM token rate")
+    parser.add_argument("--interrupt-after-ms", type=float, help="talk over each reply this long after it starts")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0 if report["call_ended"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Shared fixtures.
+
+Tests that touch the database run against DATABASE_URL (run them from
+backend/: ``python -m pytest -q``) and are skipped when it cannot be
+reached. They use +1 555 01xx xxxx numbers and undo what they write.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+from app.db.database import engine
+
+
+async def _disposing(coro):
+    # Each test gets its own event loop — pooled asyncpg connections must not
+    # outlive it
+    try:
+        return await coro
+    finally:
+        await engine.dispose()
+
+
+def _run(coro):
+    return asyncio.run(_disposing(coro))
+
+
+async def _reachable() -> bool:
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1 FROM call_queue LIMIT 1"))
+        return True
+    except Exception:
+        return False
+
+
+@pytest.fixture(scope="session")
+def database_available() -> bool:
+    engine.echo = False
+    return _run(_reachable())
+
+
+@pytest.fixture
+def run_db(database_available):
+    """Runs a coroutine against the database (skips the test without one)."""
+    if not database_available:
+        pytest.skip("database not reachable (set DATABASE_URL)")
+    return _run
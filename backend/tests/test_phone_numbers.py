@@ -0,0 +1,131 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import uuid
+
+import phonenumbers
+import pytest
+from sqlalchemy import insert, select
+
+from app.config import get_settings
+from app.db.database import engine
+from app.db.models import CallSession, Lead
+from app.services.phone_numbers import _merge_leads, merge_duplicate_numbers, normalize_phone
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+# ──────────────────────────────────────────────
+#  normalize_phone
+# ──────────────────────────────────────────────
+
+@pytest.mark.parametrize("raw", ["+15550100000", "+919876543210", "+442079460000"])
+def test_e164_fast_path_matches_parser(raw):
+    parsed = phonenumbers.format_number(phonenumbers.parse(raw), phonenumbers.PhoneNumberFormat.E164)
+    assert normalize_phone(raw) == parsed == raw
+
+
+@pytest.mark.parametrize("raw", ["+1 555 010 0000", "+1 (555) 010-0000", "  +15550100000  "])
+def test_formatted_international_numbers(raw):
+    assert normalize_phone(raw) == "+15550100000"
+
+
+def test_default_region(monkeypatch):
+    monkeypatch.setattr(get_settings(), "phone_default_region", "IN")
+    assert normalize_phone("098765 43210") == "+919876543210"
+    monkeypatch.setattr(get_settings(), "phone_default_region", "us")
+    assert normalize_phone("(555) 010-0000") == "+15550100000"
+
+
+def test_explicit_region_overrides_default(monkeypatch):
+    monkeypatch.setattr(get_settings(), "phone_default_region", "IN")
+    assert normalize_phone("(555) 010-0000", "US") == "+15550100000"
+    # A +country code wins over any region
+    assert normalize_phone("+91 98765 43210", "US") == "+919876543210"
+
+
+@pytest.mark.parametrize("raw", [None, "", "   ", "not a number", "12", "+1555", 5550100000000000000])
+def test_invalid_numbers(raw):
+    assert normalize_phone(raw, "US") is None
+
+
+# ──────────────────────────────────────────────
+#  merge_duplicate_numbers — leads
+# ──────────────────────────────────────────────
+
+async def _merged(leads, sessions):
+    """Inserts ``leads`` / ``sessions``, merges and returns the +1555 leads
+    and their sessions' lead ids — all rolled back afterwards."""
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        try:
+            await conn.execute(insert(Lead), leads)
+            if sessions:
+                await conn.execute(insert(CallSession), sessions)
+            counts = Counter()
+            await conn.run_sync(_merge_leads, "US", counts)
+            kept = (await conn.execute(
+                select(Lead).where(Lead.phone_number.like("+1555010%")).order_by(Lead.phone_number)
+            )).all()
+            moved = (await conn.execute(
+                select(CallSession.id, CallSession.lead_id).where(CallSession.id.in_([s["id"] for s in sessions]))
+            )).all()
+            return counts, kept, dict(moved)
+        finally:
+            await trans.rollback()
+
+
+def _lead(phone, created_offset, updated_offset=0, **fields):
+    return {
+        "id": uuid.uuid4(),
+        "phone_number": phone,
+        "lead_status": fields.pop("lead_status", "new"),
+        "created_at": T0 + timedelta(days=created_offset),
+        "updated_at": T0 + timedelta(days=updated_offset),
+        **{field: fields.get(field) for field in ("name", "age", "occupation", "location",
+                                                  "insurance_interest", "last_summary")},
+    }
+
+
+def test_merge_keeps_the_normalized_lead(run_db):
+    old = _lead("+1 555 010 2000", 0, updated_offset=5, age=40, lead_status="interested")
+    normalized = _lead("+15550102000", 3, name="Asha")
+    stale = _lead("(555) 010-2000", 1, updated_offset=1, age=35, occupation="farmer")
+    session = {"id": uuid.uuid4(), "lead_id": old["id"], "transcript": ""}
+
+    counts, kept, moved = run_db(_merged([old, normalized, stale], [session]))
+
+    assert counts["leads_merged"] == 2
+    assert [lead.id for lead in kept] == [normalized["id"]]
+    keeper = kept[0]
+    assert keeper.phone_number == "+15550102000"
+    assert keeper.name == "Asha"                      # its own value wins
+    assert keeper.age == 40                           # most recently updated duplicate first
+    assert keeper.occupation == "farmer"
+    assert keeper.lead_status == "interested"
+    assert moved == {session["id"]: normalized["id"]}
+
+
+def test_merge_keeps_the_oldest_lead_without_a_normalized_one(run_db):
+    newer = _lead("555-010-2001", 2, name="Ravi")
+    oldest = _lead("+1 (555) 010-2001", 0)
+
+    counts, kept, _ = run_db(_merged([newer, oldest], []))
+
+    assert counts["leads_normalized"] == 1
+    assert [(lead.id, lead.phone_number, lead.name) for lead in kept] == [
+        (oldest["id"], "+15550102001", "Ravi"),
+    ]
+
+
+def test_merge_over_normalized_tables_is_a_no_op(run_db):
+    async def merge():
+        async with engine.connect() as conn:
+            trans = await conn.begin()
+            try:
+                await conn.execute(insert(Lead), [_lead("+15550102002", 0)])
+                await conn.run_sync(merge_duplicate_numbers, "US")
+                return await conn.run_sync(merge_duplicate_numbers, "US")
+            finally:
+                await trans.rollback()
+
+    assert run_db(merge()) == {}
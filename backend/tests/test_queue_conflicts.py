@@ -0,0 +1,106 @@
+"""
+uq_call_queue_active_phone — one pending / calling queue item per number —
+as hit by add_to_queue and by requeueing finished rows.
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import uuid
+
+from sqlalchemy import delete, func, insert, select
+
+from app.db.database import SessionLocal
+from app.db.models import CallQueue, CallQueueArchive, Lead
+from app.services.queue_manager import QueueManager
+from app.services.queue_operations import _requeue_archived_rows, _requeue_queue_rows
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _queued(phone, status):
+    return {"id": uuid.uuid4(), "phone_number": phone, "status": status, "attempts": 0}
+
+
+def _archived(phone):
+    return {
+        "id": uuid.uuid4(), "phone_number": phone, "status": "completed", "attempts": 1,
+        "next_attempt_at": T0, "created_at": T0, "updated_at": T0,
+    }
+
+
+async def _statuses(db, phone):
+    return sorted((await db.execute(
+        select(CallQueue.status).where(CallQueue.phone_number == phone)
+    )).scalars().all())
+
+
+def test_add_to_queue_skips_numbers_already_active(run_db):
+    async def scenario():
+        async with SessionLocal() as db:
+            try:
+                await db.execute(insert(CallQueue), [_queued("+15550103000", "calling")])
+                added = await QueueManager.add_to_queue(db, [
+                    SimpleNamespace(phone_number="+1 555 010 3000", name=None),
+                    SimpleNamespace(phone_number="+15550103001", name="Asha"),
+                    SimpleNamespace(phone_number="+1 (555) 010-3001", name=None),
+                ])
+                return added, await _statuses(db, "+15550103000"), await _statuses(db, "+15550103001")
+            finally:
+                # add_to_queue commits
+                await db.rollback()
+                await db.execute(delete(CallQueue).where(CallQueue.phone_number.like("+1555010300_")))
+                await db.execute(delete(Lead).where(Lead.phone_number.like("+1555010300_")))
+                await db.commit()
+
+    added, active, new = run_db(scenario())
+    assert added == 1
+    assert active == ["calling"]
+    assert new == ["pending"]
+
+
+def test_requeue_queue_rows_skips_numbers_already_active(run_db):
+    pending = _queued("+15550104000", "pending")
+    clashing = _queued("+15550104000", "completed")
+    free = _queued("+15550104001", "failed")
+
+    async def scenario():
+        async with SessionLocal() as db:
+            try:
+                await db.execute(insert(CallQueue), [pending, clashing, free])
+                moved = await _requeue_queue_rows(db, [clashing["id"], free["id"]])
+                return moved, await _statuses(db, "+15550104000"), await _statuses(db, "+15550104001")
+            finally:
+                await db.rollback()
+
+    moved, clashed, requeued = run_db(scenario())
+    assert moved == 1
+    assert clashed == ["completed", "pending"]
+    assert requeued == ["pending"]
+
+
+def test_requeue_archived_rows_leaves_clashing_rows_archived(run_db):
+    pending = _queued("+15550105000", "pending")
+    clashing = _archived("+15550105000")
+    free = _archived("+15550105001")
+
+    async def scenario():
+        async with SessionLocal() as db:
+            try:
+                await db.execute(insert(CallQueue), [pending])
+                await db.execute(insert(CallQueueArchive), [clashing, free])
+                moved = await _requeue_archived_rows(db, [clashing["id"], free["id"]])
+                archived = (await db.execute(
+                    select(CallQueueArchive.id).where(CallQueueArchive.id.in_([clashing["id"], free["id"]]))
+                )).scalars().all()
+                requeued = (await db.execute(
+                    select(func.count()).select_from(CallQueue)
+                    .where(CallQueue.id == free["id"], CallQueue.status == "pending")
+                )).scalar_one()
+                return moved, archived, requeued
+            finally:
+                await db.rollback()
+
+    moved, archived, requeued = run_db(scenario())
+    assert moved == 1
+    assert archived == [clashing["id"]]
+    assert requeued == 1